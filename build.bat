@@ -88,6 +88,8 @@ if errorlevel 1 (
     pause
     exit /b 1
 )
+REM WiFi credentials stay out of the exe, ship the template next to it
+copy /y wifi_networks.example.json dist\wifi_networks.example.json >nul
 echo Done.
 echo.
 
@@ -95,6 +97,7 @@ REM Show results
 echo [6/6] Build completed!
 echo.
 echo Output file: dist\AutomationTool-%VERSION%.exe
+echo WiFi networks: copy dist\wifi_networks.example.json to wifi_networks.json next to the exe
 echo File size:
 dir dist\AutomationTool-%VERSION%.exe | findstr "AutomationTool"
 echo.
@@ -3,10 +3,10 @@ PyWebView Application - Main Entry Point
 Opens React UI and provides Python bridge for token management
 """
 
-import webview
 import sys
 import os
 import signal
+import multiprocessing
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,6 +16,12 @@ load_dotenv()
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Installed before the heavy imports below (STARTUP_PROFILE=true)
+from utils.util_startup_profiler import startup_profiler
+
+startup_profiler.install()
+
+import webview
 from bridge import create_bridge
 from tray.system_tray import SystemTrayManager
 from constants.constant_value import CONST_VAL_UI_URL
@@ -31,7 +37,9 @@ def main():
 
     signal.signal(signal.SIGINT, signal_handler)
 
+    startup_profiler.mark("imports done")
     bridgeRegistry = create_bridge()
+    startup_profiler.mark("bridge registry created")
 
     print("🚀 Starting Automation Tool...")
     print("=" * 50)
@@ -57,12 +65,15 @@ def main():
         confirm_close=False,
     )
 
+    startup_profiler.mark("window created")
+
     # Set window reference (passes to all bridges that need it)
     bridgeRegistry.set_window(window)
     tray_manager.window = window
 
     # Register event handler to hide window instead of closing
     window.events.closing += hide_window
+    window.events.loaded += startup_profiler.first_paint
 
     # Start system tray
     tray_manager.start(window)
@@ -91,4 +102,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Capture worker processes are spawned from the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -1,12 +1,124 @@
 """
 Bridge Registry - Auto-discovers and exposes all bridge modules
 Eliminates need for manual method declarations in main.py
+
+Bridges are loaded lazily: method names are read from each module's
+source (no import), and each exposed method is a stub that imports and
+constructs the real bridge on first call.
+
+Methods decorated with @long_running (bridge.jobs) return a job id at once
+and run in the background; see job_get / job_cancel / job_list.
 """
 
-import os
+import ast
 import importlib
+import inspect
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from utils.util_startup_profiler import startup_profiler
+
+from .jobs import JobManager
+
+
+def _read_manifest(module_name: str) -> Optional[List[ast.FunctionDef]]:
+    """
+    Read public methods of a bridge without importing it
+
+    Finds `{module_name}_bridge = SomeClass()` in bridge/{name}/{name}.py and
+    returns SomeClass's public method definitions. The class may live in the
+    same file or be imported from a sibling module (`from .x import Cls`).
+    """
+    package_dir = Path(__file__).parent / module_name
+    module_file = package_dir / f"{module_name}.py"
+    if not module_file.exists():
+        return None
+
+    tree = ast.parse(module_file.read_text(encoding="utf-8"))
+    instance_name = f"{module_name}_bridge"
+
+    class_name = None
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == instance_name
+                for target in node.targets
+            )
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+        ):
+            class_name = node.value.func.id
+    if class_name is None:
+        return None
+
+    class_node = _find_class(tree, class_name)
+    if class_node is None:
+        # Follow `from .other import ClassName`
+        for node in tree.body:
+            if (
+                isinstance(node, ast.ImportFrom)
+                and node.level == 1
+                and node.module
+                and any(alias.name == class_name for alias in node.names)
+            ):
+                other = package_dir / f"{node.module}.py"
+                if other.exists():
+                    other_tree = ast.parse(other.read_text(encoding="utf-8"))
+                    class_node = _find_class(other_tree, class_name)
+    if class_node is None:
+        return None
+
+    return [
+        item
+        for item in class_node.body
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and not item.name.startswith("_")
+    ]
+
+
+def _is_long_running(func: ast.FunctionDef) -> bool:
+    """True if the method is decorated with @long_running"""
+    for decorator in func.decorator_list:
+        name = getattr(decorator, "id", None) or getattr(decorator, "attr", None)
+        if name == "long_running":
+            return True
+    return False
+
+
+def _find_class(tree: ast.Module, class_name: str) -> Optional[ast.ClassDef]:
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return node
+    return None
+
+
+def _signature_of(func: ast.FunctionDef) -> inspect.Signature:
+    """Signature of a bridge method without `self` (for pywebview's JS stubs)"""
+    args = func.args
+    positional = args.posonlyargs + args.args
+    first_default = len(positional) - len(args.defaults)
+
+    params = []
+    for index, arg in enumerate(positional[1:], start=1):
+        default = ... if index >= first_default else inspect.Parameter.empty
+        params.append(
+            inspect.Parameter(
+                arg.arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default
+            )
+        )
+    if args.vararg:
+        params.append(
+            inspect.Parameter(args.vararg.arg, inspect.Parameter.VAR_POSITIONAL)
+        )
+    for arg in args.kwonlyargs:
+        params.append(
+            inspect.Parameter(arg.arg, inspect.Parameter.KEYWORD_ONLY, default=...)
+        )
+    if args.kwarg:
+        params.append(inspect.Parameter(args.kwarg.arg, inspect.Parameter.VAR_KEYWORD))
+    return inspect.Signature(params)
 
 
 class BridgeRegistry:
@@ -25,23 +137,65 @@ class BridgeRegistry:
         etc.
     """
 
+    # Loaded in the background once the page has loaded (not on first call)
+    # remote: auto-starts the SFU agent when the user is logged in
+    PRELOAD_BRIDGES = ("remote",)
+
     def __init__(self):
         """Initialize and auto-discover all bridge modules"""
         self._bridges: Dict[str, Any] = {}
+        self._manifest: Dict[str, List[str]] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
         self._window = None
+        self._preloaded = False
+        self._jobs = JobManager()
 
         print("🌉 BridgeRegistry initializing...")
         self._discover_bridges()
-        print(f"✅ BridgeRegistry ready with {len(self._bridges)} bridge(s)")
+        print(f"✅ BridgeRegistry ready with {len(self._manifest)} bridge(s)")
 
     def set_window(self, window):
         """Set webview window reference"""
         self._window = window
-        # Pass window to all bridges that need it
-        for bridge in self._bridges.values():
+        self._jobs.set_window(window)
+        # Pass window to bridges already loaded, others get it on load
+        for bridge in list(self._bridges.values()):
             if hasattr(bridge, "set_window"):
                 bridge.set_window(window)
 
+        events = getattr(window, "events", None)
+        if events is not None and hasattr(events, "loaded"):
+            events.loaded += self._start_preload
+        else:
+            self._start_preload()
+
+    def get_bridge(self, module_name: str) -> Optional[Any]:
+        """Get a bridge instance, loading it if needed"""
+        if module_name not in self._manifest:
+            return None
+        return self._load_bridge(module_name)
+
+    # =========================================================================
+    # Job API (exposed to React as job_get / job_cancel / job_list)
+    # =========================================================================
+
+    def job_get(self, job_id: str) -> Dict[str, Any]:
+        """Get the state of a background job"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return {"success": False, "error": "Job not found"}
+        return {"success": True, "job": job.to_dict()}
+
+    def job_cancel(self, job_id: str) -> Dict[str, Any]:
+        """Request cancellation of a background job"""
+        if self._jobs.cancel(job_id):
+            return {"success": True}
+        return {"success": False, "error": "Job not found or already finished"}
+
+    def job_list(self) -> List[dict]:
+        """All known jobs (finished ones are kept for a while)"""
+        return [job.to_dict() for job in self._jobs.list_jobs()]
+
     def _discover_bridges(self):
         """
         Auto-discover all bridge modules in src/bridge/
@@ -58,53 +212,125 @@ class BridgeRegistry:
 
             module_name = item.name
             try:
-                # Try to import the bridge module
                 # Expected: src/bridge/auth/auth.py exports 'auth_bridge'
-                module_path = f"bridge.{module_name}.{module_name}"
-                module = importlib.import_module(module_path)
-
-                # Look for a bridge instance (convention: {module_name}_bridge)
-                bridge_instance_name = f"{module_name}_bridge"
-                if hasattr(module, bridge_instance_name):
-                    bridge_instance = getattr(module, bridge_instance_name)
-                    self._bridges[module_name] = bridge_instance
-
-                    # Dynamically add all public methods from this bridge
-                    self._expose_bridge_methods(module_name, bridge_instance)
-                    print(f"  ✓ Loaded bridge: {module_name}")
-                else:
-                    print(
-                        f"  ⚠ Skipped {module_name}: no '{bridge_instance_name}' found"
-                    )
-
-            except ImportError as e:
-                print(f"  ⚠ Failed to import {module_name}: {e}")
+                methods = _read_manifest(module_name)
+                if methods is None:
+                    print(f"  ⚠ Skipped {module_name}: no '{module_name}_bridge' found")
+                    continue
+
+                self._manifest[module_name] = [method.name for method in methods]
+                self._load_locks[module_name] = threading.Lock()
+                for method in methods:
+                    self._expose_stub(module_name, method)
+                print(f"  ✓ Registered bridge: {module_name} ({len(methods)} methods)")
+
             except Exception as e:
-                print(f"  ⚠ Error loading {module_name}: {e}")
+                print(f"  ⚠ Error reading {module_name}: {e}")
 
-    def _expose_bridge_methods(self, module_name: str, bridge_instance: Any):
+    def _expose_stub(self, module_name: str, method: ast.FunctionDef):
         """
-        Dynamically expose all public methods from a bridge instance
+        Expose a method stub that loads the bridge on first call
         Methods are prefixed with module name to avoid conflicts
 
         Example:
             auth_bridge.on_login_success() -> self.auth_on_login_success()
         """
+        attr_name = method.name
+        prefixed_name = f"{module_name}_{attr_name}"
+
+        def call(*args, **kwargs):
+            bridge = self._load_bridge(module_name)
+            if bridge is None:
+                raise RuntimeError(f"Bridge '{module_name}' failed to load")
+            return getattr(bridge, attr_name)(*args, **kwargs)
+
+        if _is_long_running(method):
+
+            def stub(*args, **kwargs):
+                job = self._jobs.submit(prefixed_name, call, *args, **kwargs)
+                return {"success": True, "job_id": job.id}
+
+        else:
+            stub = call
+
+        stub.__name__ = prefixed_name
+        stub.__doc__ = ast.get_docstring(method)
+        # pywebview reads parameter names from the signature
+        stub.__signature__ = _signature_of(method)
+        setattr(self, prefixed_name, stub)
+
+    def _load_bridge(self, module_name: str) -> Optional[Any]:
+        """Import and construct a bridge once (thread-safe)"""
+        bridge = self._bridges.get(module_name)
+        if bridge is not None:
+            return bridge
+
+        with self._load_locks[module_name]:
+            bridge = self._bridges.get(module_name)
+            if bridge is not None:
+                return bridge
+
+            try:
+                module_path = f"bridge.{module_name}.{module_name}"
+                with startup_profiler.section(f"bridge:{module_name}"):
+                    module = importlib.import_module(module_path)
+                    bridge = getattr(module, f"{module_name}_bridge")
+            except Exception as e:
+                print(f"  ⚠ Failed to load bridge {module_name}: {e}")
+                return None
+
+            if self._window is not None and hasattr(bridge, "set_window"):
+                bridge.set_window(self._window)
+
+            # Methods missing from the manifest (e.g. inherited) still work
+            self._expose_bridge_methods(module_name, bridge)
+            self._bridges[module_name] = bridge
+            print(f"  ✓ Loaded bridge: {module_name}")
+            return bridge
+
+    def _start_preload(self, *args):
+        if self._preloaded:
+            return
+        self._preloaded = True
+
+        def preload():
+            for module_name in self.PRELOAD_BRIDGES:
+                if module_name in self._manifest:
+                    self._load_bridge(module_name)
+
+        threading.Thread(target=preload, name="bridge-preload", daemon=True).start()
+
+    def _expose_bridge_methods(self, module_name: str, bridge_instance: Any):
+        """
+        Expose public methods of a loaded bridge that have no stub yet
+        """
         for attr_name in dir(bridge_instance):
             # Skip private/magic methods
             if attr_name.startswith("_"):
                 continue
+            prefixed_name = f"{module_name}_{attr_name}"
+            if hasattr(self, prefixed_name):
+                continue
 
             attr = getattr(bridge_instance, attr_name)
 
             # Only expose callable methods
-            if callable(attr):
-                # Create prefixed method name
-                prefixed_name = f"{module_name}_{attr_name}"
-
-                # Dynamically add method to this registry
+            if not callable(attr):
+                continue
+            if getattr(attr, "__long_running__", False):
+                setattr(self, prefixed_name, self._job_wrapper(prefixed_name, attr))
+            else:
                 setattr(self, prefixed_name, attr)
 
+    def _job_wrapper(self, name: str, method: Any):
+        def submit(*args, **kwargs):
+            job = self._jobs.submit(name, method, *args, **kwargs)
+            return {"success": True, "job_id": job.id}
+
+        submit.__name__ = name
+        submit.__signature__ = inspect.signature(method)
+        return submit
+
 
 # Convenience function for main.py
 def create_bridge() -> BridgeRegistry:
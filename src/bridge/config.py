@@ -4,7 +4,9 @@ Bridge Configuration - Centralized configuration for all bridges
 
 from pathlib import Path
 import json
-from typing import Dict, Any, Optional
+import os
+import sys
+from typing import Dict, Any, List, Optional
 
 
 class BridgeConfig:
@@ -37,6 +39,12 @@ class BridgeConfig:
     MAX_CONCURRENT_REQUESTS = 10
     CONNECTION_POOL_SIZE = 100
 
+    # Wi-Fi provisioning; known networks (with passwords) live in a
+    # user-writable file next to the exe, never in the bundled config
+    WIFI_SCAN_CACHE_TTL = 30  # seconds, shared by all phones on this PC
+    WIFI_CONNECT_TIMEOUT = 15
+    WIFI_NETWORKS_FILE = "wifi_networks.json"
+
     # Features (enable/disable bridges)
     ENABLED_BRIDGES = {
         "auth": True,
@@ -71,8 +79,64 @@ class BridgeConfig:
                 "url": cls.UI_URL,
             },
             "enabled_bridges": cls.ENABLED_BRIDGES,
+            "wifi": {
+                "scan_cache_ttl": cls.WIFI_SCAN_CACHE_TTL,
+                "connect_timeout": cls.WIFI_CONNECT_TIMEOUT,
+            },
         }
 
+    @classmethod
+    def wifi_networks_path(cls) -> Path:
+        """
+        Location of the Wi-Fi networks file
+
+        WIFI_NETWORKS_FILE env var, else next to the exe (frozen build)
+        or in the project root (source checkout)
+        """
+        override = os.getenv("WIFI_NETWORKS_FILE")
+        if override:
+            return Path(override)
+        if getattr(sys, "frozen", False):
+            return Path(sys.executable).parent / cls.WIFI_NETWORKS_FILE
+        return Path(__file__).resolve().parents[2] / cls.WIFI_NETWORKS_FILE
+
+    @classmethod
+    def load_wifi_networks(cls, path: Optional[Path] = None) -> List[Dict[str, str]]:
+        """
+        Load known Wi-Fi networks
+
+        The file holds a list of {"name": ..., "password": ...} (or an
+        object with that list under "networks").
+
+        Args:
+            path: Networks file (optional, see wifi_networks_path)
+
+        Returns:
+            Networks, empty if the file is missing or invalid
+        """
+        if path is None:
+            path = cls.wifi_networks_path()
+
+        if not path.exists():
+            print(
+                f"[BridgeConfig] WiFi networks file not found: {path} "
+                f'(expected [{{"name": ..., "password": ...}}])'
+            )
+            return []
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[BridgeConfig] Cannot read WiFi networks file {path}: {e}")
+            return []
+
+        networks = data.get("networks", []) if isinstance(data, dict) else data
+        if not isinstance(networks, list):
+            print(f"[BridgeConfig] WiFi networks file {path} is not a list")
+            return []
+        return [n for n in networks if isinstance(n, dict) and n.get("name")]
+
     @classmethod
     def save_to_file(cls, config: Dict[str, Any], config_path: Optional[Path] = None):
         """
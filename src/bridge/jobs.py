@@ -0,0 +1,280 @@
+"""
+Bridge Jobs - Run long bridge methods in the background
+
+A bridge method decorated with @long_running returns a job id to React
+immediately instead of blocking the pywebview JS-API call. The method
+runs on a managed executor (coroutines get their own event loop), reports
+progress through current_job(), and can be cancelled.
+
+Updates are pushed as 'bridge-job-update' CustomEvents. Progress updates
+of a job are coalesced (latest wins); state changes are pushed at once.
+
+Usage in a bridge:
+    from bridge.jobs import long_running, current_job
+
+    @long_running
+    def run_setup(self, device_id: str):
+        job = current_job()
+        for step in steps:
+            if job and job.cancelled:
+                return
+            ...
+            job.report(progress=0.5, message="Wi-Fi done")
+"""
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+def long_running(func: Callable) -> Callable:
+    """Mark a bridge method to run as a background job"""
+    func.__long_running__ = True
+    return func
+
+
+class JobStatus(Enum):
+    """Job lifecycle state"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised by Job.raise_if_cancelled()"""
+
+
+@dataclass
+class Job:
+    """Background job handed to the running method via current_job()"""
+
+    id: str
+    name: str
+    status: JobStatus = JobStatus.PENDING
+    progress: Optional[float] = None
+    message: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _cancel_event: threading.Event = field(default_factory=threading.Event)
+    _cancel_callbacks: List[Callable[[], Any]] = field(default_factory=list)
+    _manager: Optional["JobManager"] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(
+        self, progress: Optional[float] = None, message: Optional[str] = None
+    ) -> None:
+        """Report progress (0..1) and/or a status message"""
+        if progress is not None:
+            self.progress = progress
+        if message is not None:
+            self.message = message
+        if self._manager:
+            self._manager._notify(self, urgent=False)
+
+    def on_cancel(self, callback: Callable[[], Any]) -> None:
+        """Run callback (on the cancelling thread) when the job is cancelled"""
+        self._cancel_callbacks.append(callback)
+        if self.cancelled:
+            callback()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status.value,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_local = threading.local()
+
+
+def current_job() -> Optional[Job]:
+    """Job running on this thread, None when called directly"""
+    return getattr(_local, "job", None)
+
+
+class JobManager:
+    """
+    Executor and registry of bridge jobs
+    """
+
+    MAX_WORKERS = 8
+    # Progress updates of one job within this window are merged
+    COALESCE_WINDOW = 0.1
+    # Finished jobs are kept this long for get()
+    FINISHED_TTL = 600
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bridge-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._dirty: Dict[str, Job] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._window = None
+
+    def set_window(self, window) -> None:
+        self._window = window
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def submit(self, name: str, func: Callable, *args, **kwargs) -> Job:
+        """Run func(*args, **kwargs) as a job"""
+        job = Job(id=uuid.uuid4().hex[:12], name=name, _manager=self)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._notify(job, urgent=True)
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation, False if unknown or already finished"""
+        job = self.get(job_id)
+        if job is None or job.status in _FINISHED:
+            return False
+
+        job._cancel_event.set()
+        for callback in list(job._cancel_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[Jobs] Cancel callback error ({job.name}): {e}")
+
+        if job.status == JobStatus.PENDING:
+            self._finish(job, JobStatus.CANCELLED)
+        return True
+
+    def shutdown(self) -> None:
+        for job in self.list_jobs():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict) -> None:
+        if job.cancelled:
+            return
+
+        job.status = JobStatus.RUNNING
+        self._notify(job, urgent=True)
+        _local.job = job
+        try:
+            result = func(*args, **kwargs)
+            if inspect.iscoroutine(result):
+                result = self._run_coroutine(job, result)
+            if job.cancelled:
+                self._finish(job, JobStatus.CANCELLED)
+            else:
+                job.result = result
+                self._finish(job, JobStatus.SUCCEEDED)
+        except (JobCancelled, asyncio.CancelledError):
+            self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            print(f"[Jobs] {job.name} failed: {e}")
+            job.error = str(e)
+            self._finish(job, JobStatus.FAILED)
+        finally:
+            _local.job = None
+
+    def _run_coroutine(self, job: Job, coro) -> Any:
+        """Run a coroutine on a private loop, cancel() cancels its task"""
+        loop = asyncio.new_event_loop()
+        try:
+            task = loop.create_task(coro)
+            job.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel))
+            return loop.run_until_complete(task)
+        finally:
+            loop.close()
+
+    def _finish(self, job: Job, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._notify(job, urgent=True)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.FINISHED_TTL
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def _notify(self, job: Job, urgent: bool) -> None:
+        with self._lock:
+            self._dirty[job.id] = job
+            if not urgent:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.COALESCE_WINDOW, self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            jobs = list(self._dirty.values())
+            self._dirty.clear()
+            self._timer = None
+        if not jobs or not self._window:
+            return
+
+        try:
+            updates_json = json.dumps([job.to_dict() for job in jobs], default=str)
+            js_code = f"""
+                (function() {{
+                    const event = new CustomEvent('bridge-job-update', {{
+                        detail: {{ jobs: {updates_json} }}
+                    }});
+                    window.dispatchEvent(event);
+                }})();
+            """
+            self._window.evaluate_js(js_code)
+        except Exception as e:
+            if "failed to start" not in str(e).lower():
+                print(f"[Jobs] Error pushing job updates: {e}")
@@ -3,12 +3,14 @@ MonitoringBridge - PyWebView Bridge for Device Monitoring
 
 Features:
 - Native scrcpy windows for interactive control (35-70ms latency)
+- Batched, diff-based device updates pushed to React
 """
 
 import json
-from typing import Optional, List
+import os
+from typing import Optional, List, Union
 
-from features.monitoring import DeviceManager
+from features.monitoring import DeviceManager, DeviceStateStore
 
 
 class MonitoringBridge:
@@ -18,7 +20,11 @@ class MonitoringBridge:
 
     def __init__(self):
         self._window = None
-        self._manager = DeviceManager()
+        self._manager = DeviceManager(
+            auto_provision=os.getenv("AUTO_PROVISION_AGENT", "false").lower() == "true"
+        )
+        self._store = DeviceStateStore()
+        self._store.set_on_patch(self._push_patch)
         self._manager.set_on_devices_changed(self._on_devices_changed)
         print("[MonitoringBridge] Initialized")
 
@@ -32,18 +38,34 @@ class MonitoringBridge:
     # API METHODS - Device List
     # =========================================================================
 
-    def get_devices(self, force_refresh: bool = False) -> List[dict]:
-        """Get all connected devices"""
-        return self._manager.get_all_devices(force_refresh=force_refresh)
+    def get_devices(
+        self, force_refresh: bool = False, since_version: Optional[int] = None
+    ) -> Union[List[dict], dict]:
+        """
+        Get all connected devices
+
+        With since_version, returns the versioned snapshot instead
+        ({"version", "unchanged"[, "devices"]}), at the same version
+        as the pushed patches.
+        """
+        if force_refresh:
+            self._manager.request_refresh()
+        if since_version is not None:
+            return self._store.snapshot(since_version)
+        return self._manager.get_all_devices()
 
     def refresh_devices(self) -> List[dict]:
-        """Force refresh device list"""
+        """Schedule a device poll, returns the current list immediately"""
         return self._manager.get_all_devices(force_refresh=True)
 
     def get_device(self, device_id: str) -> Optional[dict]:
         """Get a specific device by ID"""
         return self._manager.get_device(device_id)
 
+    def get_snapshot(self) -> dict:
+        """Full device list with the version patches are based on"""
+        return self._store.snapshot()
+
     # =========================================================================
     # API METHODS - Window Control
     # =========================================================================
@@ -102,16 +124,20 @@ class MonitoringBridge:
     # =========================================================================
 
     def _on_devices_changed(self, devices: List[dict]):
-        """Push device changes to React"""
+        """Queue device changes, pushed to React as one patch per batch"""
+        self._store.submit(devices)
+
+    def _push_patch(self, patch: dict):
+        """Push a device-state patch to React"""
         if not self._window:
             return
 
         try:
-            devices_json = json.dumps(devices)
+            patch_json = json.dumps(patch)
             js_code = f"""
                 (function() {{
-                    const event = new CustomEvent('monitoring-devices-changed', {{
-                        detail: {{ devices: {devices_json} }}
+                    const event = new CustomEvent('monitoring-devices-patch', {{
+                        detail: {patch_json}
                     }});
                     window.dispatchEvent(event);
                 }})();
@@ -125,6 +151,7 @@ class MonitoringBridge:
         """Cleanup resources"""
         print("[MonitoringBridge] Cleaning up...")
         self._manager.stop()
+        self._store.close()
 
 
 # Singleton instance
@@ -1,14 +1,15 @@
 """
 Remote Bridge - Provides SFU Agent control for React UI
 
-Exposes methods to start/stop remote PC streaming agent.
+Exposes methods to start/stop remote PC streaming agent. The agent lives
+on RemoteAgentService's event loop thread for the whole app lifetime.
 """
 
-import asyncio
 import threading
 from typing import Dict, Any
 
-from src.features.remote.remote_agent import RemoteAgentManager
+from bridge.jobs import long_running, current_job
+from src.features.remote.agent_service import RemoteAgentService
 
 
 class RemoteBridge:
@@ -20,7 +21,7 @@ class RemoteBridge:
     """
 
     def __init__(self):
-        self._manager: RemoteAgentManager | None = None
+        self._service = RemoteAgentService()
         self._auto_start_thread = None
         print("🖥️ RemoteBridge initialized")
 
@@ -54,74 +55,59 @@ class RemoteBridge:
         self._auto_start_thread = threading.Thread(target=start_in_thread, daemon=True)
         self._auto_start_thread.start()
 
+    @long_running
     def start_agent(self, sfu_url: str = None) -> Dict[str, Any]:
         """
         Start the SFU Agent.
 
+        The agent runs on the service's own event loop thread; this returns
+        once it is connected (or failed). Called from React it runs as a
+        job, and cancelling the job stops the agent.
+
         Args:
             sfu_url: Optional SFU server URL
 
         Returns:
             Result dict with success status
         """
-        try:
-            if self._manager and self._manager.is_running:
-                print("⚠️ Agent already running, skipping start")
-                return {"success": True, "message": "Agent already running"}
-
-            self._manager = RemoteAgentManager(sfu_url)
+        job = current_job()
+        if job:
+            job.on_cancel(self.stop_agent)
+            job.report(message="Agent starting")
 
-            # Run async start in new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self._manager.start())
-            finally:
-                loop.close()
-
-            if result:
-                print("✅ Agent started and connected")
-                return {"success": True, "message": "Agent started"}
-            else:
-                print("❌ Agent start failed - no auth token")
-                self._manager = None
-                return {"success": False, "error": "Failed to start - no auth token"}
+        try:
+            result = self._service.start_agent(sfu_url)
         except Exception as e:
             print(f"❌ Agent start error: {e}")
-            self._manager = None
             return {"success": False, "error": str(e)}
 
+        if result.get("success"):
+            print("✅ Agent started and connected")
+        else:
+            print(f"❌ Agent start failed: {result.get('error')}")
+        return result
+
     def stop_agent(self) -> Dict[str, Any]:
         """Stop the SFU Agent."""
-        try:
-            if self._manager:
-                print("🛑 Stopping SFU agent...")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(self._manager.stop())
-                finally:
-                    loop.close()
-                self._manager = None
-                print("✅ Agent stopped and disconnected")
-                return {"success": True, "message": "Agent stopped"}
-            print("⚠️ Agent not running, nothing to stop")
-            return {"success": True, "message": "Agent not running"}
-        except Exception as e:
-            print(f"❌ Agent stop error: {e}")
-            return {"success": False, "error": str(e)}
+        print("🛑 Stopping SFU agent...")
+        result = self._service.stop_agent()
+        if result.get("success"):
+            print(f"✅ {result.get('message')}")
+        else:
+            print(f"❌ Agent stop error: {result.get('error')}")
+        return result
+
+    def restart_agent(self, sfu_url: str = None) -> Dict[str, Any]:
+        """Stop and start the SFU Agent on the same event loop."""
+        return self._service.restart_agent(sfu_url)
 
     def get_status(self) -> Dict[str, Any]:
-        """Get agent status."""
-        if not self._manager:
-            return {
-                "running": False,
-                "connected": False,
-            }
-        return {
-            "running": self._manager.is_running,
-            "connected": self._manager.is_connected,
-        }
+        """Get agent status and event loop health."""
+        return self._service.health()
+
+    def cleanup(self):
+        """Stop the agent and its event loop thread."""
+        self._service.shutdown()
 
 
 # Bridge instance for auto-discovery
@@ -3,17 +3,29 @@ Monitoring Package
 
 Features:
 - Device detection via ADB
+- Queued, coalesced device event dispatch
+- Versioned device state with batched patches for the UI
 - Native scrcpy windows for device control (35-70ms latency)
+- Background uiautomator2 agent provisioning
 """
 
 from .device_watcher import DeviceWatcher, DetectedDevice, AdbDeviceStatus
+from .device_event_bus import DeviceEventBus, DeviceEvent, DeviceEventType
 from .scrcpy_window_manager import ScrcpyWindowManager
+from .agent_provisioner import AgentProvisioner, AgentState
 from .device_manager import DeviceManager
+from .device_state_store import DeviceStateStore
 
 __all__ = [
     "DeviceWatcher",
     "DetectedDevice",
     "AdbDeviceStatus",
+    "DeviceEventBus",
+    "DeviceEvent",
+    "DeviceEventType",
     "ScrcpyWindowManager",
+    "AgentProvisioner",
+    "AgentState",
     "DeviceManager",
+    "DeviceStateStore",
 ]
@@ -0,0 +1,171 @@
+"""
+AgentProvisioner - Warm up the uiautomator2 agent when a device attaches
+
+Runs on a dedicated thread pool so the first automation on a new phone
+does not stall while the agent installs:
+- Check the installed agent version
+- Install or upgrade only when needed
+- Start the on-device server and keep the connection in the device pool
+"""
+
+import re
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, Optional, Set
+
+
+class AgentState(Enum):
+    """uiautomator2 agent state on a device"""
+
+    UNKNOWN = "unknown"
+    PROVISIONING = "provisioning"
+    READY = "ready"
+    ERROR = "error"
+
+
+# Callback type: (device_id, state, error)
+AgentStateCallback = Callable[[str, AgentState, Optional[str]], None]
+
+
+class AgentProvisioner:
+    """
+    Provision uiautomator2 agents in the background, one job per device
+    """
+
+    AGENT_PACKAGE = "com.github.uiautomator"
+    MAX_WORKERS = 4
+
+    def __init__(self, adb_path: str = "adb", max_workers: int = MAX_WORKERS):
+        self._adb_path = adb_path
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="u2-provision"
+        )
+        self._jobs: Dict[str, Future] = {}
+        # Unplugged while their job runs, forgotten when it finishes
+        self._removed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._on_state_changed: Optional[AgentStateCallback] = None
+
+    def set_on_state_changed(self, callback: AgentStateCallback) -> None:
+        self._on_state_changed = callback
+
+    def provision(self, device_id: str) -> None:
+        """Queue provisioning for a device (no-op if queued or running)"""
+        with self._lock:
+            # Re-attached before its job finished, keep the device
+            self._removed.discard(device_id)
+            job = self._jobs.get(device_id)
+            if job and not job.done():
+                return
+            self._jobs[device_id] = self._executor.submit(self._run_job, device_id)
+
+    def cancel(self, device_id: str) -> None:
+        """
+        Cancel a queued job and forget the device
+
+        A running job cannot be cancelled, the device is forgotten when
+        it finishes.
+        """
+        with self._lock:
+            job = self._jobs.get(device_id)
+            if job and not job.done() and not job.cancel():
+                self._removed.add(device_id)
+                return
+            self._jobs.pop(device_id, None)
+
+        from helpers.helper_device_pool import device_pool
+
+        device_pool.remove(device_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _run_job(self, device_id: str) -> None:
+        try:
+            self._provision(device_id)
+        finally:
+            with self._lock:
+                removed = device_id in self._removed
+                if removed:
+                    self._removed.discard(device_id)
+                    self._jobs.pop(device_id, None)
+            if removed:
+                from helpers.helper_device_pool import device_pool
+
+                device_pool.remove(device_id)
+
+    def _provision(self, device_id: str) -> None:
+        self._emit(device_id, AgentState.PROVISIONING)
+
+        try:
+            installed = self._get_installed_version(device_id)
+            expected = self._get_expected_version()
+
+            if installed is None or (expected and installed != expected):
+                print(
+                    f"[AgentProvisioner] {device_id}: installing agent "
+                    f"({installed or 'missing'} -> {expected or 'latest'})"
+                )
+                from helpers.helper_drive import init_uiautomator2
+
+                if not init_uiautomator2(device_id):
+                    self._emit(device_id, AgentState.ERROR, "Agent install failed")
+                    return
+
+            # Starts the server and keeps the live connection for later flows
+            from helpers.helper_device_pool import device_pool
+
+            device_pool.get(device_id)
+            print(f"[AgentProvisioner] {device_id}: agent ready")
+            self._emit(device_id, AgentState.READY)
+
+        except Exception as e:
+            print(f"[AgentProvisioner] {device_id}: {e}")
+            self._emit(device_id, AgentState.ERROR, str(e))
+
+    def _get_installed_version(self, device_id: str) -> Optional[str]:
+        """versionName of the agent app, None if not installed"""
+        try:
+            result = subprocess.run(
+                [
+                    self._adb_path,
+                    "-s",
+                    device_id,
+                    "shell",
+                    "dumpsys",
+                    "package",
+                    self.AGENT_PACKAGE,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+        except Exception:
+            return None
+
+        match = re.search(r"versionName=(\S+)", result.stdout)
+        return match.group(1) if match else None
+
+    def _get_expected_version(self) -> Optional[str]:
+        """Agent version bundled with the installed uiautomator2 package"""
+        try:
+            from uiautomator2 import version
+
+            return getattr(version, "__apk_version__", None)
+        except Exception:
+            return None
+
+    def _emit(
+        self, device_id: str, state: AgentState, error: Optional[str] = None
+    ) -> None:
+        if self._on_state_changed:
+            try:
+                self._on_state_changed(device_id, state, error)
+            except Exception as e:
+                print(f"[AgentProvisioner] Callback error: {e}")
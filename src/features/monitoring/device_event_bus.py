@@ -0,0 +1,171 @@
+"""
+DeviceEventBus - Queued device event dispatch
+
+Decouples DeviceWatcher from its consumers:
+- The watch loop only enqueues events, it never runs consumer code
+- A dedicated dispatcher thread delivers events in order
+- Rapid changes of the same device are coalesced before delivery
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from .device_watcher import DetectedDevice
+
+
+class DeviceEventType(Enum):
+    """Device event type"""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass
+class DeviceEvent:
+    """Queued device event"""
+
+    type: DeviceEventType
+    device_id: str
+    device: Optional[DetectedDevice] = None
+
+
+class DeviceEventBus:
+    """
+    Single-consumer event queue with coalescing per device
+
+    Pending events of one device are merged:
+    - added + changed   -> added (latest info)
+    - changed + changed -> changed (latest info)
+    - added + removed   -> nothing
+    - changed + removed -> removed
+    """
+
+    # Wait this long after the first event so a burst is delivered together
+    COALESCE_WINDOW: float = 0.05
+
+    def __init__(self):
+        self._pending: "OrderedDict[str, List[DeviceEvent]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Callbacks (same signatures as DeviceWatcher)
+        self.on_device_added: Optional[Callable[[DetectedDevice], None]] = None
+        self.on_device_removed: Optional[Callable[[str], None]] = None
+        self.on_device_changed: Optional[Callable[[DetectedDevice], None]] = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="device-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=3)
+
+    # =========================================================================
+    # PUBLISH (called from the watch loop, never blocks on consumers)
+    # =========================================================================
+
+    def device_added(self, device: DetectedDevice) -> None:
+        self._publish(DeviceEvent(DeviceEventType.ADDED, device.device_id, device))
+
+    def device_removed(self, device_id: str) -> None:
+        self._publish(DeviceEvent(DeviceEventType.REMOVED, device_id))
+
+    def device_changed(self, device: DetectedDevice) -> None:
+        self._publish(DeviceEvent(DeviceEventType.CHANGED, device.device_id, device))
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Block until every queued event has been delivered"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _publish(self, event: DeviceEvent) -> None:
+        with self._cond:
+            queue = self._pending.setdefault(event.device_id, [])
+            self._coalesce(queue, event)
+            if not queue:
+                del self._pending[event.device_id]
+            self._cond.notify_all()
+
+    def _coalesce(self, queue: List[DeviceEvent], event: DeviceEvent) -> None:
+        last = queue[-1] if queue else None
+        if last is None:
+            queue.append(event)
+            return
+
+        if event.type == DeviceEventType.CHANGED and last.type in (
+            DeviceEventType.ADDED,
+            DeviceEventType.CHANGED,
+        ):
+            last.device = event.device
+        elif (
+            event.type == DeviceEventType.REMOVED and last.type == DeviceEventType.ADDED
+        ):
+            queue.pop()
+        elif (
+            event.type == DeviceEventType.REMOVED
+            and last.type == DeviceEventType.CHANGED
+        ):
+            queue[-1] = event
+        else:
+            queue.append(event)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+            time.sleep(self.COALESCE_WINDOW)
+
+            with self._cond:
+                batch: Dict[str, List[DeviceEvent]] = self._pending
+                self._pending = OrderedDict()
+                self._busy = True
+
+            try:
+                for events in batch.values():
+                    for event in events:
+                        self._deliver(event)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, event: DeviceEvent) -> None:
+        try:
+            if event.type == DeviceEventType.ADDED and self.on_device_added:
+                self.on_device_added(event.device)
+            elif event.type == DeviceEventType.REMOVED and self.on_device_removed:
+                self.on_device_removed(event.device_id)
+            elif event.type == DeviceEventType.CHANGED and self.on_device_changed:
+                self.on_device_changed(event.device)
+        except Exception as e:
+            print(f"[DeviceEventBus] Callback error ({event.type.value}): {e}")
@@ -9,11 +9,13 @@ Features:
 import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Callable, List
+from typing import Dict, Optional, Callable, List, Tuple
 from enum import Enum
 
 from .device_watcher import DeviceWatcher, DetectedDevice, AdbDeviceStatus
+from .device_event_bus import DeviceEventBus
 from .scrcpy_window_manager import ScrcpyWindowManager
+from .agent_provisioner import AgentProvisioner, AgentState
 
 
 class DeviceState(Enum):
@@ -35,6 +37,8 @@ class ManagedDevice:
     adb_status: AdbDeviceStatus = AdbDeviceStatus.UNKNOWN
     state: DeviceState = DeviceState.OFFLINE
     has_window: bool = False
+    agent_state: AgentState = AgentState.UNKNOWN
+    agent_error: Optional[str] = None
     error: Optional[str] = None
 
     def to_dict(self) -> dict:
@@ -49,6 +53,12 @@ class ManagedDevice:
             "state": self.state.value if isinstance(self.state, Enum) else self.state,
             "is_online": self.adb_status == AdbDeviceStatus.ONLINE,
             "has_window": self.has_window,
+            "agent_state": self.agent_state.value,
+            "is_ready": (
+                self.adb_status == AdbDeviceStatus.ONLINE
+                and self.agent_state == AgentState.READY
+            ),
+            "agent_error": self.agent_error,
             "error": self.error,
         }
 
@@ -63,10 +73,12 @@ class DeviceManager:
 
     Features:
     - Auto-detect USB devices via DeviceWatcher
+    - Watcher events delivered on a dispatcher thread (DeviceEventBus)
     - Scrcpy window per device (interactive, 35-70ms latency)
+    - Optional background uiautomator2 agent provisioning on attach
     """
 
-    def __init__(self, adb_path: str = "adb"):
+    def __init__(self, adb_path: str = "adb", auto_provision: bool = False):
         print("[DeviceManager] Initializing...")
 
         self._adb_path = adb_path
@@ -74,20 +86,33 @@ class DeviceManager:
 
         # Components
         self._watcher = DeviceWatcher()
+        self._event_bus = DeviceEventBus()
         self._window_manager = ScrcpyWindowManager()
+        self._auto_provision = auto_provision
+        self._provisioner: Optional[AgentProvisioner] = None
+        if auto_provision:
+            self._provisioner = AgentProvisioner(adb_path)
+            self._provisioner.set_on_state_changed(self._on_agent_state_changed)
 
         # State
         self._devices: Dict[str, ManagedDevice] = {}
         self._lock = threading.Lock()
         self._running = False
 
+        # Serialized device list, rebuilt on change (shared, do not mutate)
+        self._snapshot: Tuple[dict, ...] = ()
+        self._refresh_thread: Optional[threading.Thread] = None
+
         # Callbacks
         self._on_devices_changed: Optional[DevicesChangedCallback] = None
 
-        # Setup callbacks
-        self._watcher.on_device_added = self._on_device_added
-        self._watcher.on_device_removed = self._on_device_removed
-        self._watcher.on_device_changed = self._on_device_changed
+        # Setup callbacks: watcher -> event bus -> manager (dispatcher thread)
+        self._watcher.on_device_added = self._event_bus.device_added
+        self._watcher.on_device_removed = self._event_bus.device_removed
+        self._watcher.on_device_changed = self._event_bus.device_changed
+        self._event_bus.on_device_added = self._on_device_added
+        self._event_bus.on_device_removed = self._on_device_removed
+        self._event_bus.on_device_changed = self._on_device_changed
         self._window_manager.set_on_state_changed(self._on_window_state_changed)
 
         print("[DeviceManager] Initialized")
@@ -104,6 +129,7 @@ class DeviceManager:
             return
         print("[DeviceManager] Starting...")
         self._running = True
+        self._event_bus.start()
         self._watcher.start()
         print("[DeviceManager] Started")
 
@@ -113,7 +139,10 @@ class DeviceManager:
         print("[DeviceManager] Stopping...")
         self._running = False
         self._watcher.stop()
+        self._event_bus.stop()
         self._window_manager.close_all()
+        if self._provisioner:
+            self._provisioner.shutdown()
         print("[DeviceManager] Stopped")
 
     # =========================================================================
@@ -121,19 +150,29 @@ class DeviceManager:
     # =========================================================================
 
     def get_all_devices(self, force_refresh: bool = False) -> List[dict]:
-        """Get all devices, optionally force refresh"""
+        """Get all devices, optionally scheduling a background refresh"""
         if force_refresh:
-            # Trigger immediate poll
-            self._watcher._poll_devices()
+            self.request_refresh()
+        with self._lock:
+            return list(self._snapshot)
 
+    def request_refresh(self) -> None:
+        """Poll ADB now on a background thread (no-op if one is running)"""
         with self._lock:
-            return [d.to_dict() for d in self._devices.values()]
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh, name="device-refresh", daemon=True
+            )
+            self._refresh_thread.start()
 
     def get_device(self, device_id: str) -> Optional[dict]:
         with self._lock:
-            if device_id in self._devices:
-                return self._devices[device_id].to_dict()
-            return None
+            snapshot = self._snapshot
+        for device in snapshot:
+            if device["device_id"] == device_id:
+                return device
+        return None
 
     # =========================================================================
     # PUBLIC API - Window Control
@@ -213,9 +252,15 @@ class DeviceManager:
 
         self._emit_devices_changed()
 
+        if self._provisioner and detected.status == AdbDeviceStatus.ONLINE:
+            self._provisioner.provision(detected.device_id)
+
     def _on_device_removed(self, device_id: str) -> None:
         print(f"[DeviceManager] Device removed: {device_id}")
 
+        if self._provisioner:
+            self._provisioner.cancel(device_id)
+
         self._window_manager.close_window(device_id)
 
         with self._lock:
@@ -224,6 +269,7 @@ class DeviceManager:
         self._emit_devices_changed()
 
     def _on_device_changed(self, detected: DetectedDevice) -> None:
+        needs_provision = False
         with self._lock:
             if detected.device_id in self._devices:
                 device = self._devices[detected.device_id]
@@ -233,6 +279,29 @@ class DeviceManager:
                 if not device.has_window:
                     device.state = self._status_to_state(detected.status)
 
+                # e.g. unauthorized -> online after the user accepts the prompt
+                needs_provision = (
+                    detected.status == AdbDeviceStatus.ONLINE
+                    and device.agent_state in (AgentState.UNKNOWN, AgentState.ERROR)
+                )
+
+        self._emit_devices_changed()
+
+        if self._provisioner and needs_provision:
+            self._provisioner.provision(detected.device_id)
+
+    def _on_agent_state_changed(
+        self, device_id: str, state: AgentState, error: Optional[str]
+    ) -> None:
+        print(f"[DeviceManager] Agent state: {device_id} -> {state.value}")
+
+        with self._lock:
+            if device_id not in self._devices:
+                return
+            device = self._devices[device_id]
+            device.agent_state = state
+            device.agent_error = error
+
         self._emit_devices_changed()
 
     def _on_window_state_changed(self, device_id: str, state: str) -> None:
@@ -268,10 +337,27 @@ class DeviceManager:
         else:
             return DeviceState.ERROR
 
+    def _refresh(self) -> None:
+        try:
+            self._watcher._poll_devices()
+        except Exception as e:
+            print(f"[DeviceManager] Refresh error: {e}")
+
+    def _rebuild_snapshot(self) -> Optional[Tuple[dict, ...]]:
+        """Re-serialize devices, returns the new snapshot if anything changed"""
+        with self._lock:
+            snapshot = tuple(d.to_dict() for d in self._devices.values())
+            if snapshot == self._snapshot:
+                return None
+            self._snapshot = snapshot
+            return snapshot
+
     def _emit_devices_changed(self) -> None:
+        snapshot = self._rebuild_snapshot()
+        if snapshot is None:
+            return
         if self._on_devices_changed:
             try:
-                devices = self.get_all_devices()
-                self._on_devices_changed(devices)
+                self._on_devices_changed(list(snapshot))
             except Exception as e:
                 print(f"[DeviceManager] Error emitting devices changed: {e}")
@@ -0,0 +1,137 @@
+"""
+DeviceStateStore - Versioned device state with batched diffs for the UI
+
+Instead of pushing the full device list on every change:
+- Changes submitted within BATCH_WINDOW are merged into one update
+- Each update is a patch with only the fields that changed
+- Every patch bumps the version; a client whose version is not the
+  patch's base_version fetches a full snapshot instead
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Patch format:
+# {
+#     "version": 12,
+#     "base_version": 11,
+#     "upserts": {"<device_id>": {<changed fields, full dict if new>}},
+#     "removed": ["<device_id>", ...],
+# }
+PatchCallback = Callable[[dict], None]
+
+
+class DeviceStateStore:
+    """
+    Last published device state, keyed by device_id
+    """
+
+    BATCH_WINDOW: float = 0.075
+
+    def __init__(self, batch_window: float = BATCH_WINDOW):
+        self._batch_window = batch_window
+        self._state: Dict[str, dict] = {}
+        self._version = 0
+        self._pending: Optional[List[dict]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Serializes flushes so patches are emitted in version order
+        self._flush_lock = threading.Lock()
+        self._on_patch: Optional[PatchCallback] = None
+
+    def set_on_patch(self, callback: PatchCallback) -> None:
+        self._on_patch = callback
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def submit(self, devices: List[dict]) -> None:
+        """Queue the latest full device list, flushed after the batch window"""
+        with self._lock:
+            self._pending = devices
+            if self._timer is None:
+                self._timer = threading.Timer(self._batch_window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Apply the pending list now and emit its patch (if anything changed)"""
+        with self._flush_lock:
+            with self._lock:
+                devices = self._pending
+                self._pending = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if devices is None:
+                    return
+                patch = self._apply(devices)
+
+            if patch and self._on_patch:
+                try:
+                    self._on_patch(patch)
+                except Exception as e:
+                    print(f"[DeviceStateStore] Patch callback error: {e}")
+
+    def snapshot(self, since_version: Optional[int] = None) -> dict:
+        """
+        Full state at the current version
+
+        With since_version, returns {"version", "unchanged": True} if the
+        caller is already at the current version, else the full state
+        with "unchanged": False
+        """
+        with self._lock:
+            if since_version is not None and since_version == self._version:
+                return {"version": self._version, "unchanged": True}
+            result = {
+                "version": self._version,
+                "devices": [dict(device) for device in self._state.values()],
+            }
+            if since_version is not None:
+                result["unchanged"] = False
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _apply(self, devices: List[dict]) -> Optional[dict]:
+        upserts: Dict[str, dict] = {}
+        new_state: Dict[str, dict] = {}
+
+        for device in devices:
+            device_id = device["device_id"]
+            new_state[device_id] = device
+            old = self._state.get(device_id)
+            if old is None:
+                upserts[device_id] = dict(device)
+                continue
+            changed = {
+                key: value for key, value in device.items() if old.get(key) != value
+            }
+            if changed:
+                upserts[device_id] = changed
+
+        removed = [device_id for device_id in self._state if device_id not in new_state]
+
+        if not upserts and not removed:
+            return None
+
+        base_version = self._version
+        self._version += 1
+        self._state = new_state
+        return {
+            "version": self._version,
+            "base_version": base_version,
+            "upserts": upserts,
+            "removed": removed,
+        }
@@ -9,7 +9,7 @@ import threading
 import time
 import re
 from dataclasses import dataclass
-from typing import Optional, Callable, Dict
+from typing import Optional, Callable, Dict, List
 from enum import Enum
 
 
@@ -145,28 +145,23 @@ class DeviceWatcher:
 
     def _compare_and_update(self, new_devices: Dict[str, DetectedDevice]) -> None:
         """Compare new devices with current and emit callbacks"""
+        added: List[DetectedDevice] = []
+        removed: List[str] = []
+        changed: List[DetectedDevice] = []
+
         with self._lock:
             old_ids = set(self._devices.keys())
             new_ids = set(new_devices.keys())
 
             # Added devices
             for device_id in new_ids - old_ids:
-                device = new_devices[device_id]
-                self._devices[device_id] = device
-                if self.on_device_added:
-                    try:
-                        self.on_device_added(device)
-                    except Exception as e:
-                        print(f"[DeviceWatcher] Callback error: {e}")
+                self._devices[device_id] = new_devices[device_id]
+                added.append(new_devices[device_id])
 
             # Removed devices
             for device_id in old_ids - new_ids:
                 del self._devices[device_id]
-                if self.on_device_removed:
-                    try:
-                        self.on_device_removed(device_id)
-                    except Exception as e:
-                        print(f"[DeviceWatcher] Callback error: {e}")
+                removed.append(device_id)
 
             # Changed devices
             for device_id in old_ids & new_ids:
@@ -175,8 +170,19 @@ class DeviceWatcher:
 
                 if old.status != new.status or old.model != new.model:
                     self._devices[device_id] = new
-                    if self.on_device_changed:
-                        try:
-                            self.on_device_changed(new)
-                        except Exception as e:
-                            print(f"[DeviceWatcher] Callback error: {e}")
+                    changed.append(new)
+
+        # Callbacks run outside the lock so a slow consumer cannot stall polling
+        for device in added:
+            self._emit(self.on_device_added, device)
+        for device_id in removed:
+            self._emit(self.on_device_removed, device_id)
+        for device in changed:
+            self._emit(self.on_device_changed, device)
+
+    def _emit(self, callback: Optional[Callable], arg) -> None:
+        if callback:
+            try:
+                callback(arg)
+            except Exception as e:
+                print(f"[DeviceWatcher] Callback error: {e}")
@@ -5,13 +5,32 @@ Provides remote PC streaming capabilities integrated with
 authentication and system identification.
 """
 
-from .remote_agent import RemoteAgentManager, start_remote_agent
-from .sfu_agent import SFUAgent, AgentConfig, QualityProfile
+import importlib
+
+# Resolved on first access so importing the package does not pull in
+# aiortc / av / cv2 / mss
+_LAZY_ATTRS = {
+    "RemoteAgentManager": ".remote_agent",
+    "start_remote_agent": ".remote_agent",
+    "RemoteAgentService": ".agent_service",
+    "SFUAgent": ".sfu_agent",
+    "AgentConfig": ".sfu_agent",
+    "QualityProfile": ".sfu_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # High-level integration
     "RemoteAgentManager",
     "start_remote_agent",
+    "RemoteAgentService",
     # Low-level SFU Agent
     "SFUAgent",
     "AgentConfig",
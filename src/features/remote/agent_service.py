@@ -0,0 +1,275 @@
+"""
+Remote Agent Service - Own the SFU agent on one long-lived asyncio loop
+
+The aiortc peer connections and the socket.io client are bound to the loop
+they were created on, so start, stop and every other agent call must run
+on that same loop. This service keeps a single loop thread for the whole
+app lifetime and lets bridge threads submit coroutines to it with
+run_coroutine_threadsafe.
+
+Usage:
+    service = RemoteAgentService()
+    service.start_agent()   # returns once connected (or failed)
+    service.health()
+    service.stop_agent()
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, Optional
+
+from src.features.remote.remote_agent import RemoteAgentManager
+
+
+class AgentLoopThread:
+    """
+    Persistent asyncio event loop running on a daemon thread
+    """
+
+    HEARTBEAT_INTERVAL = 1.0
+
+    def __init__(self, name: str = "sfu-agent-loop"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lag = 0.0
+        self._heartbeat_at = 0.0
+
+    def start(self) -> None:
+        if self.is_alive:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        loop = self._loop
+        if loop is None or not self.is_alive:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the loop, returns a concurrent Future"""
+        if not self.is_alive:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result"""
+        return self.submit(coro).result(timeout=timeout)
+
+    @property
+    def is_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive() and self._loop)
+
+    @property
+    def lag(self) -> float:
+        """Last measured scheduling delay of the loop (seconds)"""
+        return self._lag
+
+    @property
+    def heartbeat_age(self) -> float:
+        """Seconds since the loop last ran its heartbeat"""
+        if not self._heartbeat_at:
+            return 0.0
+        return time.monotonic() - self._heartbeat_at
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        loop.create_task(self._heartbeat())
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            # Cancel whatever is left so sockets and tracks get closed
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+            self._loop = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.HEARTBEAT_INTERVAL
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            self._lag = max(0.0, now - expected)
+            self._heartbeat_at = now
+
+
+class RemoteAgentService:
+    """
+    Start, stop and restart the SFU agent on the shared loop thread
+    """
+
+    CONNECT_TIMEOUT = 15.0
+    STOP_TIMEOUT = 10.0
+    METRICS_TIMEOUT = 2.0
+
+    def __init__(self):
+        self._loop_thread = AgentLoopThread()
+        self._manager: Optional[RemoteAgentManager] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._restarts = 0
+        self._last_error: Optional[str] = None
+
+    # =========================================================================
+    # PUBLIC API (callable from any thread)
+    # =========================================================================
+
+    def start_agent(
+        self, sfu_url: Optional[str] = None, timeout: float = CONNECT_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Start the agent and wait until it is connected or has failed"""
+        with self._lock:
+            if self.is_running:
+                return {"success": True, "message": "Agent already running"}
+
+            self._loop_thread.start()
+            manager = RemoteAgentManager(sfu_url)
+            self._manager = manager
+            self._last_error = None
+            task = self._loop_thread.run(self._spawn(manager), timeout=5)
+            self._task = task
+            self._started_at = time.time()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if manager.is_connected:
+                return {"success": True, "message": "Agent started"}
+            if task.done():
+                break
+            time.sleep(0.1)
+
+        if task.done():
+            with self._lock:
+                if self._task is task:
+                    self._manager = None
+                    self._task = None
+                    self._started_at = None
+            error = self._last_error or "Failed to start - no auth token"
+            return {"success": False, "error": error}
+
+        # Not connected in time: stop it rather than leave it retrying in
+        # the background while the caller was told it failed
+        with self._lock:
+            if self._task is not task:
+                return {"success": False, "error": "Agent was stopped meanwhile"}
+            if manager.is_connected:
+                return {"success": True, "message": "Agent started"}
+            self._manager = None
+            self._task = None
+            self._started_at = None
+        error = "Timed out connecting to SFU"
+        self._last_error = error
+        try:
+            self._loop_thread.run(
+                self._shutdown(manager, task), timeout=self.STOP_TIMEOUT
+            )
+        except Exception as e:
+            print(f"❌ Failed to stop SFU agent after timeout: {e}")
+        return {"success": False, "error": error}
+
+    def stop_agent(self, timeout: float = STOP_TIMEOUT) -> Dict[str, Any]:
+        """Stop the agent on its own loop"""
+        with self._lock:
+            manager, task = self._manager, self._task
+            self._manager = None
+            self._task = None
+            self._started_at = None
+
+        if manager is None:
+            return {"success": True, "message": "Agent not running"}
+
+        try:
+            self._loop_thread.run(self._shutdown(manager, task), timeout=timeout)
+        except Exception as e:
+            self._last_error = str(e)
+            return {"success": False, "error": str(e)}
+        return {"success": True, "message": "Agent stopped"}
+
+    def restart_agent(self, sfu_url: Optional[str] = None) -> Dict[str, Any]:
+        self.stop_agent()
+        self._restarts += 1
+        return self.start_agent(sfu_url)
+
+    def shutdown(self) -> None:
+        """Stop the agent and the loop thread (app exit)"""
+        self.stop_agent()
+        self._loop_thread.stop()
+
+    def health(self) -> Dict[str, Any]:
+        manager = self._manager
+        return {
+            "running": self.is_running,
+            "connected": manager.is_connected if manager else False,
+            "loop_alive": self._loop_thread.is_alive,
+            "loop_lag_ms": round(self._loop_thread.lag * 1000, 1),
+            "heartbeat_age": round(self._loop_thread.heartbeat_age, 1),
+            "uptime": time.time() - self._started_at if self._started_at else 0,
+            "restarts": self._restarts,
+            "last_error": self._last_error,
+            "metrics": self._metrics(manager),
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._task and not self._task.done())
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self._manager and self._manager.is_connected)
+
+    def _metrics(self, manager: Optional[RemoteAgentManager]) -> Dict[str, Any]:
+        """Read the agent metrics on the loop thread (they are mutated there)"""
+        if not manager or not self.is_running:
+            return {}
+        try:
+            return self._loop_thread.run(
+                self._collect_metrics(manager), timeout=self.METRICS_TIMEOUT
+            )
+        except Exception as e:
+            return {"error": str(e) or type(e).__name__}
+
+    # =========================================================================
+    # PRIVATE (run on the loop thread)
+    # =========================================================================
+
+    async def _collect_metrics(self, manager: RemoteAgentManager) -> Dict[str, Any]:
+        return manager.metrics()
+
+    async def _spawn(self, manager: RemoteAgentManager) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(manager.start())
+        task.add_done_callback(self._on_agent_done)
+        return task
+
+    def _on_agent_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._last_error = str(error)
+            print(f"❌ SFU agent stopped with error: {error}")
+
+    async def _shutdown(
+        self, manager: RemoteAgentManager, task: Optional[asyncio.Task]
+    ) -> None:
+        await manager.stop()
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
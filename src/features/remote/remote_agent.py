@@ -5,12 +5,15 @@ Provides a high-level interface to start SFU Agent using
 stored authentication tokens and system information.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional, TYPE_CHECKING
 import os
 
 from src.bridge.auth import auth_bridge
 from src.utils.util_system import get_machine_guid, get_computer_name
-from src.features.remote.sfu_agent import SFUAgent, AgentConfig
+from src.features.remote.sfu_agent import AgentConfig
+
+if TYPE_CHECKING:
+    from src.features.remote.sfu_agent import SFUAgent
 
 
 class RemoteAgentManager:
@@ -31,7 +34,7 @@ class RemoteAgentManager:
             sfu_url: SFU server URL. If not provided, reads from SFU_URL env var.
         """
         self.sfu_url = sfu_url or os.getenv("SFU_URL", "http://localhost:9999")
-        self._agent: Optional[SFUAgent] = None
+        self._agent: Optional["SFUAgent"] = None
 
     def create_config(self) -> Optional[AgentConfig]:
         """
@@ -70,6 +73,8 @@ class RemoteAgentManager:
             pc_name=pc_name,
             auth_token=token,
             user_id=user_id,
+            capture_process=os.getenv("CAPTURE_PROCESS", "false").lower() == "true",
+            metrics_interval=float(os.getenv("METRICS_INTERVAL", "0")),
         )
 
     async def start(self) -> bool:
@@ -83,6 +88,9 @@ class RemoteAgentManager:
         if not config:
             return False
 
+        # Deferred: the WebRTC stack is only loaded when streaming starts
+        from src.features.remote.sfu_agent import SFUAgent
+
         print(f"🚀 Starting SFU Agent: {config.pc_name}")
         self._agent = SFUAgent(config)
         await self._agent.start()
@@ -95,6 +103,10 @@ class RemoteAgentManager:
             self._agent = None
             print("🛑 SFU Agent stopped")
 
+    def metrics(self) -> Dict[str, Any]:
+        """Video and input path metrics of the running agent."""
+        return self._agent.metrics() if self._agent else {}
+
     @property
     def is_running(self) -> bool:
         """Check if agent is running."""
@@ -17,8 +17,17 @@ Usage:
     await agent.start()
 """
 
+import importlib
+
 from .config import AgentConfig, QualityProfile
-from .agent import SFUAgent
+
+
+def __getattr__(name):
+    # SFUAgent pulls in aiortc / av / mss, import it on first access
+    if name == "SFUAgent":
+        return importlib.import_module(".agent", __name__).SFUAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["SFUAgent", "AgentConfig", "QualityProfile"]
 __version__ = "1.0.0"
@@ -0,0 +1,231 @@
+"""
+Bandwidth-adaptive quality control.
+
+Each viewer walks a ladder of quality profiles below the quality it
+asked for. Link health comes from the peer connection's getStats()
+(RTCP receiver reports: round trip time and fraction lost, plus the
+bytes actually sent). Steps down are quick and steps up are slow
+(hysteresis), so a viewer settles on the best stream its link can
+sustain without stalls.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from aiortc import RTCPeerConnection
+
+from .config import QualityProfile
+
+logger = logging.getLogger(__name__)
+
+# Ladder rungs below the requested quality:
+# (resolution scale, fps factor, bitrate factor)
+LADDER_STEPS = [
+    (1.0, 1.0, 1.0),
+    (1.0, 1.0, 0.6),
+    (0.75, 1.0, 0.4),
+    (0.5, 0.67, 0.25),
+    (0.5, 0.5, 0.15),
+    (0.375, 0.34, 0.08),
+]
+
+
+def build_ladder(
+    ceiling: QualityProfile,
+    min_bitrate: int = 200,
+    min_fps: int = 5,
+    min_height: int = 360,
+) -> List[QualityProfile]:
+    """
+    Build the quality ladder of a requested profile, best rung first.
+
+    Rungs never go below the configured bounds (or below the requested
+    profile itself when that is already lower).
+
+    Args:
+        ceiling: Quality the viewer asked for
+        min_bitrate: Lowest bitrate in kbps
+        min_fps: Lowest frame rate
+        min_height: Lowest frame height in pixels
+
+    Returns:
+        Distinct profiles from ceiling down to the floor
+    """
+    floor_bitrate = min(min_bitrate, ceiling.bitrate)
+    floor_fps = min(min_fps, ceiling.fps)
+    floor_height = min(min_height, ceiling.height)
+
+    ladder: List[QualityProfile] = []
+    seen = set()
+    for index, (scale, fps_factor, bitrate_factor) in enumerate(LADDER_STEPS):
+        height = max(floor_height, int(ceiling.height * scale))
+        # Keep the aspect ratio, encoders need even dimensions
+        width = int(ceiling.width * height / ceiling.height) // 2 * 2
+        height = height // 2 * 2
+        fps = max(floor_fps, round(ceiling.fps * fps_factor))
+        bitrate = max(floor_bitrate, int(ceiling.bitrate * bitrate_factor))
+
+        key = (width, height, fps, bitrate)
+        if key in seen:
+            continue
+        seen.add(key)
+        ladder.append(
+            QualityProfile(
+                name=ceiling.name if index == 0 else f"{ceiling.name}-{index}",
+                width=width,
+                height=height,
+                fps=fps,
+                bitrate=bitrate,
+            )
+        )
+    return ladder
+
+
+@dataclass
+class LinkStats:
+    """Link health of one viewer over the last sampling interval."""
+
+    rtt: Optional[float]  # seconds, None until the first receiver report
+    loss: float  # fraction of packets lost (0..1)
+    bitrate: float  # kbps actually sent
+
+
+class LinkMonitor:
+    """Turns cumulative getStats() counters into per-interval LinkStats."""
+
+    def __init__(self):
+        self._bytes_sent: Optional[int] = None
+        self._sampled_at = 0.0
+
+    async def sample(self, pc: RTCPeerConnection) -> Optional[LinkStats]:
+        """
+        Read the peer connection stats.
+
+        Returns:
+            Stats since the previous sample, None on the first call
+        """
+        report = await pc.getStats()
+        now = time.monotonic()
+
+        bytes_sent = 0
+        rtt: Optional[float] = None
+        loss = 0.0
+        for stats in report.values():
+            if stats.type == "outbound-rtp":
+                bytes_sent += stats.bytesSent
+            elif stats.type == "remote-inbound-rtp":
+                if stats.roundTripTime is not None:
+                    rtt = max(rtt or 0.0, stats.roundTripTime)
+                # RTCP fraction lost is an 8-bit fixed point number
+                loss = max(loss, stats.fractionLost / 256)
+
+        previous, self._bytes_sent = self._bytes_sent, bytes_sent
+        elapsed, self._sampled_at = now - self._sampled_at, now
+        if previous is None or elapsed <= 0:
+            return None
+
+        bitrate = max(0, bytes_sent - previous) * 8 / 1000 / elapsed
+        return LinkStats(rtt=rtt, loss=loss, bitrate=bitrate)
+
+
+class QualityAdapter:
+    """
+    Walks one viewer's quality ladder from its link stats.
+
+    Congested samples (loss or RTT above the high marks) step down after
+    DOWN_AFTER samples in a row, clean samples step up after UP_AFTER.
+    An upgrade that is followed by congestion soon after doubles the
+    number of clean samples needed for the next attempt.
+    """
+
+    LOSS_HIGH = 0.08
+    LOSS_LOW = 0.02
+    RTT_HIGH = 0.4
+    DOWN_AFTER = 2
+    UP_AFTER = 5
+    MAX_UP_AFTER = 40
+
+    def __init__(self, ladder: List[QualityProfile]):
+        """
+        Initialize the adapter at the top of the ladder.
+
+        Args:
+            ladder: Profiles from build_ladder(), best first
+        """
+        self._ladder = ladder
+        self._rung = 0
+        self._congested = 0
+        self._clean = 0
+        self._up_after = self.UP_AFTER
+        self._samples_since_upgrade: Optional[int] = None
+
+    @property
+    def current(self) -> QualityProfile:
+        return self._ladder[self._rung]
+
+    def set_ladder(self, ladder: List[QualityProfile]) -> None:
+        """Start over on a new ladder (the viewer requested another quality)."""
+        self._ladder = ladder
+        self._rung = 0
+        self._congested = 0
+        self._clean = 0
+        self._up_after = self.UP_AFTER
+        self._samples_since_upgrade = None
+
+    def update(self, stats: LinkStats) -> Optional[QualityProfile]:
+        """
+        Feed one sample.
+
+        Returns:
+            The new profile if the viewer should switch, else None
+        """
+        congested = stats.loss > self.LOSS_HIGH or (
+            stats.rtt is not None and stats.rtt > self.RTT_HIGH
+        )
+        clean = stats.loss < self.LOSS_LOW and (
+            stats.rtt is None or stats.rtt < self.RTT_HIGH / 2
+        )
+
+        if self._samples_since_upgrade is not None:
+            self._samples_since_upgrade += 1
+
+        if congested:
+            self._clean = 0
+            self._congested += 1
+            if self._congested >= self.DOWN_AFTER:
+                return self._step_down()
+        elif clean:
+            self._congested = 0
+            self._clean += 1
+            if self._clean >= self._up_after:
+                return self._step_up()
+        else:
+            self._congested = 0
+            self._clean = 0
+        return None
+
+    def _step_down(self) -> Optional[QualityProfile]:
+        self._congested = 0
+        if self._rung >= len(self._ladder) - 1:
+            return None
+
+        # Upgrade probe failed, wait longer before the next one
+        if (
+            self._samples_since_upgrade is not None
+            and self._samples_since_upgrade <= self._up_after
+        ):
+            self._up_after = min(self._up_after * 2, self.MAX_UP_AFTER)
+        self._samples_since_upgrade = None
+
+        self._rung += 1
+        return self.current
+
+    def _step_up(self) -> Optional[QualityProfile]:
+        self._clean = 0
+        if self._rung == 0:
+            return None
+        self._rung -= 1
+        self._samples_since_upgrade = 0
+        return self.current
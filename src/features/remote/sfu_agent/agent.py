@@ -51,6 +51,7 @@ class SFUAgent:
         self._signaling: Optional[SignalingClient] = None
         self._webrtc: Optional[WebRTCManager] = None
         self._input_handler: Optional[InputHandler] = None
+        self._metrics_task: Optional[asyncio.Task] = None
 
         # Setup logging
         logging.basicConfig(
@@ -81,6 +82,7 @@ class SFUAgent:
             self._webrtc = WebRTCManager(
                 config=self._config,
                 on_ice_candidate=self._on_ice_candidate,
+                on_restart_offer=self._on_restart_offer,
             )
 
             # Initialize input handler
@@ -102,6 +104,9 @@ class SFUAgent:
             # Setup signal handlers for graceful shutdown
             self._setup_signal_handlers()
 
+            if self._config.metrics_interval > 0:
+                self._metrics_task = asyncio.create_task(self._metrics_loop())
+
             # Wait until disconnected
             await self._signaling.wait_until_disconnected()
 
@@ -121,9 +126,14 @@ class SFUAgent:
         self._running = False
         logger.info("Stopping SFU Agent...")
 
-        # Release all pressed keys
+        if self._metrics_task:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+
+        # Release all pressed keys and stop the injection worker
         if self._input_handler:
             self._input_handler.release_all_keys()
+            self._input_handler.close()
 
         # Close all WebRTC connections
         if self._webrtc:
@@ -135,11 +145,36 @@ class SFUAgent:
 
         logger.info("SFU Agent stopped")
 
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of the video and input path metrics.
+
+        Returns:
+            Capture/convert/encode timings per tier, delivery and link
+            stats per viewer, and input injection stats
+        """
+        return {
+            "video": self._webrtc.metrics() if self._webrtc else {},
+            "input": self._input_handler.stats() if self._input_handler else {},
+        }
+
+    async def _metrics_loop(self) -> None:
+        """Report metrics to the SFU every metrics_interval seconds."""
+        while self._running:
+            await asyncio.sleep(self._config.metrics_interval)
+            if not self._signaling or not self._signaling.is_connected:
+                continue
+            try:
+                await self._signaling.emit_metrics(self.metrics())
+            except Exception as e:
+                logger.debug(f"Failed to report metrics: {e}")
+
     def _setup_signaling_handlers(self) -> None:
         """Setup handlers for signaling events."""
         if not self._signaling:
             return
 
+        self._signaling.on("reconnect", self._on_reconnect)
         self._signaling.on("create_offer", self._on_create_offer)
         self._signaling.on("answer", self._on_answer)
         self._signaling.on("ice_candidate", self._on_remote_ice_candidate)
@@ -157,23 +192,37 @@ class SFUAgent:
                     sig,
                     lambda: asyncio.create_task(self.stop()),
                 )
-            except NotImplementedError:
-                # Windows doesn't support add_signal_handler
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows doesn't support add_signal_handler, and it only
+                # works on the main thread (the app runs us on a loop thread)
                 pass
 
+    async def _on_reconnect(self, data: Dict[str, Any]) -> None:
+        """Re-sync the viewer sessions kept while signaling was down."""
+        if not self._webrtc or not self._signaling:
+            return
+
+        sessions = self._webrtc.sessions()
+        logger.info(f"Signaling resumed with {len(sessions)} viewer session(s)")
+        await self._signaling.emit_sessions(sessions)
+
     async def _on_create_offer(self, data: Dict[str, Any]) -> None:
         """Handle create-offer request from viewer."""
         viewer_id = data.get("viewerId")
         quality = data.get("quality", "low")
+        source = data.get("source")
 
         if not viewer_id or not self._webrtc or not self._signaling:
             return
 
-        logger.info(f"Creating offer for viewer: {viewer_id} (quality: {quality})")
+        logger.info(
+            f"Creating offer for viewer: {viewer_id} "
+            f"(quality: {quality}, source: {source or 'desktop'})"
+        )
 
         try:
             # Create WebRTC offer
-            sdp = await self._webrtc.create_offer(viewer_id, quality)
+            sdp = await self._webrtc.create_offer(viewer_id, quality, source)
 
             # Send offer to viewer via signaling
             await self._signaling.emit_offer(viewer_id, sdp)
@@ -211,6 +260,11 @@ class SFUAgent:
         if self._signaling:
             await self._signaling.emit_ice_candidate(viewer_id, candidate)
 
+    async def _on_restart_offer(self, viewer_id: str, sdp: Dict[str, Any]) -> None:
+        """Callback when a failed viewer session is restarted."""
+        if self._signaling:
+            await self._signaling.emit_offer(viewer_id, sdp, restart=True)
+
     async def _on_change_quality(self, data: Dict[str, Any]) -> None:
         """Handle quality change request."""
         viewer_id = data.get("viewerId")
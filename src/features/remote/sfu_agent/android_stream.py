@@ -0,0 +1,478 @@
+"""
+Android device streaming with H.264 passthrough.
+
+Runs the scrcpy server on a phone in raw H.264 mode over an ADB forward
+and hands its encoded packets straight to aiortc (H264Encoder.pack), so
+the phone's hardware encoder does all the work: no decode, no re-encode
+on the PC. Every viewer of the same device shares one scrcpy session.
+
+Requires scrcpy >= 2.0 installed on the PC (the scrcpy-server file that
+ships with it is pushed to the device).
+"""
+
+import asyncio
+import fractions
+import logging
+import os
+import random
+import shutil
+import struct
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+import av
+
+from .config import QualityProfile
+from .metrics import RateMeter
+from .screen_capture import ScreenCaptureTrack
+
+logger = logging.getLogger(__name__)
+
+DEVICE_SERVER_PATH = "/data/local/tmp/scrcpy-server.jar"
+
+# scrcpy frame header: pts + flags (u64), packet size (u32)
+_FRAME_HEADER = struct.Struct(">QI")
+# Codec header: codec id, width, height (u32 each)
+_CODEC_HEADER = struct.Struct(">III")
+_FLAG_CONFIG = 1 << 63
+_FLAG_KEYFRAME = 1 << 62
+_PTS_MASK = _FLAG_KEYFRAME - 1
+# scrcpy timestamps are in microseconds
+_PTS_TIME_BASE = fractions.Fraction(1, 1_000_000)
+
+_CREATION_FLAGS = (
+    subprocess.CREATE_NO_WINDOW if hasattr(subprocess, "CREATE_NO_WINDOW") else 0
+)
+
+
+def find_scrcpy_server() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Locate the scrcpy-server file and its version.
+
+    SCRCPY_SERVER_PATH / SCRCPY_SERVER_VERSION override the lookup, else
+    the server next to the scrcpy executable is used and the version is
+    read from `scrcpy --version` (the server only accepts its own version).
+
+    Returns:
+        (server path, version), either may be None if not found
+    """
+    server = os.getenv("SCRCPY_SERVER_PATH")
+    version = os.getenv("SCRCPY_SERVER_VERSION")
+
+    scrcpy = shutil.which("scrcpy")
+    if not server:
+        candidates = []
+        if scrcpy:
+            scrcpy_dir = os.path.dirname(os.path.realpath(scrcpy))
+            candidates.append(os.path.join(scrcpy_dir, "scrcpy-server"))
+        candidates += [
+            r"C:\Program Files\scrcpy\scrcpy-server",
+            r"C:\scrcpy\scrcpy-server",
+            os.path.expanduser(r"~\scrcpy\scrcpy-server"),
+            "/usr/local/share/scrcpy/scrcpy-server",
+            "/usr/share/scrcpy/scrcpy-server",
+        ]
+        server = next((path for path in candidates if os.path.exists(path)), None)
+
+    if not version and scrcpy:
+        try:
+            result = subprocess.run(
+                [scrcpy, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                creationflags=_CREATION_FLAGS,
+            )
+            # "scrcpy 2.4 <https://github.com/Genymobile/scrcpy>"
+            version = result.stdout.split()[1]
+        except Exception as e:
+            logger.warning(f"Could not read scrcpy version: {e}")
+
+    return server, version
+
+
+async def _adb(*args: str, timeout: float = 15) -> str:
+    """Run an adb command off the event loop, return stdout."""
+
+    def run() -> str:
+        result = subprocess.run(
+            ["adb", *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            creationflags=_CREATION_FLAGS,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"adb {args[0]} failed")
+        return result.stdout
+
+    return await asyncio.to_thread(run)
+
+
+class AndroidStreamSource:
+    """
+    One scrcpy H.264 session for a device, shared by all its viewers.
+
+    Used by ScreenCaptureTrack like a QualityTier: tracks (or any
+    consumer with a _push(packet) method, e.g. a mosaic) attach to it
+    and receive the device's av.Packets (config NAL units are prepended
+    to every keyframe, so each keyframe is decodable on its own).
+
+    If scrcpy exits while consumers are attached, the session is started
+    again (PTS keep increasing across sessions); after RESTART_ATTEMPTS
+    failures in a row the attached tracks are stopped.
+    """
+
+    # Keyframe period asked from the device encoder (seconds), bounds
+    # the wait of a viewer joining a running stream
+    KEYFRAME_INTERVAL = 2
+    CONNECT_ATTEMPTS = 50
+    RESTART_ATTEMPTS = 3
+    RESTART_DELAY = 1.0
+
+    def __init__(
+        self,
+        device_id: str,
+        server_path: str,
+        server_version: str,
+        max_size: int = 0,
+        bitrate: int = 8000,
+        max_fps: int = 30,
+    ):
+        """
+        Initialize a device stream.
+
+        Args:
+            device_id: ADB serial
+            server_path: Local scrcpy-server file
+            server_version: Version of that server
+            max_size: Longest side in pixels, 0 for native resolution
+            bitrate: Device encoder bitrate in kbps
+            max_fps: Device encoder frame rate cap
+        """
+        self.device_id = device_id
+        self._server_path = server_path
+        self._server_version = server_version
+        self._max_size = max_size
+        self._bitrate = bitrate
+        self._max_fps = max_fps
+        self.quality = QualityProfile(
+            name=f"android:{device_id}",
+            width=0,
+            height=0,
+            fps=max_fps,
+            bitrate=bitrate,
+        )
+
+        self._consumers: Dict[int, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._port: Optional[int] = None
+        self._config_data = b""
+        # Output PTS continue across sessions
+        self._last_pts = -1
+        self.packets = RateMeter()
+
+    @property
+    def encoded(self) -> bool:
+        return True
+
+    @property
+    def consumer_count(self) -> int:
+        return len(self._consumers)
+
+    def attach(self, track: Any) -> None:
+        """Add a viewer track, starting the scrcpy session if needed."""
+        self._consumers[id(track)] = track
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def detach(self, track: Any) -> None:
+        """Remove a viewer track, stopping the session when none are left."""
+        self._consumers.pop(id(track), None)
+        if not self._consumers:
+            self.stop()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "device": self.device_id,
+            "size": [self.quality.width, self.quality.height],
+            "viewers": self.consumer_count,
+            "fps": self.packets.rate,
+            "frames": self.packets.total,
+        }
+
+    def request_keyframe(self) -> None:
+        # The device encoder cannot be asked for one without the control
+        # channel; the next periodic keyframe arrives within
+        # KEYFRAME_INTERVAL seconds
+        pass
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._close()
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    async def _run(self) -> None:
+        """Run scrcpy sessions while consumers are attached."""
+        failures = 0
+        try:
+            while self._consumers:
+                delivered = self.packets.total
+                try:
+                    await self._stream()
+                except asyncio.IncompleteReadError:
+                    logger.warning(f"Android stream {self.device_id} ended")
+                except Exception as e:
+                    logger.error(f"Android stream {self.device_id} failed: {e}")
+                finally:
+                    self._close()
+
+                if not self._consumers:
+                    break
+                # A session that streamed for a while resets the count
+                failures = 0 if self.packets.total > delivered else failures + 1
+                if failures >= self.RESTART_ATTEMPTS:
+                    logger.error(
+                        f"Android stream {self.device_id} gave up after "
+                        f"{failures} failed restarts"
+                    )
+                    self._stop_consumers()
+                    break
+                await asyncio.sleep(self.RESTART_DELAY)
+                logger.info(f"Restarting Android stream {self.device_id}")
+        except asyncio.CancelledError:
+            pass
+
+    async def _stream(self) -> None:
+        """One scrcpy session, until it ends or the consumers are gone."""
+        reader = await self._start_server()
+        codec_id, width, height = _CODEC_HEADER.unpack(
+            await reader.readexactly(_CODEC_HEADER.size)
+        )
+        self.quality.width, self.quality.height = width, height
+        logger.info(f"Android stream {self.device_id}: {width}x{height} H.264")
+
+        # Device PTS restart with the session, continue after the last one
+        origin: Optional[int] = None
+        offset = self._last_pts + 1_000_000 // max(1, self._max_fps)
+        while self._consumers:
+            pts_flags, size = _FRAME_HEADER.unpack(
+                await reader.readexactly(_FRAME_HEADER.size)
+            )
+            data = await reader.readexactly(size)
+
+            if pts_flags & _FLAG_CONFIG:
+                # SPS/PPS, sent again whenever the encoder restarts
+                self._config_data = data
+                continue
+
+            is_keyframe = bool(pts_flags & _FLAG_KEYFRAME)
+            if is_keyframe:
+                data = self._config_data + data
+
+            pts = pts_flags & _PTS_MASK
+            if origin is None:
+                origin = pts
+            packet = av.Packet(data)
+            packet.pts = self._last_pts = offset + pts - origin
+            packet.time_base = _PTS_TIME_BASE
+            packet.is_keyframe = is_keyframe
+            self.packets.mark()
+            for track in list(self._consumers.values()):
+                track._push(packet)
+
+    def _stop_consumers(self) -> None:
+        """End the attached tracks, their receivers see the stream end."""
+        for consumer in list(self._consumers.values()):
+            stop = getattr(consumer, "stop", None)
+            if stop:
+                stop()
+        self._consumers.clear()
+
+    async def _start_server(self) -> asyncio.StreamReader:
+        """Push and start the scrcpy server, connect to its video socket."""
+        scid = random.getrandbits(31)
+        socket_name = f"scrcpy_{scid:08x}"
+
+        await _adb("-s", self.device_id, "push", self._server_path, DEVICE_SERVER_PATH)
+        output = await _adb(
+            "-s", self.device_id, "forward", "tcp:0", f"localabstract:{socket_name}"
+        )
+        self._port = int(output.strip())
+
+        server_args = [
+            f"scid={scid:08x}",
+            "log_level=info",
+            "tunnel_forward=true",
+            "audio=false",
+            "control=false",
+            "cleanup=true",
+            "video_codec=h264",
+            f"max_size={self._max_size}",
+            f"video_bit_rate={self._bitrate * 1000}",
+            f"max_fps={self._max_fps}",
+            # Baseline profile (browsers negotiate constrained baseline)
+            f"video_codec_options=profile=1,i-frame-interval={self.KEYFRAME_INTERVAL}",
+            "send_device_meta=false",
+            "send_dummy_byte=true",
+            "send_codec_meta=true",
+            "send_frame_meta=true",
+        ]
+        self._process = subprocess.Popen(
+            [
+                "adb",
+                "-s",
+                self.device_id,
+                "shell",
+                f"CLASSPATH={DEVICE_SERVER_PATH}",
+                "app_process",
+                "/",
+                "com.genymobile.scrcpy.Server",
+                self._server_version,
+                *server_args,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=_CREATION_FLAGS,
+        )
+
+        # adb accepts the forward connection before the server listens
+        # and then closes it; the dummy byte confirms the server is there
+        for _ in range(self.CONNECT_ATTEMPTS):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self._port)
+            try:
+                await reader.readexactly(1)
+                self._writer = writer
+                return reader
+            except asyncio.IncompleteReadError:
+                writer.close()
+                await asyncio.sleep(0.1)
+        raise RuntimeError("scrcpy server did not start")
+
+    def _close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+        self._process = None
+        if self._port:
+            port, self._port = self._port, None
+            subprocess.Popen(
+                ["adb", "-s", self.device_id, "forward", "--remove", f"tcp:{port}"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=_CREATION_FLAGS,
+            )
+
+
+class AndroidStreamManager:
+    """
+    Creates viewer tracks of Android devices.
+
+    Sources are shared per (device, size, bitrate, fps), so viewers of
+    the same phone, and mosaics built from it, reuse one scrcpy session.
+    """
+
+    def __init__(self, bitrate: int = 8000, max_fps: int = 30, max_size: int = 0):
+        self._bitrate = bitrate
+        self._max_fps = max_fps
+        self._max_size = max_size
+        self._server: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self._sources: Dict[Tuple[str, int, int, int], AndroidStreamSource] = {}
+        self._tracks: Dict[str, ScreenCaptureTrack] = {}
+
+    @property
+    def is_available(self) -> bool:
+        if self._server is None:
+            self._server = find_scrcpy_server()
+        return all(self._server)
+
+    def get_source(
+        self,
+        device_id: str,
+        max_size: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        max_fps: Optional[int] = None,
+    ) -> AndroidStreamSource:
+        """
+        Get or create the shared stream of a device.
+
+        Args:
+            device_id: ADB serial
+            max_size: Longest side in pixels (default: configured size)
+            bitrate: Encoder bitrate in kbps (default: configured bitrate)
+            max_fps: Frame rate cap (default: configured fps)
+
+        Raises:
+            RuntimeError: If the scrcpy server is not installed
+        """
+        if not self.is_available:
+            raise RuntimeError("scrcpy server not found")
+
+        key = (
+            device_id,
+            self._max_size if max_size is None else max_size,
+            bitrate or self._bitrate,
+            max_fps or self._max_fps,
+        )
+        source = self._sources.get(key)
+        if source is None:
+            server_path, server_version = self._server
+            source = AndroidStreamSource(
+                device_id,
+                server_path,
+                server_version,
+                max_size=key[1],
+                bitrate=key[2],
+                max_fps=key[3],
+            )
+            self._sources[key] = source
+        return source
+
+    def create_track(self, viewer_id: str, device_id: str) -> ScreenCaptureTrack:
+        """
+        Create a passthrough track of a device for a viewer.
+
+        Raises:
+            RuntimeError: If the scrcpy server is not installed
+        """
+        track = ScreenCaptureTrack(self.get_source(device_id))
+        self._tracks[viewer_id] = track
+        logger.info(f"Created Android track for viewer {viewer_id}: {device_id}")
+        return track
+
+    def has_track(self, viewer_id: str) -> bool:
+        return viewer_id in self._tracks
+
+    def remove_track(self, viewer_id: str) -> None:
+        track = self._tracks.pop(viewer_id, None)
+        if track:
+            track.stop()
+        self.prune()
+
+    def prune(self) -> None:
+        """Drop sources nobody is attached to."""
+        for key, source in list(self._sources.items()):
+            if source.consumer_count == 0:
+                source.stop()
+                del self._sources[key]
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Metrics of the running device streams."""
+        return [source.metrics() for source in self._sources.values()]
+
+    def stop_all(self) -> None:
+        for track in self._tracks.values():
+            track.stop()
+        self._tracks.clear()
+        for source in self._sources.values():
+            source.stop()
+        self._sources.clear()
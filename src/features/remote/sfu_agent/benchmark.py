@@ -0,0 +1,422 @@
+"""
+Benchmarks for the SFU agent video path.
+
+Runs offline on synthetic frames, no display or SFU needed.
+
+Usage:
+    python -m src.features.remote.sfu_agent.benchmark [--frames 60]
+    python -m src.features.remote.sfu_agent.benchmark --pipeline \
+        [--viewers 1,4,16] [--motion 0.1] [--duration 5] [--raw]
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from aiortc.codecs.h264 import H264Encoder
+from av import VideoFrame
+from av.video.reformatter import Interpolation, VideoReformatter
+
+from .config import QualityProfile
+from .encoder import SharedH264Encoder
+from .metrics import Histogram, Stopwatch
+from .screen_capture import (
+    FrameSource,
+    QualityTier,
+    ScreenCaptureTrack,
+    bgra_video_frame,
+)
+
+
+def synthetic_capture(width: int, height: int, seed: int = 0) -> bytearray:
+    """BGRA buffer shaped like an mss ScreenShot.raw."""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    return bytearray(pixels.tobytes())
+
+
+def convert_legacy(
+    raw: bytearray, width: int, height: int, quality: QualityProfile
+) -> VideoFrame:
+    """Legacy conversion path: np.array, alpha slice, cv2 resize, BGR2RGB, rgb24."""
+    import cv2
+
+    frame = np.array(np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4))
+    frame = frame[:, :, :3]
+    if frame.shape[1] != quality.width or frame.shape[0] != quality.height:
+        frame = cv2.resize(
+            frame, (quality.width, quality.height), interpolation=cv2.INTER_LINEAR
+        )
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    video_frame = VideoFrame.from_ndarray(frame, format="rgb24")
+    # The encoder converts to yuv420p before encoding
+    return video_frame.reformat(format="yuv420p")
+
+
+def make_convert_current(quality: QualityProfile) -> Callable:
+    """Current path: BGRA buffer wrapped as-is, one swscale pass to yuv420p."""
+    reformatter = VideoReformatter()
+
+    def convert(raw: bytearray, width: int, height: int, _quality) -> VideoFrame:
+        frame = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+        source = bgra_video_frame(frame)
+        return reformatter.reformat(
+            source,
+            width=quality.width,
+            height=quality.height,
+            format="yuv420p",
+            interpolation=Interpolation.BILINEAR,
+        )
+
+    return convert
+
+
+def _time_per_frame(
+    convert: Callable,
+    raws: List[bytearray],
+    width: int,
+    height: int,
+    quality: QualityProfile,
+    frames: int,
+) -> float:
+    convert(raws[0], width, height, quality)  # warm up
+    started = time.perf_counter()
+    for i in range(frames):
+        convert(raws[i % len(raws)], width, height, quality)
+    return (time.perf_counter() - started) * 1000 / frames
+
+
+def benchmark_conversion(
+    width: int = 1920, height: int = 1080, frames: int = 60
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure capture-buffer-to-yuv420p cost per frame for each profile.
+
+    Returns:
+        {profile name: {"legacy_ms": ..., "current_ms": ...}}
+    """
+    raws = [synthetic_capture(width, height, seed) for seed in range(4)]
+    results = {}
+    for quality in (QualityProfile.low(), QualityProfile.high()):
+        results[quality.name] = {
+            "legacy_ms": _time_per_frame(
+                convert_legacy, raws, width, height, quality, frames
+            ),
+            "current_ms": _time_per_frame(
+                make_convert_current(quality), raws, width, height, quality, frames
+            ),
+        }
+    return results
+
+
+class SyntheticSource(FrameSource):
+    """
+    Frame source standing in for CaptureSource.
+
+    Generates BGRA frames at the fastest consumer rate, on the same
+    fixed schedule as the capture thread. A band of noise covering
+    `motion` of the frame height scrolls down the screen, the rest stays
+    still, like a window being updated on an idle desktop.
+    """
+
+    def __init__(self, width: int, height: int, motion: float = 0.1, seed: int = 0):
+        """
+        Initialize a synthetic source.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            motion: Fraction of the frame that changes every frame (0..1)
+            seed: Noise seed
+        """
+        super().__init__()
+        self._width = width
+        self._height = height
+        rng = np.random.default_rng(seed)
+        self._background = np.empty((height, width, 4), dtype=np.uint8)
+        self._background[:] = rng.integers(0, 256, (1, width, 4), dtype=np.uint8)
+        self._background[:, :, 3] = 255
+        self._band_height = int(height * min(max(motion, 0.0), 1.0))
+        self._noise = rng.integers(
+            0, 256, (max(1, self._band_height) * 2, width, 4), dtype=np.uint8
+        )
+        self._consumers: Dict[int, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Bumped per generator thread, a stale one exits on re-attach
+        self._generation = 0
+        self._wake = threading.Event()
+        self._frame_index = 0
+        self.capture_ms = Histogram()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self._width, self._height)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**super().metrics(), "capture_ms": self.capture_ms.summary()}
+
+    def attach(self, consumer: object, fps: float) -> None:
+        self._consumers[id(consumer)] = fps
+        if not self._running:
+            self._running = True
+            self._generation += 1
+            self._thread = threading.Thread(
+                target=self._generate_loop,
+                args=(self._generation,),
+                name="synthetic-capture",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def detach(self, consumer: object) -> None:
+        """Called on the event loop: signal the thread, do not join it."""
+        self._consumers.pop(id(consumer), None)
+        if not self._consumers:
+            self._running = False
+            self._wake.set()
+
+    def stop(self) -> None:
+        """Stop and join the generator thread (blocking)."""
+        self._consumers.clear()
+        self._running = False
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout=2)
+        self._cancel_waiters()
+
+    def _generate_loop(self, generation: int) -> None:
+        next_at = time.monotonic()
+        while self._running and self._generation == generation:
+            started = time.monotonic()
+            with Stopwatch(self.capture_ms):
+                frame = self._generate()
+            self._publish(started, frame)
+
+            next_at += 1.0 / max(self._consumers.values(), default=1)
+            now = time.monotonic()
+            if next_at < now:
+                next_at = now
+            self._wake.wait(next_at - now)
+            self._wake.clear()
+
+    def _generate(self) -> np.ndarray:
+        """New BGRA buffer per frame, like an mss grab."""
+        frame = self._background.copy()
+        if self._band_height:
+            index = self._frame_index
+            top = index * 8 % max(1, self._height - self._band_height)
+            offset = index % self._band_height
+            frame[top : top + self._band_height] = self._noise[
+                offset : offset + self._band_height
+            ]
+        self._frame_index += 1
+        return frame
+
+
+async def _consume(
+    track: ScreenCaptureTrack,
+    quality: QualityProfile,
+    encode_ms: Histogram,
+    received: List[int],
+    index: int,
+) -> None:
+    """
+    Pull a track like an RTCRtpSender: encode raw frames with aiortc's
+    H264Encoder in the default executor, packetize pre-encoded packets.
+    """
+    loop = asyncio.get_running_loop()
+    encoder = H264Encoder()
+    encoder.target_bitrate = quality.bitrate * 1000
+
+    def encode(item) -> None:
+        with Stopwatch(encode_ms):
+            if isinstance(item, VideoFrame):
+                encoder.encode(item)
+            else:
+                encoder.pack(item)
+
+    while True:
+        item = await track.recv()
+        await loop.run_in_executor(None, encode, item)
+        received[index] += 1
+
+
+async def benchmark_pipeline(
+    quality: QualityProfile,
+    viewers: int = 1,
+    width: int = 1920,
+    height: int = 1080,
+    motion: float = 0.1,
+    duration: float = 5.0,
+    shared_encoding: bool = True,
+    warmup: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Stream synthetic capture to N viewer tracks of one profile.
+
+    Runs the agent chain (source -> QualityTier resize/convert to a
+    VideoFrame -> shared H.264 encode -> ScreenCaptureTrack) and an
+    aiortc encoder per viewer, encoding raw frames or packetizing the
+    shared packets the way a peer connection would.
+
+    Args:
+        quality: Profile of every viewer
+        viewers: Number of concurrent viewer tracks
+        width: Synthetic capture width
+        height: Synthetic capture height
+        motion: Fraction of the frame changing every frame
+        duration: Measured seconds
+        shared_encoding: Encode once per tier, else once per viewer
+        warmup: Seconds run before measuring
+
+    Returns:
+        Viewer fps, per-stage latency summaries (ms) and CPU usage
+    """
+    source = SyntheticSource(width, height, motion)
+    encoder = None
+    if shared_encoding:
+        encoder = SharedH264Encoder(
+            quality.width, quality.height, quality.fps, quality.bitrate
+        )
+    tier = QualityTier(source, quality, encoder)
+    tracks = [ScreenCaptureTrack(tier) for _ in range(viewers)]
+    viewer_encode_ms = Histogram()
+    received = [0] * viewers
+    tasks = [
+        asyncio.get_running_loop().create_task(
+            _consume(track, quality, viewer_encode_ms, received, index)
+        )
+        for index, track in enumerate(tracks)
+    ]
+
+    try:
+        await asyncio.sleep(warmup)
+        received_before = sum(received)
+        cpu_before = time.process_time()
+        started = time.perf_counter()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - started
+        cpu = (time.process_time() - cpu_before) / elapsed * 100
+        frames = sum(received) - received_before
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for track in tracks:
+            track.stop()
+        await asyncio.to_thread(source.stop)
+
+    tier_metrics = tier.metrics()
+    return {
+        "profile": quality.name,
+        "viewers": viewers,
+        "shared_encoding": shared_encoding,
+        "fps": round(frames / elapsed / viewers, 2),
+        "target_fps": quality.fps,
+        "capture_ms": source.capture_ms.summary(),
+        "convert_ms": tier_metrics["convert_ms"],
+        "encode_ms": tier_metrics["encode_ms"],
+        "queue_wait_ms": tracks[0].queue_wait_ms.summary(),
+        "viewer_encode_ms": viewer_encode_ms.summary(),
+        "dropped": sum(track.dropped for track in tracks),
+        "cpu_pct": round(cpu, 1),
+        "cpu_pct_per_stream": round(cpu / viewers, 1),
+    }
+
+
+def run_pipeline_benchmarks(
+    profiles: Sequence[QualityProfile],
+    viewer_counts: Sequence[int],
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    """Run benchmark_pipeline for every profile and viewer count."""
+
+    async def run_all() -> List[Dict[str, Any]]:
+        return [
+            await benchmark_pipeline(quality, viewers, **options)
+            for quality in profiles
+            for viewers in viewer_counts
+        ]
+
+    return asyncio.run(run_all())
+
+
+def _print_pipeline_results(results: List[Dict[str, Any]]) -> None:
+    def stage(summary: Dict[str, float]) -> str:
+        return f"{summary['p50']:6.2f}/{summary['p95']:6.2f}"
+
+    print(
+        f"  {'profile':<8}{'viewers':>8}{'fps':>8}"
+        f"  {'capture':>13}  {'convert':>13}  {'encode':>13}"
+        f"  {'queue':>13}  {'viewer enc':>13}{'cpu%':>8}{'/stream':>9}"
+    )
+    for result in results:
+        print(
+            f"  {result['profile']:<8}{result['viewers']:>8}"
+            f"{result['fps']:>5.1f}/{result['target_fps']:<2}"
+            f"  {stage(result['capture_ms'])}  {stage(result['convert_ms'])}"
+            f"  {stage(result['encode_ms'])}  {stage(result['queue_wait_ms'])}"
+            f"  {stage(result['viewer_encode_ms'])}"
+            f"{result['cpu_pct']:>8.1f}{result['cpu_pct_per_stream']:>9.1f}"
+        )
+    print("  (stage latencies in ms, p50/p95)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SFU agent video path benchmarks")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="stream synthetic capture through tiers, tracks and encoders",
+    )
+    parser.add_argument("--profiles", default="low,high")
+    parser.add_argument("--viewers", default="1,4", help="viewer counts to run")
+    parser.add_argument(
+        "--motion", type=float, default=0.1, help="changing fraction of the frame"
+    )
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--raw", action="store_true", help="encode per viewer (no shared encoding)"
+    )
+    args = parser.parse_args()
+
+    if args.pipeline:
+        profiles = [QualityProfile.from_name(name) for name in args.profiles.split(",")]
+        viewer_counts = [int(count) for count in args.viewers.split(",")]
+        mode = "per-viewer" if args.raw else "shared"
+        print(
+            f"Pipeline {args.width}x{args.height}, motion {args.motion:.0%},"
+            f" {mode} encoding, {args.duration:g}s per run"
+        )
+        results = run_pipeline_benchmarks(
+            profiles,
+            viewer_counts,
+            width=args.width,
+            height=args.height,
+            motion=args.motion,
+            duration=args.duration,
+            shared_encoding=not args.raw,
+        )
+        _print_pipeline_results(results)
+        return
+
+    print(f"Capture {args.width}x{args.height} -> yuv420p, {args.frames} frames")
+    results = benchmark_conversion(args.width, args.height, args.frames)
+    for name, result in results.items():
+        speedup = result["legacy_ms"] / max(result["current_ms"], 1e-6)
+        print(
+            f"  {name:<6} legacy {result['legacy_ms']:7.2f} ms"
+            f"  current {result['current_ms']:7.2f} ms  ({speedup:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
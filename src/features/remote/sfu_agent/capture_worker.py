@@ -0,0 +1,549 @@
+"""
+Out-of-process desktop capture and encode.
+
+With AgentConfig.capture_process the whole desktop pipeline (grab,
+change detection, resize/convert and the shared H.264 encode of every
+quality tier) runs in a child process, so it does not compete for the
+GIL with the UI, the device watcher, scheduled jobs and automation
+threads of the app process.
+
+Each tier writes its output (encoded packets, or yuv420p frames without
+shared encoding) into its own multiprocessing.shared_memory ring; the
+pipe only carries control messages and slot descriptors.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+import av
+import numpy as np
+from av import VideoFrame
+
+from . import screen_capture
+from .config import QualityProfile
+from .encoder import SharedH264Encoder
+from .screen_capture import VIDEO_TIME_BASE, CaptureSource, QualityTier
+
+logger = logging.getLogger(__name__)
+
+# Slots per tier ring; a reader this many items behind loses the oldest
+RING_SLOTS = 8
+# Header of a ring: one int64 sequence number per slot, -1 while writing
+HEADER_SIZE = RING_SLOTS * 8
+
+TierKey = Tuple[int, int, int, int]
+
+
+def _slot_size(quality: QualityProfile) -> int:
+    # A yuv420p frame, encoded packets are far smaller
+    return quality.width * quality.height * 3 // 2
+
+
+def _open_ring(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The creating process owns (and unlinks) the segment
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+class _RingWriter:
+    """Tier consumer in the worker, writes each item to a ring slot."""
+
+    def __init__(self, conn: Connection, key: TierKey, slot_size: int):
+        self._conn = conn
+        self._key = key
+        self._slot_size = slot_size
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_SIZE + RING_SLOTS * slot_size
+        )
+        self._headers = np.ndarray((RING_SLOTS,), dtype=np.int64, buffer=self._shm.buf)
+        self._headers[:] = -1
+        self._seq = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _push(self, item) -> None:
+        if isinstance(item, av.Packet):
+            data = np.frombuffer(bytes(item), dtype=np.uint8)
+            keyframe = item.is_keyframe
+        else:
+            data = item.to_ndarray().reshape(-1)
+            keyframe = True
+        if data.nbytes > self._slot_size:
+            logger.warning(f"Tier {self._key}: {data.nbytes}B item exceeds its slot")
+            return
+
+        self._seq += 1
+        slot = self._seq % RING_SLOTS
+        offset = HEADER_SIZE + slot * self._slot_size
+        self._headers[slot] = -1
+        self._shm.buf[offset : offset + data.nbytes] = data
+        self._headers[slot] = self._seq
+        self._conn.send(("item", self._key, self._seq, data.nbytes, item.pts, keyframe))
+
+    def close(self) -> None:
+        del self._headers
+        self._shm.close()
+        self._shm.unlink()
+
+
+class _CaptureProcess:
+    """Runs a CaptureSource and its quality tiers in the worker process."""
+
+    METRICS_INTERVAL = 2.0
+
+    def __init__(self, conn: Connection, monitor_index: int, shared_encoding: bool):
+        self._conn = conn
+        self._monitor_index = monitor_index
+        self._shared_encoding = shared_encoding
+        self._source: Optional[CaptureSource] = None
+        self._tiers: Dict[TierKey, Tuple[QualityTier, _RingWriter]] = {}
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._source = CaptureSource(self._monitor_index)
+        self._conn.send(("ready", self._source.size))
+        metrics_task = loop.create_task(self._metrics_loop())
+        try:
+            while True:
+                try:
+                    message = await loop.run_in_executor(None, self._conn.recv)
+                except (EOFError, OSError):
+                    break  # App process is gone
+                if message[0] == "stop":
+                    break
+                self._handle(message)
+        finally:
+            metrics_task.cancel()
+            for key in list(self._tiers):
+                self._remove_tier(key)
+            self._source.stop()
+
+    def _handle(self, message: tuple) -> None:
+        command, key = message[0], message[1]
+        if command == "attach":
+            self._add_tier(key, message[2])
+        elif command == "detach":
+            self._remove_tier(key)
+        elif command == "keyframe" and key in self._tiers:
+            self._tiers[key][0].request_keyframe()
+
+    def _add_tier(self, key: TierKey, quality: QualityProfile) -> None:
+        if key in self._tiers:
+            return
+        encoder = None
+        if self._shared_encoding:
+            encoder = SharedH264Encoder(
+                quality.width, quality.height, quality.fps, quality.bitrate
+            )
+        tier = QualityTier(self._source, quality, encoder)
+        writer = _RingWriter(self._conn, key, _slot_size(quality))
+        self._conn.send(("tier", key, writer.name))
+        tier.attach(writer)
+        self._tiers[key] = (tier, writer)
+
+    def _remove_tier(self, key: TierKey) -> None:
+        entry = self._tiers.pop(key, None)
+        if entry:
+            tier, writer = entry
+            tier.detach(writer)
+            writer.close()
+
+    async def _metrics_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.METRICS_INTERVAL)
+            tiers = {key: tier.metrics() for key, (tier, _) in self._tiers.items()}
+            self._conn.send(
+                ("metrics", {"source": self._source.metrics(), "tiers": tiers})
+            )
+
+
+def _worker_main(
+    conn: Connection, monitor_index: int, shared_encoding: bool, pts_epoch: float
+) -> None:
+    """Entry point of the capture process."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    # Tiers stamp PTS against the app's origin, across worker restarts too
+    screen_capture.PTS_EPOCH = pts_epoch
+    try:
+        asyncio.run(_CaptureProcess(conn, monitor_index, shared_encoding).run())
+    except Exception as e:
+        logger.error(f"Capture process failed: {e}")
+        try:
+            conn.send(("error", str(e)))
+        except OSError:
+            pass
+
+
+class ProcessQualityTier:
+    """
+    App-side proxy of a quality tier running in the capture process.
+
+    Used by ScreenCaptureTrack like a QualityTier: it copies each item
+    out of the shared memory ring and hands it to the attached tracks on
+    the agent loop.
+    """
+
+    def __init__(
+        self,
+        worker: "CaptureWorker",
+        key: TierKey,
+        quality: QualityProfile,
+        encoded: bool,
+    ):
+        self.quality = quality
+        self._worker = worker
+        self._key = key
+        self._encoded = encoded
+        self._consumers: Dict[int, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._headers: Optional[np.ndarray] = None
+        # The ring is read on the reader thread and closed on the loop
+        self._ring_lock = threading.Lock()
+        self._slot_size = _slot_size(quality)
+        self._running = False
+        self.lapped = 0  # Items overwritten before they were read
+
+    @property
+    def encoded(self) -> bool:
+        return self._encoded
+
+    @property
+    def consumer_count(self) -> int:
+        return len(self._consumers)
+
+    def attach(self, track: Any) -> None:
+        """Add a viewer track, starting the tier in the worker if needed."""
+        self._consumers[id(track)] = track
+        self._loop = asyncio.get_event_loop()
+        if not self._running:
+            self._running = True
+            self._worker.send(("attach", self._key, self.quality))
+        else:
+            self.request_keyframe()
+
+    def detach(self, track: Any) -> None:
+        """Remove a viewer track, stopping the tier when none are left."""
+        self._consumers.pop(id(track), None)
+        if not self._consumers:
+            self.stop()
+
+    def request_keyframe(self) -> None:
+        if self._encoded:
+            self._worker.send(("keyframe", self._key))
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self._worker.send(("detach", self._key))
+        self._close_ring()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self._worker.tier_metrics(self._key),
+            "viewers": self.consumer_count,
+            "lapped": self.lapped,
+        }
+
+    # =========================================================================
+    # PRIVATE (reader thread)
+    # =========================================================================
+
+    def _open_ring(self, name: str) -> None:
+        with self._ring_lock:
+            self._close_ring_locked()
+            self._shm = _open_ring(name)
+            self._headers = np.ndarray(
+                (RING_SLOTS,), dtype=np.int64, buffer=self._shm.buf
+            )
+
+    def _close_ring(self) -> None:
+        with self._ring_lock:
+            self._close_ring_locked()
+
+    def _close_ring_locked(self) -> None:
+        if self._shm:
+            self._headers = None
+            self._shm.close()
+            self._shm = None
+
+    def _read(self, seq: int, size: int, pts: int, keyframe: bool) -> None:
+        """Copy an item out of its slot and deliver it on the agent loop."""
+        with self._ring_lock:
+            if self._shm is None or not self._running:
+                return
+            slot = seq % RING_SLOTS
+            offset = HEADER_SIZE + slot * self._slot_size
+            data = np.frombuffer(
+                self._shm.buf, dtype=np.uint8, count=size, offset=offset
+            )
+            if self._encoded:
+                item = av.Packet(data.tobytes())
+                item.is_keyframe = keyframe
+            else:
+                width, height = self.quality.width, self.quality.height
+                item = VideoFrame.from_ndarray(
+                    data.reshape(height * 3 // 2, width), format="yuv420p"
+                )
+            del data
+            # The worker reuses the slot RING_SLOTS items later
+            lapped = self._headers[slot] != seq
+
+        if lapped:
+            self.lapped += 1
+            self.request_keyframe()
+            return
+        item.pts = pts  # Already relative to screen_capture.PTS_EPOCH
+        item.time_base = VIDEO_TIME_BASE
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, item)
+        except RuntimeError:
+            pass  # Agent loop closed
+
+    def _deliver(self, item) -> None:
+        for track in list(self._consumers.values()):
+            track._push(item)
+
+    def _fail(self) -> None:
+        """Stop the attached tracks, the capture process is gone for good."""
+        self._running = False
+        self._close_ring()
+        for track in list(self._consumers.values()):
+            track.stop()
+
+
+class CaptureWorker:
+    """
+    Handle of the capture process.
+
+    Started with the spawn method (the app process runs many threads);
+    a reader thread receives slot descriptors and dispatches them to the
+    tier proxies. A process that dies is started again and the running
+    tiers are re-attached to it; after MAX_RESTARTS crashes within
+    RESTART_WINDOW seconds the tiers' tracks are stopped instead.
+    """
+
+    START_TIMEOUT = 15.0
+    STOP_TIMEOUT = 5.0
+    MAX_RESTARTS = 3
+    RESTART_WINDOW = 60.0
+
+    def __init__(self, monitor_index: int = 0, shared_encoding: bool = True):
+        """
+        Initialize the worker handle (the process starts on first use).
+
+        Args:
+            monitor_index: Monitor to capture (0 = primary)
+            shared_encoding: Encode tiers in the worker, else hand out
+                yuv420p frames for aiortc to encode per viewer
+        """
+        self._monitor_index = monitor_index
+        self._shared_encoding = shared_encoding
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn: Optional[Connection] = None
+        self._reader: Optional[threading.Thread] = None
+        self._send_lock = threading.Lock()
+        self._tiers: Dict[TierKey, ProcessQualityTier] = {}
+        self._metrics: Dict[str, Any] = {}
+        self._size: Tuple[int, int] = (0, 0)
+        self._restarted_at: List[float] = []
+
+    @property
+    def is_alive(self) -> bool:
+        return bool(self._process and self._process.is_alive())
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Size of the captured monitor."""
+        self.start()
+        return self._size
+
+    def start(self) -> None:
+        """
+        Start the capture process if it is not running.
+
+        Raises:
+            RuntimeError: If the process does not come up
+        """
+        if self.is_alive:
+            return
+        self._process, self._conn = self._spawn()
+        self._start_reader(self._conn)
+
+    def create_tier(self, quality: QualityProfile) -> ProcessQualityTier:
+        """Create the proxy of a tier (it starts in the worker on attach)."""
+        self.start()
+        key = (quality.width, quality.height, quality.fps, quality.bitrate)
+        tier = ProcessQualityTier(self, key, quality, self._shared_encoding)
+        self._tiers[key] = tier
+        return tier
+
+    def send(self, message: tuple) -> None:
+        if message[0] == "detach":
+            self._tiers.pop(message[1], None)
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+            except (OSError, AttributeError) as e:
+                logger.error(f"Capture process unreachable: {e}")
+
+    def tier_metrics(self, key: TierKey) -> Dict[str, Any]:
+        return self._metrics.get("tiers", {}).get(key, {})
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "process": {
+                "pid": self._process.pid if self._process else None,
+                "alive": self.is_alive,
+            },
+            "source": self._metrics.get("source"),
+        }
+
+    def stop(self) -> None:
+        """Stop the capture process."""
+        for tier in list(self._tiers.values()):
+            tier.stop()
+        # Cleared first, the reader thread then knows the exit is expected
+        with self._send_lock:
+            process, self._process = self._process, None
+        if process:
+            if process.is_alive():
+                self.send(("stop", None))
+                process.join(timeout=self.STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+        if self._reader:
+            self._reader.join(timeout=self.STOP_TIMEOUT)
+            self._reader = None
+        logger.info("Capture process stopped")
+
+    def _spawn(self) -> Tuple[multiprocessing.Process, Connection]:
+        """Start a capture process and wait until it is ready."""
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self._monitor_index,
+                self._shared_encoding,
+                screen_capture.PTS_EPOCH,
+            ),
+            name="sfu-capture",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        try:
+            if conn.poll(self.START_TIMEOUT):
+                message = conn.recv()
+            else:
+                message = ("error", "did not start")
+        except (EOFError, OSError):
+            message = ("error", "exited while starting")
+        if message[0] != "ready":
+            conn.close()
+            if process.is_alive():
+                process.terminate()
+            raise RuntimeError(f"Capture process failed: {message[1]}")
+
+        self._size = message[1]
+        logger.info(
+            f"Capture process started (pid {process.pid}): "
+            f"{self._size[0]}x{self._size[1]}"
+        )
+        return process, conn
+
+    def _start_reader(self, conn: Connection) -> None:
+        self._reader = threading.Thread(
+            target=self._reader_loop,
+            args=(conn,),
+            name="sfu-capture-reader",
+            daemon=True,
+        )
+        self._reader.start()
+
+    def _reader_loop(self, conn: Connection) -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            kind, payload = message[0], message[1:]
+            if kind == "item":
+                tier = self._tiers.get(payload[0])
+                if tier:
+                    tier._read(*payload[1:])
+            elif kind == "tier":
+                tier = self._tiers.get(payload[0])
+                if tier:
+                    tier._open_ring(payload[1])
+            elif kind == "metrics":
+                self._metrics = payload[0]
+            elif kind == "error":
+                logger.error(f"Capture process error: {payload[0]}")
+
+        if self._process is not None and self._conn is conn:
+            logger.error("Capture process exited unexpectedly")
+            self._restart(conn)
+
+    def _restart(self, dead_conn: Connection) -> None:
+        """Replace a crashed process and re-attach its tiers (reader thread)."""
+        now = time.monotonic()
+        self._restarted_at = [
+            at for at in self._restarted_at if now - at < self.RESTART_WINDOW
+        ]
+        if len(self._restarted_at) >= self.MAX_RESTARTS:
+            logger.error("Capture process keeps crashing, stopping its tracks")
+            self._fail_tiers()
+            return
+        self._restarted_at.append(now)
+
+        try:
+            process, conn = self._spawn()
+        except RuntimeError as e:
+            logger.error(f"Capture process restart failed: {e}")
+            self._fail_tiers()
+            return
+
+        with self._send_lock:
+            if self._process is None:
+                # stop() ran meanwhile
+                conn.close()
+                process.terminate()
+                return
+            self._process, self._conn = process, conn
+            # Attaches sent to the dead process were lost, send them all
+            tiers = [tier for tier in self._tiers.values() if tier._running]
+            for tier in tiers:
+                conn.send(("attach", tier._key, tier.quality))
+        dead_conn.close()
+        self._start_reader(conn)
+        logger.info(f"Capture process restarted, {len(tiers)} tier(s) re-attached")
+
+    def _fail_tiers(self) -> None:
+        for tier in list(self._tiers.values()):
+            if tier._loop is not None:
+                try:
+                    tier._loop.call_soon_threadsafe(tier._fail)
+                except RuntimeError:
+                    pass  # Agent loop closed
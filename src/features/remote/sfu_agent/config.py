@@ -68,7 +68,25 @@ class AgentConfig:
         ice_servers: List of STUN/TURN servers
         initial_quality: Initial stream quality (low/high)
         reconnect_interval: Seconds between reconnection attempts
+        restart_attempts: Times a failed viewer session is restarted on a
+            new peer connection before it is closed
+        restart_timeout: Seconds a restarted session has to connect
         capture_monitor: Monitor index to capture (0 = primary)
+        shared_encoding: Encode each quality tier once and send the same
+            H.264 packets to all its viewers
+        capture_process: Run desktop capture and encoding in a separate
+            process, frames reach the agent through shared memory
+        adaptive_quality: Step each viewer's quality down/up from its
+            WebRTC stats, below the quality it requested
+        adaptation_interval: Seconds between stats samples
+        min_bitrate: Lowest bitrate adaptation may pick (kbps)
+        min_fps: Lowest frame rate adaptation may pick
+        min_height: Lowest frame height adaptation may pick
+        android_bitrate: Device encoder bitrate of Android streams (kbps)
+        android_max_fps: Frame rate cap of Android streams
+        android_max_size: Longest side of Android streams, 0 for native
+        metrics_interval: Seconds between video path metrics reports sent
+            to the SFU, 0 to disable
     """
 
     sfu_url: str
@@ -95,8 +113,21 @@ class AgentConfig:
     )
     initial_quality: str = "low"
     reconnect_interval: float = 5.0
+    restart_attempts: int = 3
+    restart_timeout: float = 15.0
     capture_monitor: int = 0
     enable_input: bool = True
+    shared_encoding: bool = True
+    capture_process: bool = False
+    adaptive_quality: bool = True
+    adaptation_interval: float = 2.0
+    min_bitrate: int = 200
+    min_fps: int = 5
+    min_height: int = 360
+    android_bitrate: int = 8000
+    android_max_fps: int = 30
+    android_max_size: int = 0
+    metrics_interval: float = 0
 
     def get_ice_servers(self) -> List[Dict[str, Any]]:
         """Get ICE servers as list of dictionaries."""
@@ -0,0 +1,117 @@
+"""
+Shared H.264 encoder for quality tiers.
+
+Encodes a tier's frames once and hands the same av.Packets to every
+viewer on that tier. aiortc packetizes pre-encoded packets with
+H264Encoder.pack() instead of encoding per peer connection, as long as
+the connection negotiated H.264.
+"""
+
+import fractions
+import logging
+from typing import List, Optional
+
+import av
+from av import VideoFrame
+
+logger = logging.getLogger(__name__)
+
+
+def is_h264_available() -> bool:
+    """Check that PyAV was built with libx264."""
+    try:
+        av.codec.Codec("libx264", "w")
+        return True
+    except Exception:
+        return False
+
+
+class SharedH264Encoder:
+    """
+    libx264 encoder producing packets that several senders can share.
+
+    Settings mirror aiortc's own H264Encoder (baseline, zerolatency) so
+    browsers decode the stream the same way.
+    """
+
+    # Keyframe at least this often so viewers recover from packet loss
+    # (PLI from one viewer cannot reach a shared encoder)
+    KEYFRAME_INTERVAL = 2.0
+
+    def __init__(self, width: int, height: int, fps: int, bitrate: int):
+        """
+        Initialize the encoder.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            fps: Frame rate
+            bitrate: Target bitrate in kbps
+        """
+        self._width = width
+        self._height = height
+        self._fps = fps
+        self._bitrate = bitrate * 1000
+        self._codec: Optional[av.CodecContext] = None
+        self._keyframe_requested = True
+
+    def request_keyframe(self) -> None:
+        """Make the next encoded frame a keyframe (new viewer, loss)."""
+        self._keyframe_requested = True
+
+    def set_bitrate(self, bitrate: int) -> None:
+        """Change target bitrate in kbps (encoder is recreated on next frame)."""
+        if bitrate * 1000 != self._bitrate:
+            self._bitrate = bitrate * 1000
+            self._codec = None
+            self._keyframe_requested = True
+
+    def encode(self, frame: VideoFrame) -> List[av.Packet]:
+        """
+        Encode one frame (blocking, call from a worker thread).
+
+        Args:
+            frame: Frame with pts and time_base set
+
+        Returns:
+            Encoded packets with pts/time_base set for aiortc
+        """
+        # set_bitrate() may drop the codec from the loop thread meanwhile
+        codec = self._codec
+        if codec is None or codec.time_base != frame.time_base:
+            codec = self._codec = self._create_codec(frame.time_base)
+            self._keyframe_requested = True
+
+        if self._keyframe_requested:
+            frame.pict_type = av.video.frame.PictureType.I
+            self._keyframe_requested = False
+        else:
+            frame.pict_type = av.video.frame.PictureType.NONE
+
+        packets = codec.encode(frame)
+        for packet in packets:
+            packet.time_base = codec.time_base
+        return packets
+
+    def close(self) -> None:
+        self._codec = None
+
+    def _create_codec(self, time_base: fractions.Fraction) -> av.CodecContext:
+        codec = av.CodecContext.create("libx264", "w")
+        codec.width = self._width
+        codec.height = self._height
+        codec.bit_rate = self._bitrate
+        codec.pix_fmt = "yuv420p"
+        codec.framerate = fractions.Fraction(self._fps, 1)
+        codec.time_base = time_base
+        codec.gop_size = max(1, int(self._fps * self.KEYFRAME_INTERVAL))
+        codec.options = {
+            "level": "31",
+            "tune": "zerolatency",
+        }
+        codec.profile = "Baseline"
+        logger.info(
+            f"Shared H.264 encoder: {self._width}x{self._height} "
+            f"@ {self._fps}fps, {self._bitrate // 1000}kbps"
+        )
+        return codec
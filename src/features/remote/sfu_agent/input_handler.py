@@ -3,10 +3,18 @@ Input Handler for remote mouse and keyboard control.
 
 Handles mouse and keyboard events received from viewers
 and translates them to local system inputs.
+
+Events are queued and injected by a dedicated worker thread, so pynput
+calls never run on the agent's asyncio loop. Consecutive mouse moves
+are coalesced to the latest position; every other event keeps its order.
 """
 
 import logging
-from typing import Optional, Tuple, Set
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Set
 
 from pynput.mouse import Button, Controller as MouseController
 from pynput.keyboard import Key, Controller as KeyboardController
@@ -62,14 +70,28 @@ MOUSE_BUTTON_MAP = {
 }
 
 
+@dataclass
+class _QueuedInput:
+    """Input waiting for the injection worker."""
+
+    action: Callable[..., None]
+    args: tuple
+    queued_at: float
+    is_move: bool = False
+
+
 class InputHandler:
     """
     Handles remote input events.
 
     Translates mouse and keyboard events from the web client
-    into local system actions using pynput.
+    into local system actions using pynput, on a dedicated
+    injection thread.
     """
 
+    # Injection latencies kept for stats()
+    LATENCY_SAMPLES = 256
+
     def __init__(
         self,
         screen_size: Tuple[int, int],
@@ -93,6 +115,18 @@ class InputHandler:
         self._keyboard = KeyboardController()
         self._pressed_keys: Set[str] = set()
 
+        self._queue: Deque[_QueuedInput] = deque()
+        self._condition = threading.Condition()
+        self._running = True
+        self._received = 0
+        self._injected = 0
+        self._coalesced = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._worker = threading.Thread(
+            target=self._injection_loop, name="sfu-input", daemon=True
+        )
+        self._worker.start()
+
         logger.info(
             f"Input handler initialized: screen={screen_size}, "
             f"stream={stream_size}, enabled={enabled}"
@@ -137,7 +171,7 @@ class InputHandler:
         delta_y: float = 0,
     ) -> None:
         """
-        Handle a mouse event.
+        Queue a mouse event for injection.
 
         Args:
             event_type: Event type (mousemove, mousedown, mouseup, click, wheel)
@@ -150,8 +184,24 @@ class InputHandler:
         if not self._enabled:
             return
 
+        # Scale now, the stream size may change before injection
+        scaled_x, scaled_y = self._scale_coordinates(x, y)
+        self._enqueue(
+            self._inject_mouse_event,
+            (event_type, scaled_x, scaled_y, button, delta_x, delta_y),
+            is_move=event_type == "mousemove",
+        )
+
+    def _inject_mouse_event(
+        self,
+        event_type: str,
+        scaled_x: int,
+        scaled_y: int,
+        button: int,
+        delta_x: float,
+        delta_y: float,
+    ) -> None:
         try:
-            scaled_x, scaled_y = self._scale_coordinates(x, y)
             mouse_button = MOUSE_BUTTON_MAP.get(button, Button.left)
 
             if event_type == "mousemove":
@@ -195,7 +245,7 @@ class InputHandler:
         modifiers: Optional[list] = None,
     ) -> None:
         """
-        Handle a keyboard event.
+        Queue a keyboard event for injection.
 
         Args:
             event_type: Event type (keydown, keyup)
@@ -206,6 +256,9 @@ class InputHandler:
         if not self._enabled:
             return
 
+        self._enqueue(self._inject_keyboard_event, (event_type, key, code))
+
+    def _inject_keyboard_event(self, event_type: str, key: str, code: str) -> None:
         try:
             # Map special keys
             if key in KEY_MAP:
@@ -234,7 +287,70 @@ class InputHandler:
             logger.error(f"Error handling keyboard event: {e}")
 
     def release_all_keys(self) -> None:
-        """Release all currently pressed keys."""
+        """Release all currently pressed keys (after queued events)."""
+        self._enqueue(self._release_pressed_keys, ())
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Inject what is still queued and stop the worker thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._worker.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, event counters and injection latency (ms)."""
+        with self._condition:
+            depth = len(self._queue)
+            latencies = sorted(self._latencies)
+
+        latency = {"avg": 0.0, "p95": 0.0, "max": 0.0}
+        if latencies:
+            latency = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 2),
+                "p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2),
+            }
+        return {
+            "queue_depth": depth,
+            "received": self._received,
+            "injected": self._injected,
+            "coalesced": self._coalesced,
+            "latency_ms": latency,
+        }
+
+    def _enqueue(
+        self, action: Callable[..., None], args: tuple, is_move: bool = False
+    ) -> None:
+        item = _QueuedInput(action, args, time.monotonic(), is_move)
+        with self._condition:
+            self._received += 1
+            if is_move and self._queue and self._queue[-1].is_move:
+                # Only the latest position matters, keep the older
+                # timestamp so latency reflects the real wait
+                item.queued_at = self._queue[-1].queued_at
+                self._queue[-1] = item
+                self._coalesced += 1
+                return
+            self._queue.append(item)
+            self._condition.notify()
+
+    def _injection_loop(self) -> None:
+        """Worker thread: inject queued events in order."""
+        while True:
+            with self._condition:
+                while not self._queue and self._running:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                item = self._queue.popleft()
+
+            item.action(*item.args)
+            latency = time.monotonic() - item.queued_at
+            with self._condition:
+                self._injected += 1
+                self._latencies.append(latency)
+
+    def _release_pressed_keys(self) -> None:
         for key in list(self._pressed_keys):
             try:
                 if key in KEY_MAP:
@@ -0,0 +1,85 @@
+"""
+Lightweight metrics for the SFU agent video path.
+
+Histograms keep a rolling window of samples and summarize them on
+demand; rate meters count events over a sliding time window. Both are
+cheap enough to record from capture, conversion and encode code on
+every frame, and are read by WebRTCManager.metrics().
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+
+
+class Histogram:
+    """Rolling window of samples (e.g. milliseconds per frame)."""
+
+    def __init__(self, size: int = 300):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        with self._lock:
+            self._samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, average, p50, p95 and max of the window."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "count": len(samples),
+            "avg": round(sum(samples) / len(samples), 2),
+            "p50": round(samples[len(samples) // 2], 2),
+            "p95": round(samples[max(0, int(len(samples) * 0.95) - 1)], 2),
+            "max": round(samples[-1], 2),
+        }
+
+
+class RateMeter:
+    """Events per second over the last WINDOW seconds, plus a total."""
+
+    WINDOW = 5.0
+
+    def __init__(self):
+        self._events: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def mark(self, count: int = 1) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.total += count
+            for _ in range(count):
+                self._events.append(now)
+            self._trim(now)
+
+    @property
+    def rate(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return round(len(self._events) / self.WINDOW, 2)
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.WINDOW
+        while self._events and self._events[0] < cutoff:
+            self._events.popleft()
+
+
+class Stopwatch:
+    """Context manager recording elapsed milliseconds into a Histogram."""
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._started = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._histogram.record((time.perf_counter() - self._started) * 1000)
@@ -0,0 +1,340 @@
+"""
+Composited multi-phone mosaic.
+
+A grid viewer watching N phones gets one video track: each phone is
+streamed by scrcpy at cell size, decoded, and its latest frame is tiled
+into one canvas with NumPy. The canvas feeds a regular QualityTier, so
+the whole grid costs one encode and one peer connection per viewer
+(or none extra, when viewers share the same mosaic).
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import av
+import numpy as np
+
+from .android_stream import AndroidStreamManager, AndroidStreamSource
+from .config import QualityProfile
+from .encoder import SharedH264Encoder, is_h264_available
+from .metrics import Histogram, Stopwatch
+from .screen_capture import FrameSource, QualityTier, ScreenCaptureTrack
+
+logger = logging.getLogger(__name__)
+
+
+class _DeviceFeed:
+    """Consumer of one device stream, hands its packets to the mosaic."""
+
+    def __init__(self, mosaic: "MosaicSource", index: int):
+        self._mosaic = mosaic
+        self.index = index
+        # Set after a dropped packet, later packets need the lost one
+        self.waiting_keyframe = False
+
+    def _push(self, packet: av.Packet) -> None:
+        if self.waiting_keyframe:
+            if not packet.is_keyframe:
+                return
+            self.waiting_keyframe = False
+        try:
+            self._mosaic._packets.put_nowait((self, packet))
+        except queue.Full:
+            self.waiting_keyframe = True
+
+
+class MosaicSource(FrameSource):
+    """
+    Frame source tiling the live streams of several devices.
+
+    A worker thread decodes the packets of every device and composes the
+    canvas; a new frame is published at the consumer frame rate, only
+    when a cell changed.
+    """
+
+    BACKGROUND = 24
+    # Bitrate asked from each phone, cells are small
+    DEVICE_BITRATE = 400
+    # Decoder backlog before packets are dropped (and the device waits
+    # for its next keyframe)
+    QUEUE_SIZE = 256
+    LABEL_HEIGHT = 18
+
+    def __init__(
+        self,
+        android_manager: AndroidStreamManager,
+        device_ids: Sequence[str],
+        width: int,
+        height: int,
+        labels: bool = True,
+    ):
+        """
+        Initialize a mosaic.
+
+        Args:
+            android_manager: Provides the shared device streams
+            device_ids: ADB serials, in grid order
+            width: Canvas width
+            height: Canvas height
+            labels: Draw the device serial under each cell
+        """
+        super().__init__()
+        self._android_manager = android_manager
+        self._device_ids = list(device_ids)
+        self._width = width
+        self._height = height
+        self._labels = labels
+
+        # Fixed layout: as square a grid as possible
+        count = max(1, len(self._device_ids))
+        self._cols = math.ceil(math.sqrt(count))
+        self._rows = math.ceil(count / self._cols)
+        self._cell_width = width // self._cols // 2 * 2
+        self._cell_height = height // self._rows // 2 * 2
+
+        self._canvas = np.full((height, width, 4), self.BACKGROUND, dtype=np.uint8)
+        self._canvas[:, :, 3] = 255
+        self._dirty = True
+
+        self._packets: "queue.Queue[Tuple[_DeviceFeed, av.Packet]]" = queue.Queue(
+            maxsize=self.QUEUE_SIZE
+        )
+        self._decoders: Dict[int, av.CodecContext] = {}
+        self._feeds: List[Tuple[AndroidStreamSource, _DeviceFeed]] = []
+        self._consumers: Dict[int, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.decode_ms = Histogram()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self._width, self._height)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **super().metrics(),
+            "devices": self._device_ids,
+            "backlog": self._packets.qsize(),
+            "decode_ms": self.decode_ms.summary(),
+        }
+
+    def attach(self, consumer: object, fps: float) -> None:
+        """Register a consumer, starting the device streams if needed."""
+        self._consumers[id(consumer)] = fps
+        if self._running:
+            return
+
+        self._running = True
+        device_size = max(self._cell_width, self._cell_height)
+        for index, device_id in enumerate(self._device_ids):
+            try:
+                source = self._android_manager.get_source(
+                    device_id,
+                    max_size=device_size,
+                    bitrate=self.DEVICE_BITRATE,
+                    max_fps=int(fps),
+                )
+            except RuntimeError as e:
+                logger.error(f"Mosaic cannot stream {device_id}: {e}")
+                continue
+            feed = _DeviceFeed(self, index)
+            source.attach(feed)
+            self._feeds.append((source, feed))
+
+        self._thread = threading.Thread(
+            target=self._worker_loop, name="sfu-mosaic", daemon=True
+        )
+        self._thread.start()
+
+    def detach(self, consumer: object) -> None:
+        """Unregister a consumer, stopping when none are left."""
+        self._consumers.pop(id(consumer), None)
+        if not self._consumers:
+            self.stop()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        for source, feed in self._feeds:
+            source.detach(feed)
+        self._feeds.clear()
+        self._android_manager.prune()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._decoders.clear()
+
+    # =========================================================================
+    # PRIVATE (worker thread)
+    # =========================================================================
+
+    def _worker_loop(self) -> None:
+        """Decode packets as they come, publish the canvas at the frame rate."""
+        next_at = time.monotonic()
+        while self._running:
+            timeout = next_at - time.monotonic()
+            if timeout > 0:
+                try:
+                    feed, packet = self._packets.get(timeout=timeout)
+                except queue.Empty:
+                    pass
+                else:
+                    self._decode(feed, packet)
+                    continue
+
+            fps = max(self._consumers.values(), default=1)
+            next_at += 1.0 / fps
+            now = time.monotonic()
+            if next_at < now:
+                next_at = now
+
+            if self._dirty:
+                self._dirty = False
+                self._publish(now, self._canvas.copy())
+
+    def _decode(self, feed: _DeviceFeed, packet: av.Packet) -> None:
+        decoder = self._decoders.get(feed.index)
+        if decoder is None:
+            decoder = av.CodecContext.create("h264", "r")
+            self._decoders[feed.index] = decoder
+
+        try:
+            with Stopwatch(self.decode_ms):
+                frames = decoder.decode(packet)
+        except av.error.FFmpegError as e:
+            logger.debug(f"Mosaic decode error (cell {feed.index}): {e}")
+            feed.waiting_keyframe = True
+            return
+        if frames:
+            self._draw_cell(feed.index, frames[-1])
+
+    def _draw_cell(self, index: int, frame: av.VideoFrame) -> None:
+        """Scale a device frame into its cell, keeping the aspect ratio."""
+        row, col = divmod(index, self._cols)
+        left = col * self._cell_width
+        top = row * self._cell_height
+        area_height = self._cell_height - (self.LABEL_HEIGHT if self._labels else 0)
+
+        scale = min(self._cell_width / frame.width, area_height / frame.height)
+        width = max(2, int(frame.width * scale) // 2 * 2)
+        height = max(2, int(frame.height * scale) // 2 * 2)
+        image = frame.to_ndarray(width=width, height=height, format="bgra")
+
+        cell = self._canvas[
+            top : top + self._cell_height, left : left + self._cell_width
+        ]
+        cell[:, :, :3] = self.BACKGROUND
+        x = (self._cell_width - width) // 2
+        y = (area_height - height) // 2
+        cell[y : y + height, x : x + width] = image
+        cell[:, :, 3] = 255
+
+        if self._labels:
+            self._draw_label(cell, self._device_ids[index])
+        self._dirty = True
+
+    def _draw_label(self, cell: np.ndarray, text: str) -> None:
+        try:
+            import cv2
+        except ImportError:
+            self._labels = False
+            return
+        cv2.putText(
+            cell,
+            text,
+            (4, self._cell_height - 5),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.4,
+            (220, 220, 220, 255),
+            1,
+            cv2.LINE_AA,
+        )
+
+
+class MosaicManager:
+    """
+    Creates mosaic tracks; viewers of the same devices and quality share
+    one mosaic and one encoder.
+    """
+
+    def __init__(
+        self, android_manager: AndroidStreamManager, shared_encoding: bool = True
+    ):
+        self._android_manager = android_manager
+        self._shared_encoding = shared_encoding and is_h264_available()
+        self._mosaics: Dict[tuple, Tuple[MosaicSource, QualityTier]] = {}
+        self._tracks: Dict[str, ScreenCaptureTrack] = {}
+
+    @property
+    def shared_encoding(self) -> bool:
+        return self._shared_encoding
+
+    def create_track(
+        self, viewer_id: str, device_ids: Sequence[str], quality: QualityProfile
+    ) -> ScreenCaptureTrack:
+        """
+        Create a mosaic track for a viewer.
+
+        Args:
+            viewer_id: Viewer identifier
+            device_ids: ADB serials, in grid order
+            quality: Canvas size, frame rate and bitrate
+        """
+        key = (
+            tuple(device_ids),
+            quality.width,
+            quality.height,
+            quality.fps,
+            quality.bitrate,
+        )
+        entry = self._mosaics.get(key)
+        if entry is None:
+            mosaic = MosaicSource(
+                self._android_manager, device_ids, quality.width, quality.height
+            )
+            encoder = None
+            if self._shared_encoding:
+                encoder = SharedH264Encoder(
+                    quality.width, quality.height, quality.fps, quality.bitrate
+                )
+            entry = (mosaic, QualityTier(mosaic, quality, encoder))
+            self._mosaics[key] = entry
+            logger.info(f"Created mosaic of {len(device_ids)} devices: {key[1:]}")
+
+        track = ScreenCaptureTrack(entry[1])
+        self._tracks[viewer_id] = track
+        return track
+
+    def has_track(self, viewer_id: str) -> bool:
+        return viewer_id in self._tracks
+
+    def remove_track(self, viewer_id: str) -> None:
+        track = self._tracks.pop(viewer_id, None)
+        if track:
+            track.stop()
+        for key, (mosaic, tier) in list(self._mosaics.items()):
+            if tier.consumer_count == 0:
+                tier.stop()
+                mosaic.stop()
+                del self._mosaics[key]
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Metrics of the running mosaics and their tiers."""
+        return [
+            {"source": mosaic.metrics(), "tier": tier.metrics()}
+            for mosaic, tier in self._mosaics.values()
+        ]
+
+    def stop_all(self) -> None:
+        for track in self._tracks.values():
+            track.stop()
+        self._tracks.clear()
+        for mosaic, tier in self._mosaics.values():
+            tier.stop()
+            mosaic.stop()
+        self._mosaics.clear()
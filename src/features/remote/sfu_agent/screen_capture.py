@@ -2,156 +2,670 @@
 Screen Capture module for WebRTC streaming.
 
 Provides a high-performance screen capture VideoStreamTrack
-optimized for low latency streaming.
+optimized for low latency streaming. One CaptureSource per monitor
+feeds every viewer track.
 """
 
+import abc
 import asyncio
+import fractions
 import logging
 import threading
 import time
-from typing import Optional, Tuple
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-import cv2
+import av
 import numpy as np
 import mss
 from av import VideoFrame
+from av.video.reformatter import Interpolation, VideoReformatter
 from aiortc import VideoStreamTrack
+from aiortc.mediastreams import MediaStreamError
 
 from .config import QualityProfile
+from .encoder import SharedH264Encoder, is_h264_available
+from .metrics import Histogram, RateMeter, Stopwatch
 
 logger = logging.getLogger(__name__)
 
-# Thread-local storage for mss instances
-_thread_local = threading.local()
+# RTP video clock, frame timestamps are expressed in it
+VIDEO_CLOCK_RATE = 90000
+VIDEO_TIME_BASE = fractions.Fraction(1, VIDEO_CLOCK_RATE)
 
+# Common PTS origin of all tiers (monotonic clock), so a track moving to
+# another tier keeps increasing RTP timestamps. The capture process is
+# handed the app's value, the clock is system-wide.
+PTS_EPOCH = time.monotonic()
 
-def get_mss():
-    """Get thread-local mss instance."""
-    if not hasattr(_thread_local, "sct"):
-        _thread_local.sct = mss.mss()
-    return _thread_local.sct
+# VideoFrame.from_numpy_buffer() accepts bgra since PyAV 14.0
+BGRA_BUFFER_SUPPORTED = int(av.__version__.split(".")[0]) >= 14
 
 
-class ScreenCaptureTrack(VideoStreamTrack):
+def bgra_video_frame(frame: np.ndarray) -> VideoFrame:
+    """Wrap a BGRA capture buffer in a VideoFrame (copied on PyAV < 14)."""
+    if BGRA_BUFFER_SUPPORTED:
+        return VideoFrame.from_numpy_buffer(frame, format="bgra")
+    return VideoFrame.from_ndarray(frame, format="bgra")
+
+
+@dataclass(frozen=True)
+class CapturedFrame:
+    """One grab of the capture thread."""
+
+    seq: int
+    timestamp: float  # time.monotonic() when the grab started
+    data: np.ndarray  # BGRA, shared between consumers, do not modify
+
+
+class FrameSource(abc.ABC):
     """
-    WebRTC VideoStreamTrack that captures screen content.
+    Ring buffer of BGRA frames filled by a producer thread.
 
-    Optimized for low latency with configurable quality profiles.
-    Uses mss for fast screen capture and av for frame encoding.
+    Asyncio consumers (quality tiers) attach with the frame rate they
+    need and wait on it with next_frame(). Subclasses run the producer
+    from attach()/detach().
     """
 
-    kind = "video"
+    # Frames kept in the ring buffer
+    RING_SIZE = 3
 
-    def __init__(
-        self, monitor_index: int = 0, quality: Optional[QualityProfile] = None
-    ):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ring: Deque[CapturedFrame] = deque(maxlen=self.RING_SIZE)
+        self._seq = 0
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.published = RateMeter()
+
+    @property
+    def latest(self) -> Optional[CapturedFrame]:
+        """Newest frame in the ring buffer."""
+        with self._lock:
+            return self._ring[-1] if self._ring else None
+
+    async def next_frame(self, after_seq: int) -> CapturedFrame:
         """
-        Initialize screen capture track.
+        Get the newest frame if it is newer than after_seq, else wait for one.
+
+        Args:
+            after_seq: Sequence number of the last frame the caller used
+
+        Returns:
+            Newest captured frame
+        """
+        with self._lock:
+            if self._ring and self._ring[-1].seq > after_seq:
+                return self._ring[-1]
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        return await future
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"publish_fps": self.published.rate, "published": self.published.total}
+
+    @abc.abstractmethod
+    def attach(self, consumer: object, fps: float) -> None:
+        """Register a consumer and the frame rate it needs."""
+
+    @abc.abstractmethod
+    def detach(self, consumer: object) -> None:
+        """Unregister a consumer."""
+
+    def _publish(self, timestamp: float, data: np.ndarray) -> None:
+        """Add a frame and wake the waiting consumers (any thread)."""
+        with self._lock:
+            self._seq += 1
+            captured = CapturedFrame(self._seq, timestamp, data)
+            self._ring.append(captured)
+            waiters, self._waiters = self._waiters, []
+        self.published.mark()
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, captured)
+
+    def _cancel_waiters(self) -> None:
+        """Cancel pending next_frame() calls (source stopped, any thread)."""
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(future.cancel)
+            except RuntimeError:
+                pass  # Loop closed
+
+
+class CaptureSource(FrameSource):
+    """
+    Single screen capture producer for one monitor.
+
+    A dedicated capture thread grabs the monitor on a fixed monotonic
+    schedule at the highest frame rate any attached consumer asks for,
+    and keeps the last few frames in a small ring buffer. Viewer tracks
+    take the newest frame from it, so capture latency does not add to
+    their frame interval and capture cost does not grow with the number
+    of viewers.
+
+    Grabs that look identical to the previous one (per-tile hashes of
+    every SAMPLE_STEP-th pixel) are not published, and after a while
+    without changes the thread drops to IDLE_FPS, so an idle desktop
+    costs almost nothing.
+    """
+
+    # Side of the square tiles used for change detection (pixels)
+    TILE_SIZE = 64
+    # Only every n-th pixel of every n-th row is hashed (divides TILE_SIZE)
+    SAMPLE_STEP = 8
+    # Seconds without changes before capture slows down to IDLE_FPS
+    IDLE_AFTER = 1.0
+    IDLE_FPS = 4
+    # Publish an unchanged frame at least this often (seconds)
+    REFRESH_INTERVAL = 2.0
+
+    def __init__(self, monitor_index: int = 0):
+        """
+        Initialize capture source.
 
         Args:
             monitor_index: Monitor to capture (0 = primary)
-            quality: Quality profile (defaults to low)
         """
         super().__init__()
         self._monitor_index = monitor_index
-        self._quality = quality or QualityProfile.low()
-        self._frame_count = 0
-        self._start_time = time.time()
-        self._last_frame_time = 0.0
-        self._frame_interval = 1.0 / self._quality.fps
-        self._running = True
 
-        # Get initial screen dimensions (in main thread)
         with mss.mss() as sct:
             monitor = sct.monitors[monitor_index + 1]  # 0 is "all monitors"
-            self._src_width = monitor["width"]
-            self._src_height = monitor["height"]
             self._monitor_dict = dict(monitor)  # Copy monitor dict for thread use
+        self._width = self._monitor_dict["width"]
+        self._height = self._monitor_dict["height"]
 
-        logger.info(
-            f"Screen capture initialized: {self._src_width}x{self._src_height} "
-            f"-> {self._quality.width}x{self._quality.height} @ {self._quality.fps}fps"
+        self._consumers: Dict[int, float] = {}  # consumer id -> fps
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Bumped per capture thread, an older thread exits when it sees a
+        # newer one (detach then attach before it noticed it should stop)
+        self._generation = 0
+        self._wake = threading.Event()
+        self._checksums: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._changed_at = 0.0
+        self._published_at = 0.0
+        self.capture_ms = Histogram()
+        self.grabs = RateMeter()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Monitor size in pixels."""
+        return (self._width, self._height)
+
+    @property
+    def is_idle(self) -> bool:
+        """True while the screen has not changed for IDLE_AFTER seconds."""
+        return time.monotonic() - self._changed_at > self.IDLE_AFTER
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **super().metrics(),
+            "size": list(self.size),
+            "grab_fps": self.grabs.rate,
+            "idle": self.is_idle,
+            "capture_ms": self.capture_ms.summary(),
+        }
+
+    def attach(self, consumer: object, fps: float) -> None:
+        """Register a consumer and its frame rate, starting capture if needed."""
+        with self._lock:
+            self._consumers[id(consumer)] = fps
+            if not self._running:
+                self._running = True
+                self._generation += 1
+                self._thread = threading.Thread(
+                    target=self._capture_loop,
+                    args=(self._generation,),
+                    name=f"screen-capture-{self._monitor_index}",
+                    daemon=True,
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def set_fps(self, consumer: object, fps: float) -> None:
+        """Update the frame rate a consumer needs."""
+        with self._lock:
+            if id(consumer) in self._consumers:
+                self._consumers[id(consumer)] = fps
+        self._wake.set()
+
+    def detach(self, consumer: object) -> None:
+        """Unregister a consumer, stopping capture when none are left."""
+        with self._lock:
+            self._consumers.pop(id(consumer), None)
+            if self._consumers:
+                return
+            self._running = False
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop capturing regardless of consumers."""
+        with self._lock:
+            self._consumers.clear()
+            self._running = False
+            thread, self._thread = self._thread, None
+        self._wake.set()
+        if thread:
+            thread.join(timeout=2)
+        self._cancel_waiters()
+
+    def _capture_loop(self, generation: int) -> None:
+        """Capture thread: grab at the fastest consumer rate."""
+        sct = mss.mss()
+        next_at = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    if not self._running or self._generation != generation:
+                        return
+                    fps = max(self._consumers.values(), default=0)
+
+                if fps <= 0:
+                    self._wake.wait(0.5)
+                    self._wake.clear()
+                    continue
+
+                started = time.monotonic()
+                if self.is_idle:
+                    fps = min(fps, self.IDLE_FPS)
+
+                try:
+                    img = sct.grab(self._monitor_dict)
+                    # View over the BGRA buffer mss allocated for this grab
+                    frame = np.frombuffer(img.raw, dtype=np.uint8).reshape(
+                        img.height, img.width, 4
+                    )
+                    self.capture_ms.record((time.monotonic() - started) * 1000)
+                    self.grabs.mark()
+                except Exception as e:
+                    logger.error(f"Screen grab failed: {e}")
+                    time.sleep(0.5)
+                    continue
+
+                if self._has_changed(frame):
+                    self._changed_at = started
+                    self._publish(started, frame)
+                elif started - self._published_at >= self.REFRESH_INTERVAL:
+                    self._publish(started, frame)
+
+                # Fixed schedule: grab time does not stretch the interval
+                next_at += 1.0 / fps
+                now = time.monotonic()
+                if next_at < now:
+                    # Fell behind (slow grab), do not burst to catch up
+                    next_at = now
+                self._wake.wait(next_at - now)
+                self._wake.clear()
+        finally:
+            sct.close()
+
+    def _publish(self, timestamp: float, data: np.ndarray) -> None:
+        super()._publish(timestamp, data)
+        self._published_at = timestamp
+
+    def _has_changed(self, frame: np.ndarray) -> bool:
+        """
+        Compare per-tile hashes of a BGRA frame with the previous grab.
+
+        Only a strided sample of the frame is hashed, which keeps this
+        well under a millisecond at 1080p. A change that misses every
+        sampled pixel goes out with the next REFRESH_INTERVAL frame. Each
+        sampled pixel is multiplied by a fixed random odd weight of its
+        position (wrapping in uint64) before summing, so content moving
+        or swapping inside a tile changes the hash too.
+        """
+        step = self.SAMPLE_STEP
+        sample = np.ascontiguousarray(frame[::step, ::step])
+        height, width = sample.shape[:2]
+        pixels = sample.view(np.uint32).reshape(height, width)
+        if self._weights is None or self._weights.shape != pixels.shape:
+            rng = np.random.default_rng(0)
+            self._weights = rng.integers(
+                0, 2**63, size=pixels.shape, dtype=np.uint64
+            ) | np.uint64(1)
+        tile = self.TILE_SIZE // step
+        rows = np.add.reduceat(
+            pixels * self._weights, np.arange(0, height, tile), axis=0
         )
+        checksums = np.add.reduceat(rows, np.arange(0, width, tile), axis=1)
+
+        previous, self._checksums = self._checksums, checksums
+        return previous is None or not np.array_equal(previous, checksums)
+
 
-    def set_quality(self, quality: QualityProfile) -> None:
+def _resolve(future: asyncio.Future, value) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+class QualityTier:
+    """
+    Frames of one quality profile, produced once per capture tick.
+
+    Every viewer on the same profile reads the same scaled frames and,
+    with a shared encoder, the same H.264 packets, so a wall of viewers
+    on the grid tier costs one resize and one encode per frame.
+    """
+
+    # Per-viewer backlog before frames are dropped
+    QUEUE_SIZE = 4
+
+    def __init__(
+        self,
+        source: FrameSource,
+        quality: QualityProfile,
+        encoder: Optional[SharedH264Encoder] = None,
+    ):
         """
-        Update quality profile.
+        Initialize a quality tier.
 
         Args:
-            quality: New quality profile
+            source: Shared capture source of the monitor (or a mosaic)
+            quality: Quality profile of the tier
+            encoder: Shared encoder, None to hand out raw frames
         """
-        self._quality = quality
-        self._frame_interval = 1.0 / self._quality.fps
-        logger.info(
-            f"Quality changed to: {quality.width}x{quality.height} @ {quality.fps}fps"
-        )
+        self.quality = quality
+        self._source = source
+        self._encoder = encoder
+        self._consumers: Dict[int, "ScreenCaptureTrack"] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._frame_count = 0
+        self._refresh = asyncio.Event()
+        # Keeps its scaler context across frames
+        self._reformatter = VideoReformatter()
+        self.convert_ms = Histogram()
+        self.encode_ms = Histogram()
+        self.frames = RateMeter()
+
+    @property
+    def encoded(self) -> bool:
+        """True if consumers receive av.Packets instead of VideoFrames."""
+        return self._encoder is not None
+
+    @property
+    def consumer_count(self) -> int:
+        return len(self._consumers)
+
+    def attach(self, track: "ScreenCaptureTrack") -> None:
+        """Add a viewer track, starting the tier loop if needed."""
+        self._consumers[id(track)] = track
+        # New decoder on the viewer side needs a keyframe to start
+        self.request_keyframe()
+        if self._task is None or self._task.done():
+            self._source.attach(self, self.quality.fps)
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def detach(self, track: "ScreenCaptureTrack") -> None:
+        """Remove a viewer track, stopping the tier when none are left."""
+        self._consumers.pop(id(track), None)
+        if not self._consumers:
+            self.stop()
+
+    def metrics(self) -> Dict[str, Any]:
+        quality = self.quality
+        return {
+            "quality": f"{quality.width}x{quality.height}@{quality.fps}",
+            "bitrate": quality.bitrate,
+            "viewers": self.consumer_count,
+            "encoded": self.encoded,
+            "fps": self.frames.rate,
+            "frames": self.frames.total,
+            "convert_ms": self.convert_ms.summary(),
+            "encode_ms": self.encode_ms.summary(),
+        }
+
+    def request_keyframe(self) -> None:
+        if self._encoder:
+            self._encoder.request_keyframe()
+            # Do not wait for the screen to change to send it
+            self._refresh.set()
 
-    def get_screen_size(self) -> Tuple[int, int]:
-        """Get the actual screen size being captured."""
-        return (self._src_width, self._src_height)
-
-    def _capture_frame(self) -> np.ndarray:
-        """Capture and process a single frame (called in thread pool)."""
-        # Get thread-local mss instance
-        sct = get_mss()
-
-        # Capture screen
-        img = sct.grab(self._monitor_dict)
-        frame = np.array(img, dtype=np.uint8)
-
-        # Convert BGRA to BGR (remove alpha channel)
-        frame = frame[:, :, :3]
-
-        # Resize if needed (for quality scaling)
-        if (
-            frame.shape[1] != self._quality.width
-            or frame.shape[0] != self._quality.height
-        ):
-            frame = cv2.resize(
-                frame,
-                (self._quality.width, self._quality.height),
-                interpolation=cv2.INTER_LINEAR,  # Fast interpolation
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._source.detach(self)
+        if self._encoder:
+            self._encoder.close()
+
+    def _process_frame(self, frame: np.ndarray) -> VideoFrame:
+        """
+        Scale and convert a captured frame (called in thread pool).
+
+        The BGRA capture buffer is wrapped without copying and a single
+        libswscale pass scales it and converts it to the encoder's
+        yuv420p, replacing the alpha slice / resize / BGR2RGB copies.
+        """
+        with Stopwatch(self.convert_ms):
+            source = bgra_video_frame(frame)
+            return self._reformatter.reformat(
+                source,
+                width=self.quality.width,
+                height=self.quality.height,
+                format="yuv420p",
+                interpolation=Interpolation.BILINEAR,  # Fast interpolation
             )
 
-        # Convert BGR to RGB for WebRTC
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _encode(self, frame: VideoFrame) -> list:
+        """Encode a frame once for all viewers (called in thread pool)."""
+        with Stopwatch(self.encode_ms):
+            return self._encoder.encode(frame)
 
-        return frame
+    async def _run(self) -> None:
+        """Tier loop: one resize (and encode) per frame for all viewers."""
+        loop = asyncio.get_event_loop()
+        frame_interval = 1.0 / self.quality.fps
+        # Accept frames captured slightly before they are due, the
+        # source schedule is not aligned with ours
+        tolerance = frame_interval / 4
+        last_seq = 0
+        last_pts = -1
+        due = 0.0
+        frame: Optional[VideoFrame] = None
+
+        try:
+            while self._consumers:
+                captured = await self._next_capture(last_seq)
+                if captured is not None:
+                    last_seq = captured.seq
+                    timestamp = captured.timestamp
+                    # Frame rate limiting on the capture clock: the source
+                    # may run faster for another tier
+                    if timestamp < due - tolerance:
+                        continue
+                    due += frame_interval
+                    if due <= timestamp:
+                        # Fell behind, restart the schedule from this frame
+                        due = timestamp + frame_interval
+                    frame = await loop.run_in_executor(
+                        None, self._process_frame, captured.data
+                    )
+                elif frame is None:
+                    continue
+                else:
+                    # Screen unchanged, re-send the last frame (keyframe)
+                    timestamp = time.monotonic()
+
+                # PTS from capture time, so skipped or late frames keep
+                # their real spacing
+                pts = int((timestamp - PTS_EPOCH) * VIDEO_CLOCK_RATE)
+                last_pts = max(pts, last_pts + 1)
+                frame.pts = last_pts
+                frame.time_base = VIDEO_TIME_BASE
+                self._frame_count += 1
+                self.frames.mark()
+
+                if self._encoder:
+                    packets = await loop.run_in_executor(None, self._encode, frame)
+                    for packet in packets:
+                        self._publish(packet)
+                else:
+                    self._publish(frame)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Quality tier {self.quality.name} stopped: {e}")
+
+    async def _next_capture(self, last_seq: int) -> Optional[CapturedFrame]:
+        """
+        Wait for a changed frame from the source.
 
-    async def recv(self) -> VideoFrame:
+        Returns None when a keyframe was requested before the screen
+        changed, meaning the last frame should be sent again.
         """
-        Receive the next video frame.
+        frame_task = asyncio.ensure_future(self._source.next_frame(last_seq))
+        refresh_task = asyncio.ensure_future(self._refresh.wait())
+        done, pending = await asyncio.wait(
+            {frame_task, refresh_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        self._refresh.clear()
+        if frame_task in done:
+            return frame_task.result()
+        return None
 
-        This method is called by aiortc to get frames for streaming.
-        Implements frame rate limiting for consistent FPS.
+    def _publish(self, item) -> None:
+        for track in list(self._consumers.values()):
+            track._push(item)
+
+
+class ScreenCaptureTrack(VideoStreamTrack):
+    """
+    WebRTC VideoStreamTrack that streams screen content to one viewer.
+
+    Returns the frames (or shared H.264 packets) of its QualityTier;
+    all scaling and encoding happens once per tier. An
+    AndroidStreamSource can stand in for the tier to pass a device's
+    H.264 stream through.
+    """
+
+    kind = "video"
+
+    def __init__(self, tier: QualityTier):
         """
-        if not self._running:
-            raise Exception("Track stopped")
+        Initialize screen capture track.
 
-        # Frame rate limiting
-        current_time = time.time()
-        elapsed = current_time - self._last_frame_time
-        if elapsed < self._frame_interval:
-            await asyncio.sleep(self._frame_interval - elapsed)
+        Args:
+            tier: Quality tier to read from
+        """
+        super().__init__()
+        self._tier: Optional[QualityTier] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QualityTier.QUEUE_SIZE)
+        self._waiting_keyframe = False
+        self._last_pts = -1
+        self._running = True
+        self.queue_wait_ms = Histogram()
+        self.delivered = RateMeter()
+        self.dropped = 0
+        self.set_tier(tier)
 
-        self._last_frame_time = time.time()
+    @property
+    def _quality(self) -> QualityProfile:
+        return self._tier.quality
 
-        # Capture frame in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        frame_data = await loop.run_in_executor(None, self._capture_frame)
+    def set_tier(self, tier: QualityTier) -> None:
+        """
+        Move to another quality tier.
 
-        # Create VideoFrame
-        frame = VideoFrame.from_ndarray(frame_data, format="rgb24")
-        frame.pts = self._frame_count
-        frame.time_base = self._quality.fps
+        Args:
+            tier: New quality tier
+        """
+        if self._tier is tier:
+            return
+        previous = self._tier
+        self._tier = tier
+        self._clear_queue()
+        self._waiting_keyframe = tier.encoded
+        tier.attach(self)
+        if previous:
+            previous.detach(self)
+        quality = tier.quality
+        logger.info(
+            f"Track quality: {quality.width}x{quality.height} @ {quality.fps}fps"
+        )
 
-        self._frame_count += 1
+    def resync(self) -> None:
+        """Drop queued media and restart from a keyframe (new sender)."""
+        self._clear_queue()
+        if self._tier.encoded:
+            self._waiting_keyframe = True
+            self._tier.request_keyframe()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "fps": self.delivered.rate,
+            "delivered": self.delivered.total,
+            "dropped": self.dropped,
+            "queue_depth": self._queue.qsize(),
+            "queue_wait_ms": self.queue_wait_ms.summary(),
+        }
+
+    def _push(self, item) -> None:
+        """Called by the tier for every new frame or packet."""
+        if item.pts is not None and item.pts <= self._last_pts:
+            # A new tier starting on a frame this track already sent,
+            # RTP timestamps must not repeat or go back
+            self.dropped += 1
+            if self._tier.encoded:
+                self._waiting_keyframe = True
+                self._tier.request_keyframe()
+            return
+
+        if self._waiting_keyframe:
+            if not getattr(item, "is_keyframe", False):
+                self.dropped += 1
+                return
+            self._waiting_keyframe = False
+
+        if self._queue.full():
+            self.dropped += self._queue.qsize()
+            self._clear_queue()
+            if self._tier.encoded:
+                # Packets depend on each other, resume from a keyframe
+                self.dropped += 1
+                self._waiting_keyframe = True
+                self._tier.request_keyframe()
+                return
+        if item.pts is not None:
+            self._last_pts = item.pts
+        self._queue.put_nowait((item, time.monotonic()))
+
+    def _clear_queue(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def recv(self):
+        """
+        Receive the next video frame or encoded packet.
 
-        return frame
+        This method is called by aiortc to get frames for streaming.
+        """
+        if not self._running:
+            raise MediaStreamError("Track stopped")
+        item, pushed_at = await self._queue.get()
+        if item is None:
+            raise MediaStreamError("Track stopped")
+        self.queue_wait_ms.record((time.monotonic() - pushed_at) * 1000)
+        self.delivered.mark()
+        return item
 
     def stop(self) -> None:
         """Stop the screen capture track."""
+        if not self._running:
+            return
         self._running = False
+        if self._tier:
+            self._tier.detach(self)
+        # Wake a pending recv() (the source may have ended on its own)
+        self._clear_queue()
+        self._queue.put_nowait((None, 0.0))
         super().stop()
         logger.info("Screen capture track stopped")
 
@@ -161,13 +675,58 @@ class ScreenCaptureManager:
     Manager for screen capture tracks.
 
     Handles creating and managing capture tracks for multiple viewers
-    with different quality requirements.
+    with different quality requirements. All tracks share one
+    CaptureSource, and viewers on the same quality profile share one
+    QualityTier (one resize and one encode per frame). A ladder rung
+    that only lowers the bitrate is a tier of its own, so adapting one
+    viewer never changes what the others receive.
+
+    With capture_process, source and tiers run in a CaptureWorker
+    process and the tracks are fed through ProcessQualityTier proxies.
     """
 
-    def __init__(self, monitor_index: int = 0):
+    def __init__(
+        self,
+        monitor_index: int = 0,
+        shared_encoding: bool = True,
+        capture_process: bool = False,
+    ):
         self._monitor_index = monitor_index
+        self._shared_encoding = shared_encoding and is_h264_available()
+        self._capture_process = capture_process
+        self._source: Optional[CaptureSource] = None
+        self._worker = None
+        self._tiers: Dict[Tuple[int, int, int, int], QualityTier] = {}
         self._tracks: dict[str, ScreenCaptureTrack] = {}
 
+    @property
+    def source(self) -> CaptureSource:
+        """Shared capture source (created on first use)."""
+        if self._source is None:
+            self._source = CaptureSource(self._monitor_index)
+        return self._source
+
+    @property
+    def worker(self):
+        """Capture process handle (created on first use)."""
+        if self._worker is None:
+            # Imported here, the worker module builds on this one
+            from .capture_worker import CaptureWorker
+
+            self._worker = CaptureWorker(self._monitor_index, self._shared_encoding)
+        return self._worker
+
+    @property
+    def shared_encoding(self) -> bool:
+        """True if tracks carry pre-encoded H.264 (peer must negotiate H.264)."""
+        return self._shared_encoding
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        """Get the actual screen size being captured."""
+        if self._capture_process:
+            return self.worker.size
+        return self.source.size
+
     def create_track(
         self, viewer_id: str, quality: Optional[QualityProfile] = None
     ) -> ScreenCaptureTrack:
@@ -181,10 +740,7 @@ class ScreenCaptureManager:
         Returns:
             New ScreenCaptureTrack instance
         """
-        track = ScreenCaptureTrack(
-            monitor_index=self._monitor_index,
-            quality=quality,
-        )
+        track = ScreenCaptureTrack(self._get_tier(quality or QualityProfile.low()))
         self._tracks[viewer_id] = track
         logger.info(f"Created capture track for viewer: {viewer_id}")
         return track
@@ -198,16 +754,61 @@ class ScreenCaptureManager:
         if viewer_id in self._tracks:
             self._tracks[viewer_id].stop()
             del self._tracks[viewer_id]
+            self._prune_tiers()
             logger.info(f"Removed capture track for viewer: {viewer_id}")
 
     def update_quality(self, viewer_id: str, quality: QualityProfile) -> None:
-        """Update quality for a viewer's track."""
+        """Move a viewer's track to the tier of another quality."""
         if viewer_id in self._tracks:
-            self._tracks[viewer_id].set_quality(quality)
+            self._tracks[viewer_id].set_tier(self._get_tier(quality))
+        self._prune_tiers()
 
     def stop_all(self) -> None:
         """Stop all capture tracks."""
         for track in self._tracks.values():
             track.stop()
         self._tracks.clear()
+        for tier in self._tiers.values():
+            tier.stop()
+        self._tiers.clear()
+        if self._source:
+            self._source.stop()
+        if self._worker:
+            self._worker.stop()
         logger.info("All capture tracks stopped")
+
+    def _get_tier(self, quality: QualityProfile) -> QualityTier:
+        """Get or create the shared tier of a quality profile."""
+        key = (quality.width, quality.height, quality.fps, quality.bitrate)
+        tier = self._tiers.get(key)
+        if tier is None and self._capture_process:
+            tier = self.worker.create_tier(quality)
+            self._tiers[key] = tier
+            logger.info(f"Created quality tier (capture process): {quality.name} {key}")
+        elif tier is None:
+            encoder = None
+            if self._shared_encoding:
+                encoder = SharedH264Encoder(
+                    quality.width, quality.height, quality.fps, quality.bitrate
+                )
+            tier = QualityTier(self.source, quality, encoder)
+            self._tiers[key] = tier
+            logger.info(f"Created quality tier: {quality.name} {key}")
+        return tier
+
+    def _prune_tiers(self) -> None:
+        for key, tier in list(self._tiers.items()):
+            if tier.consumer_count == 0:
+                tier.stop()
+                del self._tiers[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Capture source and per-tier metrics."""
+        if self._worker:
+            source = self._worker.metrics()
+        else:
+            source = self._source.metrics() if self._source else None
+        return {
+            "source": source,
+            "tiers": [tier.metrics() for tier in self._tiers.values()],
+        }
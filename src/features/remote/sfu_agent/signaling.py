@@ -6,9 +6,11 @@ Handles all signaling events between the agent and SFU server.
 
 import asyncio
 import logging
-from typing import Callable, Optional, Dict, Any, Awaitable
+from collections import deque
+from typing import Callable, Deque, Optional, Dict, Any, Awaitable, Tuple
 
 import socketio
+from socketio.exceptions import SocketIOError
 
 from .config import AgentConfig
 
@@ -21,8 +23,19 @@ class SignalingClient:
 
     Manages connection to SFU server and handles signaling events
     for WebRTC peer connection establishment.
+
+    Signaling messages sent while the socket is down (ICE candidates,
+    restart offers) are queued and flushed in order once it reconnects,
+    then the "reconnect" callback runs so the agent can re-sync its
+    sessions. Messages emitted while the queue is not empty yet go
+    behind it. When the queue overflows, ICE candidates of superseded
+    offers are dropped first, then the oldest messages; offers are
+    always kept.
     """
 
+    # Messages kept while disconnected before some are dropped
+    OUTBOX_SIZE = 256
+
     def __init__(self, config: AgentConfig):
         self.config = config
         self._sio = socketio.AsyncClient(
@@ -33,6 +46,9 @@ class SignalingClient:
             engineio_logger=False,
         )
         self._connected = False
+        self._was_connected = False
+        self._outbox: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._flush_lock = asyncio.Lock()
         self._callbacks: Dict[str, Callable[..., Awaitable[None]]] = {}
         self._setup_handlers()
 
@@ -43,11 +59,17 @@ class SignalingClient:
         async def connect():
             self._connected = True
             logger.info(f"Connected to SFU server: {self.config.sfu_url}")
+            # Emitting from the connect handler is not allowed yet
+            if self._was_connected:
+                asyncio.get_event_loop().create_task(self._on_reconnected())
+            elif self._outbox:
+                asyncio.get_event_loop().create_task(self._flush())
+            self._was_connected = True
 
         @self._sio.event
         async def disconnect():
             self._connected = False
-            logger.info("Disconnected from SFU server")
+            logger.info("Disconnected from SFU server (viewer sessions kept)")
 
         @self._sio.event
         async def error(data: Dict[str, Any]):
@@ -77,6 +99,77 @@ class SignalingClient:
         async def on_keyboard_event(data: Dict[str, Any]):
             await self._invoke_callback("keyboard_event", data)
 
+    async def _on_reconnected(self) -> None:
+        """Flush the outbox, then let the agent re-sync its sessions."""
+        await self._flush()
+        await self._invoke_callback("reconnect", {})
+
+    async def _flush(self) -> None:
+        """Send the queued messages in order while connected."""
+        async with self._flush_lock:
+            while self._outbox and self._connected:
+                entry = self._outbox[0]
+                try:
+                    await self._sio.emit(*entry)
+                except SocketIOError as e:
+                    logger.warning(f"Outbox flush interrupted: {e}")
+                    return
+                # Popped once sent, so _emit keeps queueing behind it
+                # (unless an overflow dropped it meanwhile)
+                if self._outbox and self._outbox[0] is entry:
+                    self._outbox.popleft()
+
+    async def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        """Emit an event, or queue it behind unsent ones."""
+        if not self._connected or self._outbox:
+            self._enqueue(event, data)
+            return
+        try:
+            await self._sio.emit(event, data)
+        except SocketIOError:
+            # Socket dropped before the disconnect handler ran
+            self._enqueue(event, data)
+
+    def _enqueue(self, event: str, data: Dict[str, Any]) -> None:
+        """Queue a message, dropping another one if the outbox is full."""
+        self._outbox.append((event, data))
+        if len(self._outbox) <= self.OUTBOX_SIZE:
+            return
+        index = self._overflow_index()
+        if index is None:
+            logger.warning(f"Outbox holds {len(self._outbox)} offers, none dropped")
+            return
+        dropped, _ = self._outbox[index]
+        del self._outbox[index]
+        logger.warning(f"Outbox full, dropped a queued {dropped} message")
+
+    def _overflow_index(self) -> Optional[int]:
+        """
+        Pick the queued message to drop when the outbox overflows.
+
+        The oldest ICE candidate followed by a newer offer to the same
+        viewer goes first (its offer is superseded), then the oldest
+        message that is not an offer. Offers are never dropped.
+
+        Returns:
+            Index in the outbox, None if it only holds offers
+        """
+        offered = set()
+        superseded = None
+        # Newest to oldest, so offered holds viewers with a later offer
+        for index in range(len(self._outbox) - 1, -1, -1):
+            event, data = self._outbox[index]
+            if event == "offer":
+                offered.add(data.get("viewerId"))
+            elif event == "ice-candidate" and data.get("viewerId") in offered:
+                superseded = index
+        if superseded is not None:
+            return superseded
+        for index, (event, _) in enumerate(self._outbox):
+            if event != "offer":
+                return index
+        return None
+
     async def _invoke_callback(self, event: str, data: Dict[str, Any]) -> None:
         """Invoke registered callback for an event."""
         if event in self._callbacks:
@@ -138,20 +231,26 @@ class SignalingClient:
         if self._sio.connected:
             await self._sio.disconnect()
         self._connected = False
+        self._outbox.clear()
 
-    async def emit_offer(self, viewer_id: str, sdp: Dict[str, Any]) -> None:
+    async def emit_offer(
+        self, viewer_id: str, sdp: Dict[str, Any], restart: bool = False
+    ) -> None:
         """
         Send SDP offer to a viewer.
 
         Args:
             viewer_id: Target viewer's socket ID
             sdp: SDP offer object
+            restart: Offer of a restarted session, the viewer answers it
+                on a new peer connection and keeps its stream settings
         """
-        await self._sio.emit(
+        await self._emit(
             "offer",
             {
                 "viewerId": viewer_id,
                 "sdp": sdp,
+                "restart": restart,
             },
         )
         logger.debug(f"Sent offer to viewer: {viewer_id}")
@@ -166,7 +265,7 @@ class SignalingClient:
             viewer_id: Target viewer's socket ID
             candidate: ICE candidate object
         """
-        await self._sio.emit(
+        await self._emit(
             "ice-candidate",
             {
                 "viewerId": viewer_id,
@@ -174,6 +273,45 @@ class SignalingClient:
             },
         )
 
+    async def emit_sessions(self, sessions: list[Dict[str, Any]]) -> None:
+        """
+        Announce the viewer sessions kept across a reconnect.
+
+        Args:
+            sessions: From WebRTCManager.sessions(), each with the quality
+                it streams, so viewers can re-send a change-quality lost
+                during the outage
+        """
+        await self._emit(
+            "agent-sessions",
+            {
+                "pcId": self.config.pc_id,
+                "sessions": sessions,
+            },
+        )
+
+    async def emit_metrics(self, metrics: Dict[str, Any]) -> None:
+        """
+        Report video path metrics to the SFU.
+
+        Not queued while disconnected, the next report supersedes it.
+
+        Args:
+            metrics: Metrics from SFUAgent.metrics()
+        """
+        if not self._connected:
+            return
+        try:
+            await self._sio.emit(
+                "agent-metrics",
+                {
+                    "pcId": self.config.pc_id,
+                    "metrics": metrics,
+                },
+            )
+        except SocketIOError as e:
+            logger.debug(f"Metrics report dropped: {e}")
+
     @property
     def is_connected(self) -> bool:
         """Check if connected to SFU server."""
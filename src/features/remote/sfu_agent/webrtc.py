@@ -5,6 +5,7 @@ Handles creating and managing WebRTC peer connections for streaming
 screen content to viewers via the SFU.
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any, Callable, Awaitable
 
@@ -14,10 +15,13 @@ from aiortc import (
     RTCIceCandidate,
     RTCConfiguration,
     RTCIceServer,
+    RTCRtpSender,
 )
-from aiortc.contrib.media import MediaRelay
 
+from .android_stream import AndroidStreamManager
+from .adaptation import LinkMonitor, LinkStats, QualityAdapter, build_ladder
 from .config import AgentConfig, QualityProfile
+from .mosaic import MosaicManager
 from .screen_capture import ScreenCaptureTrack, ScreenCaptureManager
 
 logger = logging.getLogger(__name__)
@@ -31,14 +35,57 @@ class ViewerConnection:
         viewer_id: str,
         pc: RTCPeerConnection,
         track: ScreenCaptureTrack,
+        kind: str = "desktop",
+        source: Optional[str] = None,
+        encoded: bool = False,
     ):
         self.viewer_id = viewer_id
         self.pc = pc
         self.track = track
-        self.quality = track._quality
+        self.kind = kind
+        self.source = source
+        self.encoded = encoded
+        self.restarts = 0  # Session restarts since the link was last up
+        self.restart_task: Optional[asyncio.Task] = None
+        self.quality = track._quality  # Requested quality
+        self.adapter: Optional[QualityAdapter] = None
+        self.link = LinkMonitor()
+        self.link_stats: Optional[LinkStats] = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Delivery and link metrics of this viewer."""
+        quality = self.track._quality
+        stats = self.link_stats
+        return {
+            "kind": self.kind,
+            "state": self.pc.connectionState,
+            "quality": quality.name,
+            "requested": self.quality.name,
+            "track": self.track.metrics(),
+            "rtt_ms": round(stats.rtt * 1000, 1) if stats and stats.rtt else None,
+            "loss": round(stats.loss, 3) if stats else None,
+            "sent_kbps": round(stats.bitrate) if stats else None,
+        }
+
+    def session(self) -> Dict[str, Any]:
+        """Signaling state of the session, as change-quality would set it."""
+        quality = self.quality
+        return {
+            "viewerId": self.viewer_id,
+            "source": self.source,
+            "quality": quality.name,
+            "width": quality.width,
+            "height": quality.height,
+            "frameRate": quality.fps,
+            "bitrate": quality.bitrate,
+            "state": self.pc.connectionState,
+        }
 
     async def close(self) -> None:
         """Close the peer connection."""
+        if self.restart_task:
+            self.restart_task.cancel()
+            self.restart_task = None
         self.track.stop()
         await self.pc.close()
 
@@ -49,12 +96,20 @@ class WebRTCManager:
 
     Creates peer connections, handles SDP exchange, and manages
     ICE candidates for streaming to multiple viewers.
+
+    A viewer session outlives its peer connection: when the link fails,
+    the session is restarted on a new peer connection (aiortc has no ICE
+    restart) that keeps the viewer's track, quality tier and adaptation
+    state, and the viewer only has to answer a new offer.
     """
 
     def __init__(
         self,
         config: AgentConfig,
         on_ice_candidate: Callable[[str, Dict[str, Any]], Awaitable[None]],
+        on_restart_offer: Optional[
+            Callable[[str, Dict[str, Any]], Awaitable[None]]
+        ] = None,
     ):
         """
         Initialize WebRTC manager.
@@ -62,17 +117,33 @@ class WebRTCManager:
         Args:
             config: Agent configuration
             on_ice_candidate: Callback when ICE candidate is generated
+            on_restart_offer: Callback with the offer of a restarted
+                session, sessions are closed on failure without it
         """
         self._config = config
         self._on_ice_candidate = on_ice_candidate
+        self._on_restart_offer = on_restart_offer
         self._connections: Dict[str, ViewerConnection] = {}
-        self._capture_manager = ScreenCaptureManager(config.capture_monitor)
-        self._relay = MediaRelay()
+        self._stats_task: Optional[asyncio.Task] = None
+        self._android_manager = AndroidStreamManager(
+            bitrate=config.android_bitrate,
+            max_fps=config.android_max_fps,
+            max_size=config.android_max_size,
+        )
+        self._mosaic_manager = MosaicManager(
+            self._android_manager, shared_encoding=config.shared_encoding
+        )
+        self._capture_manager = ScreenCaptureManager(
+            config.capture_monitor,
+            shared_encoding=config.shared_encoding,
+            capture_process=config.capture_process,
+        )
 
     async def create_offer(
         self,
         viewer_id: str,
         quality: str = "low",
+        source: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Create a WebRTC offer for a viewer.
@@ -80,10 +151,104 @@ class WebRTCManager:
         Args:
             viewer_id: Viewer's socket ID
             quality: Quality level (low/high)
+            source: "android:<serial>" to stream a phone's own H.264,
+                "mosaic:<serial>,<serial>,..." for a grid of phones in one
+                track (sized by quality), None for the desktop
 
         Returns:
             SDP offer object
         """
+        # A viewer asking again starts a new session
+        if viewer_id in self._connections:
+            await self.close_connection(viewer_id)
+
+        # Create capture track with requested quality
+        quality_profile = QualityProfile.from_name(quality)
+        kind, _, target = (source or "desktop").partition(":")
+        if kind == "android":
+            track = self._android_manager.create_track(viewer_id, target)
+            encoded = True
+        elif kind == "mosaic":
+            device_ids = [serial for serial in target.split(",") if serial]
+            track = self._mosaic_manager.create_track(
+                viewer_id, device_ids, quality_profile
+            )
+            encoded = self._mosaic_manager.shared_encoding
+        else:
+            kind = "desktop"
+            track = self._capture_manager.create_track(viewer_id, quality_profile)
+            encoded = self._capture_manager.shared_encoding
+
+        # Store connection
+        conn = ViewerConnection(
+            viewer_id=viewer_id,
+            pc=self._create_peer_connection(viewer_id, track, encoded),
+            track=track,
+            kind=kind,
+            source=source,
+            encoded=encoded,
+        )
+        if self._config.adaptive_quality and kind == "desktop":
+            conn.adapter = QualityAdapter(self._build_ladder(quality_profile))
+        self._connections[viewer_id] = conn
+        self._start_stats()
+
+        # Create offer
+        offer = await conn.pc.createOffer()
+        await conn.pc.setLocalDescription(offer)
+
+        logger.info(f"Created offer for viewer: {viewer_id}")
+
+        return {
+            "type": offer.type,
+            "sdp": offer.sdp,
+        }
+
+    async def restart_connection(self, viewer_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Restart a viewer session on a new peer connection.
+
+        The track (and so the quality tier and adaptation state) is kept,
+        encoded tracks resume from a keyframe.
+
+        Args:
+            viewer_id: Viewer's socket ID
+
+        Returns:
+            SDP offer object, None if there is no session
+        """
+        conn = self._connections.get(viewer_id)
+        if not conn:
+            return None
+
+        previous = conn.pc
+        conn.pc = self._create_peer_connection(viewer_id, conn.track, conn.encoded)
+        conn.link = LinkMonitor()
+        conn.link_stats = None
+        conn.restarts += 1
+        # Senders stop their track when they exit, the new one needs it
+        for sender in previous.getSenders():
+            sender.replaceTrack(None)
+        await previous.close()
+        conn.track.resync()
+
+        offer = await conn.pc.createOffer()
+        await conn.pc.setLocalDescription(offer)
+        logger.info(f"Restarted session of viewer {viewer_id} (#{conn.restarts})")
+
+        return {
+            "type": offer.type,
+            "sdp": offer.sdp,
+        }
+
+    def sessions(self) -> list[Dict[str, Any]]:
+        """Live viewer sessions, to re-sync with the SFU after a reconnect."""
+        return [conn.session() for conn in self._connections.values()]
+
+    def _create_peer_connection(
+        self, viewer_id: str, track: ScreenCaptureTrack, encoded: bool
+    ) -> RTCPeerConnection:
+        """Create a peer connection sending a track to a viewer."""
         # Create peer connection with ICE servers
         ice_servers_config = self._config.get_ice_servers()
 
@@ -102,12 +267,11 @@ class WebRTCManager:
         configuration = RTCConfiguration(iceServers=rtc_ice_servers)
         pc = RTCPeerConnection(configuration=configuration)
 
-        # Create capture track with requested quality
-        quality_profile = QualityProfile.from_name(quality)
-        track = self._capture_manager.create_track(viewer_id, quality_profile)
-
         # Add track to peer connection
-        pc.addTrack(track)
+        sender = pc.addTrack(track)
+        if encoded:
+            # Track carries pre-encoded H.264, the viewer must negotiate it
+            self._prefer_h264(pc, sender)
 
         # Handle ICE candidates
         @pc.on("icecandidate")
@@ -124,26 +288,72 @@ class WebRTCManager:
         @pc.on("connectionstatechange")
         async def on_state_change():
             logger.info(f"Connection state for {viewer_id}: {pc.connectionState}")
-            if pc.connectionState in ["failed", "closed", "disconnected"]:
-                await self.close_connection(viewer_id)
+            await self._on_connection_state(viewer_id, pc)
 
-        # Store connection
-        self._connections[viewer_id] = ViewerConnection(
-            viewer_id=viewer_id,
-            pc=pc,
-            track=track,
-        )
+        return pc
 
-        # Create offer
-        offer = await pc.createOffer()
-        await pc.setLocalDescription(offer)
+    async def _on_connection_state(self, viewer_id: str, pc: RTCPeerConnection) -> None:
+        conn = self._connections.get(viewer_id)
+        if not conn or conn.pc is not pc:
+            # Replaced by a restart
+            return
 
-        logger.info(f"Created offer for viewer: {viewer_id}")
+        state = pc.connectionState
+        if state == "connected":
+            conn.restarts = 0
+            if conn.restart_task:
+                conn.restart_task.cancel()
+                conn.restart_task = None
+        elif state in ("failed", "disconnected"):
+            # Transient network failure, keep the session and restart it
+            if conn.restart_task is None or conn.restart_task.done():
+                conn.restart_task = asyncio.get_event_loop().create_task(
+                    self._restart_loop(viewer_id)
+                )
+        elif state == "closed":
+            await self.close_connection(viewer_id)
 
-        return {
-            "type": offer.type,
-            "sdp": offer.sdp,
-        }
+    async def _restart_loop(self, viewer_id: str) -> None:
+        """
+        Restart a failed session until it connects, the viewer stops
+        answering or restart_attempts is exhausted.
+        """
+        while True:
+            conn = self._connections.get(viewer_id)
+            if not conn:
+                return
+            if (
+                self._on_restart_offer is None
+                or conn.restarts >= self._config.restart_attempts
+            ):
+                logger.info(f"Giving up on session of viewer {viewer_id}")
+                conn.restart_task = None
+                await self.close_connection(viewer_id)
+                return
+
+            try:
+                offer = await self.restart_connection(viewer_id)
+                if offer:
+                    await self._on_restart_offer(viewer_id, offer)
+            except Exception as e:
+                logger.error(f"Error restarting session of {viewer_id}: {e}")
+
+            await asyncio.sleep(self._config.restart_timeout)
+            conn = self._connections.get(viewer_id)
+            if not conn or conn.pc.connectionState == "connected":
+                return
+
+    @staticmethod
+    def _prefer_h264(pc: RTCPeerConnection, sender: RTCRtpSender) -> None:
+        """Restrict the video transceiver of a sender to H.264 (+ RTX)."""
+        codecs = [
+            codec
+            for codec in RTCRtpSender.getCapabilities("video").codecs
+            if codec.mimeType in ("video/H264", "video/rtx")
+        ]
+        for transceiver in pc.getTransceivers():
+            if transceiver.sender is sender:
+                transceiver.setCodecPreferences(codecs)
 
     async def handle_answer(
         self,
@@ -228,6 +438,12 @@ class WebRTCManager:
         if not conn:
             logger.warning(f"No connection found for viewer: {viewer_id}")
             return
+        device_stream = self._android_manager.has_track(
+            viewer_id
+        ) or self._mosaic_manager.has_track(viewer_id)
+        if device_stream:
+            logger.info(f"Ignoring quality change for device stream: {viewer_id}")
+            return
 
         # Create quality profile
         if width and height and fps and bitrate:
@@ -241,9 +457,11 @@ class WebRTCManager:
         else:
             profile = QualityProfile.from_name(quality)
 
-        # Update track quality
-        self._capture_manager.update_quality(viewer_id, profile)
+        # Update track quality (adaptation restarts from the new request)
         conn.quality = profile
+        if conn.adapter:
+            conn.adapter.set_ladder(self._build_ladder(profile))
+        self._capture_manager.update_quality(viewer_id, profile)
         logger.info(f"Quality changed for {viewer_id}: {profile.name}")
 
     async def close_connection(self, viewer_id: str) -> None:
@@ -257,19 +475,80 @@ class WebRTCManager:
         if conn:
             await conn.close()
             self._capture_manager.remove_track(viewer_id)
+            self._android_manager.remove_track(viewer_id)
+            self._mosaic_manager.remove_track(viewer_id)
             logger.info(f"Closed connection for viewer: {viewer_id}")
 
     async def close_all(self) -> None:
         """Close all viewer connections."""
+        if self._stats_task:
+            self._stats_task.cancel()
+            self._stats_task = None
         for viewer_id in list(self._connections.keys()):
             await self.close_connection(viewer_id)
         self._capture_manager.stop_all()
+        self._mosaic_manager.stop_all()
+        self._android_manager.stop_all()
         logger.info("All WebRTC connections closed")
 
     def get_screen_size(self) -> tuple[int, int]:
         """Get the actual screen size being captured."""
-        # Create temporary track to get screen size
-        temp_track = ScreenCaptureTrack(self._config.capture_monitor)
-        size = temp_track.get_screen_size()
-        temp_track.stop()
-        return size
+        return self._capture_manager.get_screen_size()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Video path metrics: capture and per-tier convert/encode timings,
+        device streams, mosaics, and per-viewer delivery and link stats.
+        """
+        return {
+            "capture": self._capture_manager.metrics(),
+            "android": self._android_manager.metrics(),
+            "mosaics": self._mosaic_manager.metrics(),
+            "viewers": {
+                viewer_id: conn.metrics()
+                for viewer_id, conn in self._connections.items()
+            },
+        }
+
+    def _build_ladder(self, profile: QualityProfile) -> list[QualityProfile]:
+        return build_ladder(
+            profile,
+            min_bitrate=self._config.min_bitrate,
+            min_fps=self._config.min_fps,
+            min_height=self._config.min_height,
+        )
+
+    def _start_stats(self) -> None:
+        if self._stats_task is None or self._stats_task.done():
+            self._stats_task = asyncio.get_event_loop().create_task(self._stats_loop())
+
+    async def _stats_loop(self) -> None:
+        """
+        Sample every viewer's link; adaptive viewers move along their
+        quality ladder.
+        """
+        while self._connections:
+            await asyncio.sleep(self._config.adaptation_interval)
+            for viewer_id, conn in list(self._connections.items()):
+                if conn.pc.connectionState != "connected":
+                    continue
+                try:
+                    stats = await conn.link.sample(conn.pc)
+                except Exception as e:
+                    logger.debug(f"Stats unavailable for {viewer_id}: {e}")
+                    continue
+                if stats is None:
+                    continue
+                conn.link_stats = stats
+                if not conn.adapter:
+                    continue
+
+                profile = conn.adapter.update(stats)
+                if profile is None or viewer_id not in self._connections:
+                    continue
+                self._capture_manager.update_quality(viewer_id, profile)
+                logger.info(
+                    f"Adapted {viewer_id} to {profile.width}x{profile.height}"
+                    f" @ {profile.fps}fps {profile.bitrate}kbps (rtt={stats.rtt},"
+                    f" loss={stats.loss:.2f}, sent={stats.bitrate:.0f}kbps)"
+                )
@@ -0,0 +1,270 @@
+"""
+Helper Device Pool - Process-wide UI Automator 2 connection pool
+
+Reuses live u2.Device objects per serial instead of paying the
+atx-agent handshake on every connect, checks liveness before handing a
+device out, reconnects when the on-device server dies, and grants
+exclusive leases so two flows never drive the same phone at once.
+
+Usage:
+    from helpers.helper_device_pool import device_pool
+
+    with device_pool.lease(device_key, owner="phone-setup") as device:
+        device.press("home")
+
+    # Or, when the lease outlives a block:
+    lease = device_pool.acquire(device_key, owner="phone-setup")
+    try:
+        lease.device.press("home")
+    finally:
+        device_pool.release(lease)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+import uiautomator2 as u2
+
+
+class DeviceConnectError(Exception):
+    """Device could not be connected or revived"""
+
+
+class DeviceLeaseTimeout(Exception):
+    """Device is leased by another flow for longer than the timeout"""
+
+
+@dataclass
+class _PooledDevice:
+    """Pool entry for a single serial"""
+
+    serial: str
+    device: Optional[u2.Device] = None
+    last_alive: float = 0.0
+    owner: Optional[str] = None
+    leased_at: float = 0.0
+    reconnects: int = 0
+    # Unplugged while leased, dropped when the lease is released
+    removed: bool = False
+    lease: Optional["DeviceLease"] = None
+    connect_lock: threading.Lock = field(default_factory=threading.Lock)
+    lease_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass(eq=False)
+class DeviceLease:
+    """Exclusive lease granted by acquire(), hand it back to release()"""
+
+    serial: str
+    owner: str
+    device: Optional[u2.Device] = None
+    _entry: Optional[_PooledDevice] = field(default=None, repr=False)
+
+
+class DeviceConnectionPool:
+    """
+    Pool of uiautomator2 connections keyed by device serial
+
+    - get(serial): shared access to a healthy device
+    - lease(serial): exclusive access for the duration of a flow
+    """
+
+    # Skip the liveness probe if the device answered this recently
+    HEALTH_CHECK_INTERVAL: float = 10.0
+
+    def __init__(self):
+        self._entries: Dict[str, _PooledDevice] = {}
+        self._lock = threading.Lock()
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def get(self, serial: str) -> u2.Device:
+        """
+        Get a healthy device without taking a lease
+
+        Raises:
+            DeviceConnectError: device could not be connected
+        """
+        return self._ensure_alive(self._entry(serial))
+
+    def acquire(
+        self, serial: str, owner: str = "unknown", timeout: Optional[float] = None
+    ) -> DeviceLease:
+        """
+        Take an exclusive lease on a device
+
+        Args:
+            serial: Android device serial
+            owner: Name of the flow holding the lease (for diagnostics)
+            timeout: Seconds to wait for the current holder, None = forever
+
+        Returns:
+            The lease, its device is connected and alive
+
+        Raises:
+            DeviceLeaseTimeout: lease not granted in time
+            DeviceConnectError: device could not be connected
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            entry = self._entry(serial)
+            remaining = -1 if deadline is None else deadline - time.monotonic()
+            if deadline is not None and remaining <= 0:
+                raise DeviceLeaseTimeout(f"{serial} is leased by {entry.owner}")
+            if not entry.lease_lock.acquire(timeout=remaining):
+                raise DeviceLeaseTimeout(f"{serial} is leased by {entry.owner}")
+
+            # Claimed under the pool lock so remove() sees the lease
+            with self._lock:
+                current = self._entries.get(serial) is entry
+                if current:
+                    lease = DeviceLease(serial=serial, owner=owner, _entry=entry)
+                    entry.lease = lease
+            if current:
+                break
+            # Dropped (unplugged) while we waited, retry on a new entry
+            entry.lease_lock.release()
+
+        entry.owner = owner
+        entry.leased_at = time.time()
+        try:
+            lease.device = self._ensure_alive(entry)
+        except Exception:
+            self.release(lease)
+            raise
+        return lease
+
+    def release(self, lease: DeviceLease) -> None:
+        """Release a lease taken with acquire() (no-op if already released)"""
+        with self._lock:
+            entry = lease._entry
+            if entry is None or entry.lease is not lease:
+                return
+            lease._entry = None
+            entry.lease = None
+            entry.owner = None
+            entry.leased_at = 0.0
+            if entry.removed and self._entries.get(entry.serial) is entry:
+                del self._entries[entry.serial]
+        entry.lease_lock.release()
+
+    @contextmanager
+    def lease(
+        self, serial: str, owner: str = "unknown", timeout: Optional[float] = None
+    ) -> Iterator[u2.Device]:
+        """Context manager around acquire()/release()"""
+        lease = self.acquire(serial, owner=owner, timeout=timeout)
+        try:
+            yield lease.device
+        finally:
+            self.release(lease)
+
+    def invalidate(self, serial: str) -> None:
+        """Forget the cached connection, next access reconnects"""
+        with self._lock:
+            entry = self._entries.get(serial)
+        if entry:
+            with entry.connect_lock:
+                entry.device = None
+                entry.last_alive = 0.0
+
+    def remove(self, serial: str) -> None:
+        """
+        Drop a serial from the pool (device unplugged)
+
+        A leased entry is only marked, its holder keeps exclusive access
+        and the entry is dropped on release.
+        """
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is None:
+                return
+            if entry.lease is None:
+                del self._entries[serial]
+            else:
+                entry.removed = True
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Pool state per serial"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            entry.serial: {
+                "connected": entry.device is not None,
+                "leased": entry.lease_lock.locked(),
+                "owner": entry.owner,
+                "removed": entry.removed,
+                "last_alive": entry.last_alive,
+                "reconnects": entry.reconnects,
+            }
+            for entry in entries
+        }
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _entry(self, serial: str) -> _PooledDevice:
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is None:
+                entry = _PooledDevice(serial=serial)
+                self._entries[serial] = entry
+            return entry
+
+    def _ensure_alive(self, entry: _PooledDevice) -> u2.Device:
+        with entry.connect_lock:
+            device = entry.device
+            if device is not None:
+                if time.monotonic() - entry.last_alive < self.HEALTH_CHECK_INTERVAL:
+                    return device
+                if self._is_alive(device) or self._revive(device):
+                    entry.last_alive = time.monotonic()
+                    return device
+                print(f"[DevicePool] {entry.serial} server died, reconnecting...")
+                entry.reconnects += 1
+
+            try:
+                device = u2.connect(entry.serial)
+            except Exception as e:
+                entry.device = None
+                raise DeviceConnectError(f"Cannot connect {entry.serial}: {e}")
+
+            if not self._is_alive(device):
+                entry.device = None
+                raise DeviceConnectError(f"{entry.serial} did not answer after connect")
+
+            entry.device = device
+            entry.last_alive = time.monotonic()
+            print(f"[DevicePool] Connected {entry.serial}")
+            return device
+
+    def _is_alive(self, device: u2.Device) -> bool:
+        """Lightweight jsonrpc round trip to the on-device server"""
+        try:
+            return bool(device.info)
+        except Exception:
+            return False
+
+    def _revive(self, device: u2.Device) -> bool:
+        """Restart the uiautomator server on an existing connection"""
+        # uiautomator2 3.x exposes start_uiautomator, 2.x reset_uiautomator
+        restart = getattr(device, "start_uiautomator", None) or getattr(
+            device, "reset_uiautomator", None
+        )
+        if restart is None:
+            return False
+        try:
+            restart()
+        except Exception:
+            return False
+        return self._is_alive(device)
+
+
+# Process-wide pool
+device_pool = DeviceConnectionPool()
@@ -6,11 +6,16 @@ import uiautomator2 as u2
 import time
 from typing import Optional
 
+from helpers.helper_device_pool import device_pool
+
 
 def connect_device(device_id: str = "3201912d6c0b2645") -> Optional[u2.Device]:
     """
     Connect to Android device using UI Automator 2
 
+    Reuses the pooled connection when the device is still alive.
+    Use device_pool.lease() instead when the flow needs exclusive access.
+
     Args:
         device_id: Android device ID/serial number
 
@@ -20,7 +25,7 @@ def connect_device(device_id: str = "3201912d6c0b2645") -> Optional[u2.Device]:
     try:
         # Connect to device by serial number
         print(f"Attempting to connect to device {device_id}...")
-        device = u2.connect(device_id)
+        device = device_pool.get(device_id)
 
         # Verify connection by getting device info
         device_info = device.info
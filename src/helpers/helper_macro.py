@@ -0,0 +1,262 @@
+"""
+Helper Macro - Batch fixed-coordinate input into one ADB call
+
+Records taps, swipes, key events and waits, then compiles them into a
+single on-device shell script of `input tap` / `input swipe` /
+`input keyevent` / `sleep` lines that runs with one `adb shell`.
+
+Coordinates are written for the reference phone
+(constant_phone.CONST_WIDTH_PHONE x CONST_HEIGH_PHONE) and scaled to each
+device's real resolution at compile time.
+
+Usage:
+    from helpers.helper_macro import InputMacro
+
+    InputMacro().tap(540, 2280, delay=1).swipe(540, 1800, 540, 300).run(deviceKey)
+"""
+
+import re
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from constants import constant_phone
+
+ADB_PATH = "adb"
+
+KEYCODE_HOME = 3
+KEYCODE_BACK = 4
+KEYCODE_ENTER = 66
+KEYCODE_DEL = 67
+KEYCODE_APP_SWITCH = 187
+
+_resolution_cache: Dict[str, Tuple[int, int]] = {}
+_resolution_lock = threading.Lock()
+
+
+def get_device_resolution(deviceKey: str) -> Optional[Tuple[int, int]]:
+    """
+    Get the input resolution of a device (override size wins over physical)
+
+    Args:
+        deviceKey: Android device serial
+
+    Returns:
+        (width, height) or None if it could not be read
+    """
+    with _resolution_lock:
+        if deviceKey in _resolution_cache:
+            return _resolution_cache[deviceKey]
+
+    try:
+        result = subprocess.run(
+            [ADB_PATH, "-s", deviceKey, "shell", "wm", "size"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except Exception as e:
+        print(f"Failed to read screen size of {deviceKey}: {e}")
+        return None
+
+    sizes = dict(re.findall(r"(\w+) size: (\d+x\d+)", result.stdout))
+    size = sizes.get("Override") or sizes.get("Physical")
+    if not size:
+        return None
+
+    width, height = (int(value) for value in size.split("x"))
+    with _resolution_lock:
+        _resolution_cache[deviceKey] = (width, height)
+    return (width, height)
+
+
+@dataclass
+class _Action:
+    """Single recorded input action"""
+
+    kind: str  # tap | swipe | key | wait
+    args: Tuple = ()
+
+
+class InputMacro:
+    """
+    Sequence of input actions compiled into one shell script
+    """
+
+    def __init__(
+        self,
+        base_width: int = constant_phone.CONST_WIDTH_PHONE,
+        base_height: int = constant_phone.CONST_HEIGH_PHONE,
+    ):
+        self._base_width = base_width
+        self._base_height = base_height
+        self._actions: List[_Action] = []
+
+    # =========================================================================
+    # RECORDING
+    # =========================================================================
+
+    def tap(self, x: int, y: int, delay: float = 0) -> "InputMacro":
+        """Tap at reference coordinates, then wait `delay` seconds"""
+        self._actions.append(_Action("tap", (x, y)))
+        return self.wait(delay)
+
+    def swipe(
+        self,
+        x_start: int,
+        y_start: int,
+        x_end: int,
+        y_end: int,
+        duration: float = 0.5,
+        delay: float = 0,
+    ) -> "InputMacro":
+        """Swipe between reference coordinates over `duration` seconds"""
+        self._actions.append(
+            _Action("swipe", (x_start, y_start, x_end, y_end, int(duration * 1000)))
+        )
+        return self.wait(delay)
+
+    def long_press(
+        self, x: int, y: int, duration: float = 1.0, delay: float = 0
+    ) -> "InputMacro":
+        """Long press is a zero-distance swipe"""
+        return self.swipe(x, y, x, y, duration=duration, delay=delay)
+
+    def key(self, keycode: int, delay: float = 0) -> "InputMacro":
+        """Send an Android key event"""
+        self._actions.append(_Action("key", (keycode,)))
+        return self.wait(delay)
+
+    def wait(self, seconds: float) -> "InputMacro":
+        """Pause between actions (merged with a preceding wait)"""
+        if seconds <= 0:
+            return self
+        if self._actions and self._actions[-1].kind == "wait":
+            previous = self._actions.pop().args[0]
+            seconds += previous
+        self._actions.append(_Action("wait", (seconds,)))
+        return self
+
+    def extend(self, other: "InputMacro") -> "InputMacro":
+        """Append another macro recorded on the same reference size"""
+        for action in other._actions:
+            if action.kind == "wait":
+                self.wait(action.args[0])
+            else:
+                self._actions.append(action)
+        return self
+
+    @property
+    def duration(self) -> float:
+        """Expected run time in seconds (waits + swipe durations)"""
+        total = 0.0
+        for action in self._actions:
+            if action.kind == "wait":
+                total += action.args[0]
+            elif action.kind == "swipe":
+                total += action.args[4] / 1000
+        return total
+
+    # =========================================================================
+    # COMPILE / RUN
+    # =========================================================================
+
+    def compile(self, width: Optional[int] = None, height: Optional[int] = None) -> str:
+        """
+        Compile to a shell script for a device of the given resolution
+
+        Args:
+            width: Device width (defaults to reference width)
+            height: Device height (defaults to reference height)
+
+        Returns:
+            Shell script, one command per line
+        """
+        scale_x = (width or self._base_width) / self._base_width
+        scale_y = (height or self._base_height) / self._base_height
+
+        def sx(value: int) -> int:
+            return round(value * scale_x)
+
+        def sy(value: int) -> int:
+            return round(value * scale_y)
+
+        lines = []
+        for action in self._actions:
+            if action.kind == "tap":
+                x, y = action.args
+                lines.append(f"input tap {sx(x)} {sy(y)}")
+            elif action.kind == "swipe":
+                x1, y1, x2, y2, duration_ms = action.args
+                lines.append(
+                    f"input swipe {sx(x1)} {sy(y1)} {sx(x2)} {sy(y2)} {duration_ms}"
+                )
+            elif action.kind == "key":
+                lines.append(f"input keyevent {action.args[0]}")
+            elif action.kind == "wait":
+                lines.append(f"sleep {action.args[0]:g}")
+        return "\n".join(lines)
+
+    def run(self, deviceKey: str, timeout: Optional[float] = None) -> bool:
+        """
+        Run the macro on a device in a single ADB call
+
+        Args:
+            deviceKey: Android device serial
+            timeout: Seconds before giving up (defaults to duration + 30)
+
+        Returns:
+            True if the script ran successfully
+        """
+        if not self._actions:
+            return True
+
+        resolution = get_device_resolution(deviceKey)
+        width, height = resolution if resolution else (None, None)
+        script = self.compile(width, height)
+
+        try:
+            # Script goes through stdin so its length is not limited by argv;
+            # as bytes, text mode would send \r\n line endings on Windows
+            result = subprocess.run(
+                [ADB_PATH, "-s", deviceKey, "shell", "sh"],
+                input=(script + "\n").encode("utf-8"),
+                capture_output=True,
+                timeout=timeout or self.duration + 30,
+            )
+        except Exception as e:
+            print(f"Macro failed on {deviceKey}: {e}")
+            return False
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            print(f"Macro failed on {deviceKey}: {stderr}")
+            return False
+        return True
+
+
+# =============================================================================
+# COMMON MACROS (same coordinates as helper_keycode)
+# =============================================================================
+
+
+def macro_home() -> InputMacro:
+    """Tap the home button of the navigation bar"""
+    return InputMacro().tap(540, 2280)
+
+
+def macro_move_back() -> InputMacro:
+    """Tap the back button of the navigation bar"""
+    return InputMacro().tap(820, 2280, delay=1)
+
+
+def macro_clear_apps() -> InputMacro:
+    """Go home, open recents, tap "Clear all", go back"""
+    return (
+        macro_home()
+        .wait(1)
+        .key(KEYCODE_APP_SWITCH, delay=1)
+        .tap(540, 1815)
+        .extend(macro_move_back())
+    )
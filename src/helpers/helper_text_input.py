@@ -0,0 +1,387 @@
+"""
+Helper Text Input - Fast text entry for long strings and credentials
+
+Methods, picked per device from what it supports:
+- input_text:   `adb shell input text` (single call, ASCII only, typed
+                char by char on the device so only used for short text)
+- adb_keyboard: one `am broadcast ADB_INPUT_B64` via the ADB Keyboard IME
+- clipboard:    set the device clipboard, then KEYCODE_PASTE (cleared
+                again afterwards, never used for password fields)
+
+After entry the field is read back and the next method is tried if the
+contents do not match. Works with both uiautomator2 objects and Appium
+elements through enter_text_u2 / enter_text_appium.
+"""
+
+import base64
+import shlex
+import subprocess
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set
+
+ADB_PATH = "adb"
+ADB_TIMEOUT = 10
+
+ADB_KEYBOARD_IME = "com.android.adbkeyboard/.AdbIME"
+KEYCODE_PASTE = 279
+
+# Below this length `input text` is faster than switching IME or clipboard
+LONG_TEXT_THRESHOLD = 12
+
+# Read-back polling instead of fixed sleeps around the entry
+VERIFY_TIMEOUT = 1.0
+VERIFY_INTERVAL = 0.1
+
+# Wait for `ime set` to take effect before broadcasting to the IME
+IME_SWITCH_TIMEOUT = 2.0
+IME_SWITCH_INTERVAL = 0.1
+
+# Characters Android uses to mask password fields
+_MASK_CHARS = {"•", "●", "*"}
+
+
+class TextInputMethod(Enum):
+    """Text entry method"""
+
+    INPUT_TEXT = "input_text"
+    ADB_KEYBOARD = "adb_keyboard"
+    CLIPBOARD = "clipboard"
+
+
+def _adb_shell(device_key: str, command: str) -> Optional[str]:
+    """Run a shell command on the device and return stdout"""
+    try:
+        result = subprocess.run(
+            [ADB_PATH, "-s", device_key, "shell", command],
+            capture_output=True,
+            text=True,
+            timeout=ADB_TIMEOUT,
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout
+    except Exception as e:
+        print(f"adb shell error on {device_key}: {e}")
+        return None
+
+
+def _read_text(element: Any) -> Optional[str]:
+    """Read field contents from a uiautomator2 object or Appium element"""
+    try:
+        if hasattr(element, "get_text"):
+            return element.get_text()
+        return element.text
+    except Exception:
+        return None
+
+
+def _is_password(element: Any) -> bool:
+    """Whether an Appium element is a password field (u2 does not expose it)"""
+    try:
+        return str(element.get_attribute("password")).lower() == "true"
+    except Exception:
+        return False
+
+
+def _clear_text(element: Any) -> None:
+    try:
+        if hasattr(element, "clear_text"):
+            element.clear_text()
+        else:
+            element.clear()
+    except Exception:
+        pass
+
+
+def _matches(expected: str, actual: Optional[str]) -> bool:
+    if actual is None:
+        return False
+    if actual == expected:
+        return True
+    # Password fields only expose a mask of the same length
+    return len(actual) == len(expected) and set(actual) <= _MASK_CHARS
+
+
+class TextInputEngine:
+    """
+    Enter text with the fastest method a device supports
+
+    Supported methods are probed once per device; a method that cannot
+    be applied is dropped for that device. A read-back mismatch only
+    moves on to the next method for that call (password fields, WebViews
+    and hinted fields may not read back at all).
+    """
+
+    def __init__(self):
+        self._capabilities: Dict[str, Set[TextInputMethod]] = {}
+        self._lock = threading.Lock()
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def enter_text(
+        self,
+        device_key: str,
+        text: str,
+        element: Any = None,
+        set_clipboard: Optional[Callable[[str], Any]] = None,
+        fallback: Optional[Callable[[str], Any]] = None,
+        secret: bool = False,
+    ) -> Optional[TextInputMethod]:
+        """
+        Enter text into the focused field (or `element`, clicked first)
+
+        Args:
+            device_key: Android device serial
+            text: Text to enter
+            element: Field to focus and read back (optional)
+            set_clipboard: Callable setting the device clipboard, enables
+                the clipboard method (u2 device.set_clipboard or Appium
+                driver.set_clipboard_text) except on password fields
+            fallback: Per-element entry used when every method fails
+                (e.g. element.send_keys)
+            secret: Text is a credential, never goes through the clipboard
+                (password fields are detected on Appium elements)
+
+        Returns:
+            Method used, or None if only the fallback (or nothing) worked
+        """
+        if element is not None:
+            secret = secret or _is_password(element)
+            try:
+                element.click()
+            except Exception:
+                pass
+
+        pasted = False
+        try:
+            for method in self._candidates(device_key, text, set_clipboard, secret):
+                if element is not None:
+                    _clear_text(element)
+
+                started = time.monotonic()
+                pasted = pasted or method == TextInputMethod.CLIPBOARD
+                if not self._apply(method, device_key, text, set_clipboard):
+                    self._drop(device_key, method)
+                    continue
+
+                if element is None or self._verify(element, text):
+                    elapsed = (time.monotonic() - started) * 1000
+                    print(
+                        f"Entered {len(text)} chars via {method.value} ({elapsed:.0f}ms)"
+                    )
+                    return method
+
+                print(f"{method.value} verification failed on {device_key}")
+
+            if fallback is not None:
+                if element is not None:
+                    _clear_text(element)
+                fallback(text)
+            return None
+        finally:
+            # Do not leave the text (often a credential) on the clipboard
+            if pasted:
+                self._clear_clipboard(device_key, set_clipboard)
+
+    def get_capabilities(self, device_key: str) -> List[str]:
+        """Methods supported by a device (probes on first call)"""
+        return sorted(method.value for method in self._probe(device_key))
+
+    def forget(self, device_key: str) -> None:
+        """Drop cached capabilities (device unplugged or IME changed)"""
+        with self._lock:
+            self._capabilities.pop(device_key, None)
+
+    # =========================================================================
+    # PRIVATE
+    # =========================================================================
+
+    def _probe(self, device_key: str) -> Set[TextInputMethod]:
+        with self._lock:
+            if device_key in self._capabilities:
+                return self._capabilities[device_key]
+
+        methods = {TextInputMethod.INPUT_TEXT, TextInputMethod.CLIPBOARD}
+        imes = _adb_shell(device_key, "ime list -s") or ""
+        if ADB_KEYBOARD_IME in imes.split():
+            methods.add(TextInputMethod.ADB_KEYBOARD)
+
+        with self._lock:
+            self._capabilities[device_key] = methods
+        return methods
+
+    def _drop(self, device_key: str, method: TextInputMethod) -> None:
+        with self._lock:
+            self._capabilities.get(device_key, set()).discard(method)
+
+    def _candidates(
+        self,
+        device_key: str,
+        text: str,
+        set_clipboard: Optional[Callable[[str], Any]],
+        secret: bool = False,
+    ) -> List[TextInputMethod]:
+        supported = self._probe(device_key)
+        typeable = text.isascii() and "\n" not in text
+
+        if typeable and len(text) < LONG_TEXT_THRESHOLD:
+            order = [
+                TextInputMethod.INPUT_TEXT,
+                TextInputMethod.ADB_KEYBOARD,
+                TextInputMethod.CLIPBOARD,
+            ]
+        else:
+            order = [
+                TextInputMethod.ADB_KEYBOARD,
+                TextInputMethod.CLIPBOARD,
+                TextInputMethod.INPUT_TEXT,
+            ]
+
+        candidates = []
+        for method in order:
+            if method not in supported:
+                continue
+            if method == TextInputMethod.INPUT_TEXT and not typeable:
+                continue
+            if method == TextInputMethod.CLIPBOARD and (
+                set_clipboard is None or secret
+            ):
+                continue
+            candidates.append(method)
+        return candidates
+
+    def _apply(
+        self,
+        method: TextInputMethod,
+        device_key: str,
+        text: str,
+        set_clipboard: Optional[Callable[[str], Any]],
+    ) -> bool:
+        if method == TextInputMethod.INPUT_TEXT:
+            # `input text` treats %s as space
+            escaped = shlex.quote(text.replace(" ", "%s"))
+            return _adb_shell(device_key, f"input text {escaped}") is not None
+
+        if method == TextInputMethod.ADB_KEYBOARD:
+            return self._apply_adb_keyboard(device_key, text)
+
+        if method == TextInputMethod.CLIPBOARD:
+            try:
+                set_clipboard(text)
+            except Exception as e:
+                print(f"Set clipboard failed on {device_key}: {e}")
+                return False
+            return _adb_shell(device_key, f"input keyevent {KEYCODE_PASTE}") is not None
+
+        return False
+
+    def _clear_clipboard(
+        self, device_key: str, set_clipboard: Callable[[str], Any]
+    ) -> None:
+        try:
+            set_clipboard("")
+        except Exception as e:
+            print(f"Clear clipboard failed on {device_key}: {e}")
+
+    def _apply_adb_keyboard(self, device_key: str, text: str) -> bool:
+        current_ime = (
+            _adb_shell(device_key, "settings get secure default_input_method") or ""
+        ).strip()
+        switched = current_ime != ADB_KEYBOARD_IME
+        if switched:
+            if _adb_shell(device_key, f"ime set {ADB_KEYBOARD_IME}") is None:
+                return False
+            if not self._wait_for_ime(device_key, ADB_KEYBOARD_IME):
+                print(f"ADB Keyboard did not become active on {device_key}")
+                if current_ime and current_ime != "null":
+                    _adb_shell(device_key, f"ime set {shlex.quote(current_ime)}")
+                return False
+
+        try:
+            msg = base64.b64encode(text.encode("utf-8")).decode("ascii")
+            output = _adb_shell(
+                device_key, f"am broadcast -a ADB_INPUT_B64 --es msg {msg}"
+            )
+            return output is not None
+        finally:
+            if switched and current_ime and current_ime != "null":
+                _adb_shell(device_key, f"ime set {shlex.quote(current_ime)}")
+
+    def _wait_for_ime(self, device_key: str, ime: str) -> bool:
+        deadline = time.monotonic() + IME_SWITCH_TIMEOUT
+        while True:
+            current = _adb_shell(device_key, "settings get secure default_input_method")
+            if (current or "").strip() == ime:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(IME_SWITCH_INTERVAL)
+
+    def _verify(self, element: Any, text: str) -> bool:
+        deadline = time.monotonic() + VERIFY_TIMEOUT
+        while True:
+            if _matches(text, _read_text(element)):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(VERIFY_INTERVAL)
+
+
+# Process-wide engine (capabilities are cached per device)
+text_input_engine = TextInputEngine()
+
+
+def enter_text_u2(
+    device: Any, element: Any, text: str, secret: bool = False
+) -> Optional[TextInputMethod]:
+    """
+    Enter text into a uiautomator2 UiObject
+
+    Args:
+        device: UIAutomator2 Device instance
+        element: UiObject of the field
+        text: Text to enter
+        secret: Text is a credential (keeps it off the clipboard)
+    """
+    return text_input_engine.enter_text(
+        device.serial,
+        text,
+        element=element,
+        set_clipboard=device.set_clipboard,
+        fallback=element.set_text,
+        secret=secret,
+    )
+
+
+def enter_text_appium(
+    driver: Any, element: Any, text: str, secret: bool = False
+) -> Optional[TextInputMethod]:
+    """
+    Enter text into an Appium WebElement
+
+    Falls back to element.send_keys when the device serial is unknown.
+
+    Args:
+        driver: Appium WebDriver
+        element: WebElement of the field
+        text: Text to enter
+        secret: Text is a credential (keeps it off the clipboard)
+    """
+    capabilities = getattr(driver, "capabilities", None) or {}
+    device_key = capabilities.get("udid") or capabilities.get("deviceUDID")
+    if not device_key:
+        element.send_keys(text)
+        return None
+
+    return text_input_engine.enter_text(
+        device_key,
+        text,
+        element=element,
+        set_clipboard=getattr(driver, "set_clipboard_text", None),
+        fallback=element.send_keys,
+        secret=secret,
+    )
@@ -4,6 +4,9 @@ WiFi Setup Action - UI Automator 2 Implementation
 
 import time
 import uiautomator2 as u2
+from typing import Dict, List
+from bridge.config import BridgeConfig, config
+from utils import util_wifi
 from utils.drive import (
     util_actions_click,
     util_actions_scroll,
@@ -12,10 +15,68 @@ from utils.drive import (
 )
 
 
+def setup_wifi_cmd(
+    device_key: str,
+    wifi_networks: List[Dict[str, str]],
+    scan_cache_ttl: float = 30,
+    connect_timeout: float = 15,
+) -> bool:
+    """
+    Connect device to the strongest known WiFi via `cmd wifi` (Android 11+)
+
+    Args:
+        device_key: Android device serial
+        wifi_networks: Known networks [{"name": ..., "password": ...}]
+        scan_cache_ttl: Seconds scan results are shared between phones
+        connect_timeout: Seconds to wait for each connection attempt
+
+    Returns:
+        True if connected, False if unsupported or no known network worked
+    """
+    status = util_wifi.get_wifi_status(device_key)
+    if status is None:
+        print("cmd wifi not supported on this device")
+        return False
+
+    known_names = {network.get("name") for network in wifi_networks}
+    if status.connected_ssid in known_names:
+        print(f"Already connected to {status.connected_ssid}")
+        return True
+
+    if not status.enabled:
+        print("Turning on WiFi...")
+        util_wifi.set_wifi_enabled(device_key, True)
+
+    candidates = util_wifi.pick_known_networks(
+        util_wifi.list_scan_results(device_key, ttl=scan_cache_ttl), wifi_networks
+    )
+    if not candidates:
+        print("No known WiFi network in range")
+        return False
+
+    for network in candidates:
+        print(f"Connecting to {network['name']} ({network['security']})...")
+        if util_wifi.connect_network(
+            device_key,
+            ssid=network["name"],
+            password=network.get("password"),
+            security=network["security"],
+            timeout=connect_timeout,
+        ):
+            print(f"Successfully connected to {network['name']}")
+            return True
+
+    return False
+
+
 def setup_wifi(device: u2.Device) -> bool:
     """
     Connect device to WiFi
 
+    Tries `cmd wifi` first and falls back to the Settings UI flow.
+    Networks come from wifi_networks.json (see BridgeConfig), timeouts
+    from the "wifi" section of bridge/config.json.
+
     Args:
         device: UIAutomator2 Device instance
 
@@ -23,13 +84,21 @@ def setup_wifi(device: u2.Device) -> bool:
         True if successful, False otherwise
     """
     try:
-        wifi_networks = [
-            {"name": "MyzenQ9", "password": "0906708345"},
-            {"name": "Sea Dragon IT", "password": "@seadragonit99"},
-            {"name": "Canh-A19.16", "password": "Canh56789"},
-            {"name": "Canh-A19.16- 5G", "password": "Canh56789"},
-        ]
-
+        wifi_config = config.get("wifi", {})
+        wifi_networks = BridgeConfig.load_wifi_networks()
+        if not wifi_networks:
+            print(f"No WiFi networks configured in {BridgeConfig.wifi_networks_path()}")
+            return False
+
+        if setup_wifi_cmd(
+            device.serial,
+            wifi_networks,
+            scan_cache_ttl=wifi_config.get("scan_cache_ttl", 30),
+            connect_timeout=wifi_config.get("connect_timeout", 15),
+        ):
+            return True
+
+        print("Falling back to Settings UI...")
         print("Opening Settings search...")
         profile_button = device(description="Samsung account profile")
         if profile_button.exists:
@@ -3,10 +3,16 @@ Phone Setup Center - UI Automator 2 Implementation
 Main service that orchestrates all device setup actions
 """
 
-import time
 import uiautomator2 as u2
 from typing import Optional
 
+from helpers.helper_device_pool import (
+    device_pool,
+    DeviceConnectError,
+    DeviceLeaseTimeout,
+)
+from helpers.helper_macro import InputMacro, KEYCODE_HOME, KEYCODE_APP_SWITCH
+
 # Import all action modules
 from actions.setup_language import setup_language
 from actions.setup_wifi import setup_wifi
@@ -18,15 +24,18 @@ from actions.setup_lock_screen import setup_lock_screen
 
 
 class ServicePhoneSetupCenter:
+    # Seconds to wait when another flow is driving the same phone
+    LEASE_TIMEOUT = 60
+
     def __init__(self, device_key: str):
         self.device_key = device_key
         self.device: Optional[u2.Device] = None
 
     def connect_device(self) -> bool:
-        """Connect to the Android device"""
+        """Connect to the Android device (shared, no lease)"""
         try:
             print(f"Connecting to device {self.device_key}...")
-            self.device = u2.connect(self.device_key)
+            self.device = device_pool.get(self.device_key)
 
             # Verify connection
             device_info = self.device.info
@@ -40,10 +49,23 @@ class ServicePhoneSetupCenter:
             return False
 
     def execute(self) -> bool:
-        """Execute all device setup actions"""
-        if not self.connect_device():
+        """Execute all device setup actions while holding the device lease"""
+        try:
+            with device_pool.lease(
+                self.device_key, owner="phone-setup", timeout=self.LEASE_TIMEOUT
+            ) as device:
+                self.device = device
+                info = device.info
+                print(f"Connected to device: {info.get('brand')} {info.get('model')}")
+                return self._run_actions()
+        except (DeviceConnectError, DeviceLeaseTimeout) as e:
+            print(f"Failed to connect to device: {e}")
             return False
+        finally:
+            self.device = None
 
+    def _run_actions(self) -> bool:
+        """Run setup actions on the leased device"""
         try:
             print("\n========== Starting Phone Setup ==========")
 
@@ -84,13 +106,14 @@ class ServicePhoneSetupCenter:
 
             # Final steps
             print("\n---------- Finalizing Setup ----------")
-            self.device.press("home")
-            time.sleep(1)
-
-            # Clear recent apps
-            self.device.press("recent")
-            time.sleep(1)
-            self.device.press("home")
+            # Home, recent apps, home again in a single ADB call
+            (
+                InputMacro()
+                .key(KEYCODE_HOME, delay=1)
+                .key(KEYCODE_APP_SWITCH, delay=1)
+                .key(KEYCODE_HOME)
+                .run(self.device_key)
+            )
 
             print("\n========== Device Setup Complete ==========")
             return True
@@ -8,6 +8,7 @@ from utils.actions import (
 )
 from utils import UtilConvert, UtilValues
 from helpers import HelperKeycode
+from helpers.helper_text_input import enter_text_appium
 from appium.webdriver.webdriver import WebDriver 
 from enums.ESocials import ESocials
 
@@ -48,17 +49,25 @@ class ServiceProxy:
         try:
             print("Check have login")
             time.sleep(3)
-            UtilActionsGetElements.get_element_by_xpath(
+            enter_text_appium(
                 driver=driver,
-                xpath='//android.widget.EditText[@resource-id="com.firenet.proxy922:id/et_email"]',
-            ).send_keys(emailProxy)
+                element=UtilActionsGetElements.get_element_by_xpath(
+                    driver=driver,
+                    xpath='//android.widget.EditText[@resource-id="com.firenet.proxy922:id/et_email"]',
+                ),
+                text=emailProxy,
+            )
             print("Enter email")
 
-            time.sleep(1)
-            UtilActionsGetElements.get_element_by_xpath(
+            enter_text_appium(
                 driver=driver,
-                xpath='//android.widget.EditText[@resource-id="com.firenet.proxy922:id/et_pass"]',
-            ).send_keys(passwordProxy)
+                element=UtilActionsGetElements.get_element_by_xpath(
+                    driver=driver,
+                    xpath='//android.widget.EditText[@resource-id="com.firenet.proxy922:id/et_pass"]',
+                ),
+                text=passwordProxy,
+                secret=True,
+            )
             print("Enter password")
 
             time.sleep(1)
@@ -5,6 +5,7 @@ from enums.EAppName import EAppName
 from enums.EAppNamePermission import EAppNamePermission
 from enums.status.EStatusCommon import EStatusCommon
 from helpers import HelperKeycode
+from helpers.helper_text_input import enter_text_appium
 from interfaces.model.common.TypeDevice import TypeDevice
 from utils.UtilPhoneDevice import is_package_installed, remove_files_in_folder_phone
 from utils.actions import (
@@ -129,10 +130,14 @@ def login_ch_play(driver: WebDriver, email: str, password: str):
 
     time.sleep(1)
     print("Enter email")
-    UtilActionsGetElements.get_element_by_xpath(
-        driver=driver, xpath='//android.widget.EditText[@resource-id="identifierId"]'
-    ).send_keys(email)
-    time.sleep(1)
+    enter_text_appium(
+        driver=driver,
+        element=UtilActionsGetElements.get_element_by_xpath(
+            driver=driver,
+            xpath='//android.widget.EditText[@resource-id="identifierId"]',
+        ),
+        text=email,
+    )
 
     print("Click next")
     UtilActionsGetElements.get_element_wait_by_xpath(
@@ -157,10 +162,14 @@ def login_ch_play(driver: WebDriver, email: str, password: str):
         driver=driver, xpath='//android.view.View[@resource-id="password"]'
     )
     time.sleep(1)
-    UtilActionsGetElements.get_element_by_xpath(
-        driver=driver, xpath="//android.widget.EditText"
-    ).send_keys(password)
-    time.sleep(1)
+    enter_text_appium(
+        driver=driver,
+        element=UtilActionsGetElements.get_element_by_xpath(
+            driver=driver, xpath="//android.widget.EditText"
+        ),
+        text=password,
+        secret=True,
+    )
 
     print("Click next")
     UtilActionsGetElements.get_element_wait_by_xpath(
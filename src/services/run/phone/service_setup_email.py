@@ -11,6 +11,7 @@ from enums.status.EStatusExecuteCommon import EStatusExecuteCommon
 from appium.webdriver.webdriver import WebDriver
 from enums.status.EStatusExecuteCommon import EStatusExecuteCommon
 from helpers import HelperKeycode
+from helpers.helper_text_input import enter_text_appium
 from interfaces.common.TypeDeviceADB import TypeDeviceADB
 from interfaces.common.TypeResponse import TypeDataUser
 from utils.actions import (
@@ -219,11 +220,14 @@ def login_gmail(instance: ServiceSetupEmail, driver: WebDriver) -> bool:
             email = dataSetupDevice.get("email")
             password = dataSetupDevice.get("password_email_current")
             time.sleep(3)
-            UtilActionsGetElements.get_element_by_xpath(
+            enter_text_appium(
                 driver=driver,
-                xpath='//android.widget.EditText[@resource-id="identifierId"]',
-            ).send_keys(email)
-            time.sleep(1)
+                element=UtilActionsGetElements.get_element_by_xpath(
+                    driver=driver,
+                    xpath='//android.widget.EditText[@resource-id="identifierId"]',
+                ),
+                text=email,
+            )
             UtilActionsGetElements.get_element_by_xpath(
                 driver=driver, xpath='//android.widget.Button[@text="Next"]'
             ).click()
@@ -262,9 +266,14 @@ def login_gmail(instance: ServiceSetupEmail, driver: WebDriver) -> bool:
                 pass
 
             print("Enter password")
-            UtilActionsGetElements.get_element_wait_by_xpath(
-                driver=driver, xpath="//android.widget.EditText"
-            ).send_keys(password)
+            enter_text_appium(
+                driver=driver,
+                element=UtilActionsGetElements.get_element_wait_by_xpath(
+                    driver=driver, xpath="//android.widget.EditText"
+                ),
+                text=password,
+                secret=True,
+            )
             print("Click next")
             time.sleep(1)
             UtilActionsGetElements.get_element_wait_by_xpath(
@@ -485,20 +494,28 @@ def login_gmail(instance: ServiceSetupEmail, driver: WebDriver) -> bool:
     email = dataSetupDevice.get("email")
     password = dataSetupDevice.get("password_email_current")
     time.sleep(3)
-    UtilActionsGetElements.get_element_by_xpath(
+    enter_text_appium(
         driver=driver,
-        xpath='//android.widget.EditText[@resource-id="identifierId"]',
-    ).send_keys(email)
-    time.sleep(1)
+        element=UtilActionsGetElements.get_element_by_xpath(
+            driver=driver,
+            xpath='//android.widget.EditText[@resource-id="identifierId"]',
+        ),
+        text=email,
+    )
     UtilActionsGetElements.get_element_by_xpath(
         driver=driver, xpath='//android.widget.Button[@text="Next"]'
     ).click()
     time.sleep(5)
 
     print("Enter password")
-    UtilActionsGetElements.get_element_wait_by_xpath(
-        driver=driver, xpath="//android.widget.EditText"
-    ).send_keys(password)
+    enter_text_appium(
+        driver=driver,
+        element=UtilActionsGetElements.get_element_wait_by_xpath(
+            driver=driver, xpath="//android.widget.EditText"
+        ),
+        text=password,
+        secret=True,
+    )
     print("Click next")
     time.sleep(1)
     UtilActionsGetElements.get_element_wait_by_xpath(
@@ -5,11 +5,15 @@ Converted from Appium to UI Automator 2
 
 import os
 import time
-import cv2
-import numpy as np
 from typing import List, Optional, Dict
 from uiautomator2 import Device
 
+from utils.util_lazy_import import deferred_import
+
+# Only used by image matching, imported on first use
+cv2 = deferred_import("cv2")
+np = deferred_import("numpy")
+
 
 def check_element_disable_by_selector(
     device: Device, selector: str, time_get_check: int = 6
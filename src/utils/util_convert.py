@@ -4,7 +4,10 @@ from datetime import datetime
 from PIL import Image
 from io import BytesIO
 from appium.webdriver.webdriver import WebDriver
-import numpy as np
+
+from utils.util_lazy_import import deferred_import
+
+np = deferred_import("numpy")
 
 pytesseract.pytesseract.tesseract_cmd = (
     "C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
@@ -0,0 +1,63 @@
+"""
+Lazy Import Utility - Defer heavy modules until first use
+
+Heavy libraries (cv2, numpy, ...) imported at module top level are paid
+for at launch even when the feature is never used. deferred_import()
+returns a stand-in that imports the real module on first attribute access.
+
+Usage:
+    from utils.util_lazy_import import deferred_import
+
+    cv2 = deferred_import("cv2")
+    np = deferred_import("numpy")
+
+    def match(...):
+        image = cv2.imread(path)  # cv2 imported here
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class _DeferredModule:
+    """Module stand-in resolved on first attribute access"""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] else "deferred"
+        return f"<deferred module '{self.__dict__['_name']}' ({state})>"
+
+
+def deferred_import(name: str) -> Any:
+    """
+    Get a module that is imported on first use
+
+    Args:
+        name: Absolute module name (e.g. "cv2", "numpy")
+
+    Returns:
+        Stand-in forwarding attribute access to the real module
+    """
+    return _DeferredModule(name)
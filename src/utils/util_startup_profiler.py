@@ -0,0 +1,213 @@
+"""
+Startup Profiler - Measure cold start from main.py to first window paint
+
+Enabled with STARTUP_PROFILE=true. Records:
+- Import time per module (inclusive and self time)
+- Named sections (e.g. bridge construction)
+- Milestones (registry created, window created, first paint)
+
+The report is written to STARTUP_PROFILE_FILE (default
+startup_profile.txt) at first paint and again at exit, so bridges loaded
+after the window appears are included too.
+
+Only uses the standard library so it can be installed before any other
+import in main.py.
+"""
+
+import atexit
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+REPORT_TOP_MODULES = 40
+
+
+class _TimedLoader:
+    """Loader wrapper timing exec_module, restores the real loader on exec"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        # Leave no trace of the wrapper on the loaded module
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        with self._profiler.timed_import(module.__name__):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps the loader of every new module"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+
+        self._local.busy = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find_spec = getattr(finder, "find_spec", None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.busy = False
+
+        if spec is None or spec.loader is None:
+            return spec
+        if not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Collects import, section and milestone timings
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+        self.report_path = os.getenv("STARTUP_PROFILE_FILE", "startup_profile.txt")
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finder: Optional[_ImportTimer] = None
+
+        # module -> (inclusive seconds, self seconds)
+        self._imports: Dict[str, Tuple[float, float]] = {}
+        self._sections: List[Tuple[str, float]] = []
+        self._milestones: List[Tuple[str, float]] = []
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def install(self) -> None:
+        """Start recording imports (no-op unless STARTUP_PROFILE=true)"""
+        if not self.enabled or self._finder is not None:
+            return
+        self._started = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        atexit.register(self.write_report)
+        self.mark("profiler installed")
+
+    def mark(self, name: str) -> None:
+        """Record a milestone relative to install()"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._milestones.append((name, time.perf_counter() - self._started))
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time a named block (e.g. bridge construction)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._sections.append((name, time.perf_counter() - started))
+
+    @contextmanager
+    def timed_import(self, module_name: str) -> Iterator[None]:
+        """Time one module body; nested imports are subtracted from self time"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        frame = [time.perf_counter(), 0.0]  # start, children
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            inclusive = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += inclusive
+            with self._lock:
+                self._imports[module_name] = (inclusive, inclusive - frame[1])
+
+    def first_paint(self, *args) -> None:
+        """Window event handler: mark first paint and write the report"""
+        if not self.enabled:
+            return
+        self.mark("first paint")
+        self.write_report()
+
+    def write_report(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                f.write(self.build_report())
+            print(f"⏱️ Startup profile written to {self.report_path}")
+        except Exception as e:
+            print(f"❌ Startup profile error: {e}")
+
+    def build_report(self) -> str:
+        with self._lock:
+            imports = dict(self._imports)
+            sections = list(self._sections)
+            milestones = list(self._milestones)
+
+        lines = ["Startup profile", "=" * 60, "", "Milestones (s since start)"]
+        for name, at in milestones:
+            lines.append(f"  {at:8.3f}  {name}")
+
+        lines += ["", "Sections (s)"]
+        for name, took in sorted(sections, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {took:8.3f}  {name}")
+
+        total = sum(self_time for _, self_time in imports.values())
+        lines += [
+            "",
+            f"Imports: {len(imports)} modules, {total:.3f}s total self time",
+            f"Top {REPORT_TOP_MODULES} by self time (self / inclusive, s)",
+        ]
+        ranked = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (inclusive, self_time) in ranked[:REPORT_TOP_MODULES]:
+            lines.append(f"  {self_time:8.3f} / {inclusive:8.3f}  {name}")
+
+        # Roll up by top-level package to spot heavy dependencies
+        packages: Dict[str, float] = {}
+        for name, (_, self_time) in imports.items():
+            top = name.split(".")[0]
+            packages[top] = packages.get(top, 0.0) + self_time
+        lines += ["", "By top-level package (self time, s)"]
+        for name, took in sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[:REPORT_TOP_MODULES]:
+            lines.append(f"  {took:8.3f}  {name}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide profiler
+startup_profiler = StartupProfiler()
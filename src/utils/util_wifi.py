@@ -0,0 +1,266 @@
+"""
+Wi-Fi Utility - Provision Wi-Fi over ADB with `cmd wifi`
+
+Provides functions to:
+- Read Wi-Fi status of a device (`cmd wifi status`)
+- Scan nearby networks (`cmd wifi list-scan-results`), cached per host
+- Connect to a network in one shot (`cmd wifi connect-network`)
+
+Scan results are shared by every phone on this PC for a short TTL,
+so a bench of phones in the same room only triggers one scan.
+"""
+
+import re
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+ADB_PATH = "adb"
+ADB_TIMEOUT = 10
+
+# Line format (Android 11+):
+#   BSSID  Frequency  RSSI  Age(sec)  SSID  Flags
+#   aa:bb:cc:dd:ee:ff  2437  -45  1.234  My Network  [WPA2-PSK-CCMP][ESS]
+_SCAN_LINE_RE = re.compile(
+    r"^\s*(?P<bssid>[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})\s+"
+    r"(?P<frequency>\d+)\s+"
+    r"(?P<rssi>-?\d+)\s+"
+    r"(?P<age>[>\d.]+)\s+"
+    r"(?P<ssid>.*?)\s*"
+    r"(?P<flags>(?:\[[^\]]*\])*)\s*$"
+)
+_CONNECTED_RE = re.compile(r'Wifi is connected to "(?P<ssid>.*)"')
+
+
+@dataclass
+class WifiScanResult:
+    """Single access point seen by a scan"""
+
+    ssid: str
+    bssid: str
+    frequency: int
+    rssi: int
+    flags: str
+
+    @property
+    def security(self) -> str:
+        """Security type accepted by `cmd wifi connect-network`"""
+        flags = self.flags.upper()
+        if "SAE" in flags or "WPA3" in flags:
+            return "wpa3"
+        if "PSK" in flags or "WPA" in flags:
+            return "wpa2"
+        if "OWE" in flags:
+            return "owe"
+        return "open"
+
+
+@dataclass
+class WifiStatus:
+    """Parsed output of `cmd wifi status`"""
+
+    enabled: bool
+    connected_ssid: Optional[str] = None
+
+
+class _ScanCache:
+    """Host-wide scan cache, one scan in flight at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: List[WifiScanResult] = []
+        self._scanned_at = 0.0
+
+    def get(self, device_key: str, ttl: float) -> List[WifiScanResult]:
+        # Holding the lock while scanning makes concurrent callers wait
+        # for the scan in flight instead of starting their own
+        with self._lock:
+            if self._results and time.monotonic() - self._scanned_at < ttl:
+                return list(self._results)
+
+            results = _scan(device_key)
+            if results:
+                self._results = results
+                self._scanned_at = time.monotonic()
+            return list(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results = []
+            self._scanned_at = 0.0
+
+
+_scan_cache = _ScanCache()
+
+
+def _run_wifi_cmd(device_key: str, *args: str) -> Optional[str]:
+    """Run `cmd wifi ...` on a device and return stdout"""
+    try:
+        result = subprocess.run(
+            # adb shell joins args with spaces, quote so SSIDs keep theirs
+            [ADB_PATH, "-s", device_key, "shell", "cmd", "wifi"]
+            + [shlex.quote(arg) for arg in args],
+            capture_output=True,
+            text=True,
+            timeout=ADB_TIMEOUT,
+        )
+        if result.returncode != 0:
+            print(f"cmd wifi {args[0]} failed on {device_key}: {result.stderr}")
+            return None
+        return result.stdout
+    except Exception as e:
+        print(f"cmd wifi {args[0]} error on {device_key}: {e}")
+        return None
+
+
+def parse_scan_results(output: str) -> List[WifiScanResult]:
+    """Parse `cmd wifi list-scan-results` output"""
+    results: List[WifiScanResult] = []
+    for line in output.splitlines():
+        match = _SCAN_LINE_RE.match(line)
+        if not match or not match.group("ssid"):
+            continue
+        results.append(
+            WifiScanResult(
+                ssid=match.group("ssid"),
+                bssid=match.group("bssid").lower(),
+                frequency=int(match.group("frequency")),
+                rssi=int(match.group("rssi")),
+                flags=match.group("flags"),
+            )
+        )
+    return results
+
+
+def parse_status(output: str) -> WifiStatus:
+    """Parse `cmd wifi status` output"""
+    match = _CONNECTED_RE.search(output)
+    return WifiStatus(
+        enabled="Wifi is enabled" in output,
+        connected_ssid=match.group("ssid") if match else None,
+    )
+
+
+def get_wifi_status(device_key: str) -> Optional[WifiStatus]:
+    """
+    Get Wi-Fi status of a device
+
+    Args:
+        device_key: Android device serial
+
+    Returns:
+        WifiStatus, or None if `cmd wifi` is not supported
+    """
+    output = _run_wifi_cmd(device_key, "status")
+    if output is None:
+        return None
+    return parse_status(output)
+
+
+def set_wifi_enabled(device_key: str, enabled: bool = True) -> bool:
+    """Turn Wi-Fi on or off"""
+    state = "enabled" if enabled else "disabled"
+    return _run_wifi_cmd(device_key, "set-wifi-enabled", state) is not None
+
+
+def _scan(device_key: str) -> List[WifiScanResult]:
+    """Trigger a scan and read results from a device"""
+    _run_wifi_cmd(device_key, "start-scan")
+    # Results are filled in asynchronously, poll briefly
+    for _ in range(10):
+        output = _run_wifi_cmd(device_key, "list-scan-results")
+        if output is None:
+            return []
+        results = parse_scan_results(output)
+        if results:
+            return results
+        time.sleep(0.5)
+    return []
+
+
+def list_scan_results(device_key: str, ttl: float = 30) -> List[WifiScanResult]:
+    """
+    Get nearby networks, reusing the host-wide cache when fresh
+
+    Args:
+        device_key: Android device serial used to scan on cache miss
+        ttl: Cache lifetime in seconds
+
+    Returns:
+        List of WifiScanResult (may be empty)
+    """
+    return _scan_cache.get(device_key, ttl)
+
+
+def clear_scan_cache() -> None:
+    """Drop cached scan results (e.g. after moving the bench)"""
+    _scan_cache.clear()
+
+
+def pick_known_networks(
+    scan_results: List[WifiScanResult], networks: List[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    """
+    Order known networks by best signal seen in the scan
+
+    Args:
+        scan_results: Networks seen by the scan
+        networks: Known networks [{"name": ..., "password": ...}]
+
+    Returns:
+        Known networks present in the scan, strongest first, each with
+        an added "security" key
+    """
+    best: Dict[str, WifiScanResult] = {}
+    for result in scan_results:
+        current = best.get(result.ssid)
+        if current is None or result.rssi > current.rssi:
+            best[result.ssid] = result
+
+    candidates = []
+    for network in networks:
+        result = best.get(network.get("name"))
+        if result:
+            candidates.append((result.rssi, {**network, "security": result.security}))
+
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    return [network for _, network in candidates]
+
+
+def connect_network(
+    device_key: str,
+    ssid: str,
+    password: Optional[str] = None,
+    security: str = "wpa2",
+    timeout: float = 15,
+) -> bool:
+    """
+    Connect to a network and wait until the device reports it
+
+    Args:
+        device_key: Android device serial
+        ssid: Network name
+        password: Passphrase (ignored for open networks)
+        security: open | owe | wpa2 | wpa3
+        timeout: Seconds to wait for the connection
+
+    Returns:
+        True if connected, False otherwise
+    """
+    args = ["connect-network", ssid, security]
+    if security not in ("open", "owe") and password:
+        args.append(password)
+
+    if _run_wifi_cmd(device_key, *args) is None:
+        return False
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = get_wifi_status(device_key)
+        if status and status.connected_ssid == ssid:
+            return True
+        time.sleep(0.5)
+    return False
@@ -66,7 +66,7 @@ export const MonitoringContent: React.FC = () => {
     setDevices(newDevices);
   }, []);
 
-  useDeviceEvents(handleDevicesChanged, undefined, true);
+  useDeviceEvents(handleDevicesChanged, undefined, true, bridge.getSnapshot);
 
   const handleOpenWindow = async (deviceId: string) => {
     const result = await bridge.openWindow(deviceId);
@@ -32,6 +32,9 @@ export const PhoneCard: React.FC<PhoneCardProps> = ({
 
   const getStatusTag = () => {
     if (device.has_window) return <Tag color='green'>Window Open</Tag>;
+    if (device.state === 'online' && device.agent_state === 'provisioning')
+      return <Tag color='gold'>Preparing</Tag>;
+    if (device.state === 'online' && device.is_ready) return <Tag color='cyan'>Ready</Tag>;
     if (device.state === 'online') return <Tag color='blue'>Online</Tag>;
     if (device.state === 'unauthorized') return <Tag color='orange'>Unauthorized</Tag>;
     return <Tag>Offline</Tag>;
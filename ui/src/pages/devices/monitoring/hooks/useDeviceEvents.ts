@@ -1,12 +1,18 @@
 /**
  * useDeviceEvents - Hook for listening to device and frame events
+ *
+ * Device updates arrive as versioned patches; when a patch does not build
+ * on the version we hold, a full snapshot is requested instead. Patches
+ * arriving while the snapshot is in flight are buffered and replayed on top
+ * of it.
  */
 
-import { useEffect, useCallback } from 'react';
-import type { Device } from '../types/monitoring.types';
+import { useEffect, useCallback, useRef } from 'react';
+import type { Device, DeviceSnapshot, DevicesPatchEvent } from '../types/monitoring.types';
 
 export type DevicesChangedCallback = (devices: Device[]) => void;
 export type FrameCallback = (deviceId: string, frame: string) => void;
+export type SnapshotRequest = () => Promise<DeviceSnapshot>;
 
 interface DevicesChangedEventDetail {
   devices: Device[];
@@ -17,22 +23,114 @@ interface FrameEventDetail {
   frame: string;
 }
 
+function applyPatch(devices: Device[], patch: DevicesPatchEvent): Device[] {
+  const removed = new Set(patch.removed);
+  const next = devices
+    .filter((device) => !removed.has(device.device_id))
+    .map((device) => {
+      const fields = patch.upserts[device.device_id];
+      return fields ? { ...device, ...fields } : device;
+    });
+
+  const known = new Set(next.map((device) => device.device_id));
+  Object.entries(patch.upserts).forEach(([deviceId, fields]) => {
+    if (!known.has(deviceId)) {
+      next.push(fields as Device);
+    }
+  });
+  return next;
+}
+
 export function useDeviceEvents(
   onDevicesChanged: DevicesChangedCallback,
   onFrame?: FrameCallback,
-  enabled: boolean = true
+  enabled: boolean = true,
+  requestSnapshot?: SnapshotRequest
 ): void {
+  const devicesRef = useRef<Device[]>([]);
+  const versionRef = useRef<number | null>(null);
+  const syncingRef = useRef(false);
+  const pendingRef = useRef<DevicesPatchEvent[]>([]);
+
   const handleDevicesChanged = useCallback(
     (event: Event) => {
       const customEvent = event as CustomEvent<DevicesChangedEventDetail>;
       const devices = customEvent.detail?.devices;
       if (Array.isArray(devices)) {
+        devicesRef.current = devices;
+        versionRef.current = null;
         onDevicesChanged(devices);
       }
     },
     [onDevicesChanged]
   );
 
+  const syncSnapshot = useCallback(async () => {
+    if (!requestSnapshot || syncingRef.current) return;
+    syncingRef.current = true;
+    pendingRef.current = [];
+    try {
+      let complete = false;
+      while (!complete) {
+        const snapshot = await requestSnapshot();
+        let devices = snapshot.devices;
+        let version = snapshot.version;
+
+        // Replay patches that arrived during the request, in order
+        const pending = pendingRef.current
+          .filter((patch) => patch.version > snapshot.version)
+          .sort((a, b) => a.version - b.version);
+        pendingRef.current = [];
+        complete = true;
+        for (const patch of pending) {
+          if (patch.base_version !== version) {
+            // A patch is missing in between, take another snapshot
+            complete = false;
+            break;
+          }
+          devices = applyPatch(devices, patch);
+          version = patch.version;
+        }
+
+        if (complete) {
+          devicesRef.current = devices;
+          versionRef.current = version;
+          onDevicesChanged(devices);
+        }
+      }
+    } catch (err) {
+      console.error('[useDeviceEvents] Snapshot failed:', err);
+    } finally {
+      syncingRef.current = false;
+      pendingRef.current = [];
+    }
+  }, [requestSnapshot, onDevicesChanged]);
+
+  const handleDevicesPatch = useCallback(
+    (event: Event) => {
+      const patch = (event as CustomEvent<DevicesPatchEvent>).detail;
+      if (!patch) return;
+
+      if (syncingRef.current) {
+        pendingRef.current.push(patch);
+        return;
+      }
+
+      // Already covered by a newer snapshot
+      if (versionRef.current !== null && patch.version <= versionRef.current) return;
+
+      if (versionRef.current !== patch.base_version) {
+        void syncSnapshot();
+        return;
+      }
+
+      devicesRef.current = applyPatch(devicesRef.current, patch);
+      versionRef.current = patch.version;
+      onDevicesChanged(devicesRef.current);
+    },
+    [onDevicesChanged, syncSnapshot]
+  );
+
   const handleFrame = useCallback(
     (event: Event) => {
       const customEvent = event as CustomEvent<FrameEventDetail>;
@@ -48,15 +146,17 @@ export function useDeviceEvents(
     if (!enabled) return;
 
     window.addEventListener('monitoring-devices-changed', handleDevicesChanged);
+    window.addEventListener('monitoring-devices-patch', handleDevicesPatch);
     window.addEventListener('monitoring-frame', handleFrame);
 
     console.log('[useDeviceEvents] Listeners attached');
 
     return () => {
       window.removeEventListener('monitoring-devices-changed', handleDevicesChanged);
+      window.removeEventListener('monitoring-devices-patch', handleDevicesPatch);
       window.removeEventListener('monitoring-frame', handleFrame);
     };
-  }, [enabled, handleDevicesChanged, handleFrame]);
+  }, [enabled, handleDevicesChanged, handleDevicesPatch, handleFrame]);
 }
 
 export default useDeviceEvents;
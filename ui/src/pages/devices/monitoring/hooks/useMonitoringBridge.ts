@@ -3,7 +3,13 @@
  */
 
 import { useMemo } from 'react';
-import type { Device, GlobalSettings, ApiResult, MonitoringStats } from '../types/monitoring.types';
+import type {
+  Device,
+  DeviceSnapshot,
+  GlobalSettings,
+  ApiResult,
+  MonitoringStats,
+} from '../types/monitoring.types';
 
 // Mock data for browser testing
 const MOCK_DEVICES: Device[] = [
@@ -34,6 +40,7 @@ export interface MonitoringBridge {
   getDevices: (forceRefresh?: boolean) => Promise<Device[]>;
   refreshDevices: () => Promise<Device[]>;
   getDevice: (deviceId: string) => Promise<Device | null>;
+  getSnapshot: () => Promise<DeviceSnapshot>;
   getFrame: (deviceId: string) => Promise<string | null>;
   startPreview: (deviceId: string) => Promise<ApiResult>;
   stopPreview: (deviceId: string) => Promise<ApiResult>;
@@ -77,6 +84,13 @@ export function useMonitoringBridge(): MonitoringBridge {
         return MOCK_DEVICES.find((d) => d.device_id === deviceId) || null;
       },
 
+      getSnapshot: async () => {
+        if (isInApp && api?.monitoring_get_snapshot) {
+          return await api.monitoring_get_snapshot();
+        }
+        return { version: 0, devices: MOCK_DEVICES };
+      },
+
       getFrame: async (deviceId: string) => {
         if (isInApp && api?.monitoring_get_frame) {
           return await api.monitoring_get_frame(deviceId);
@@ -10,6 +10,9 @@ export interface Device {
   is_online: boolean;
   has_preview: boolean;
   has_window: boolean;
+  agent_state?: 'unknown' | 'provisioning' | 'ready' | 'error';
+  agent_error?: string | null;
+  is_ready?: boolean;
   fps: number;
   error: string | null;
 }
@@ -39,11 +42,23 @@ export interface ApiResult {
   error?: string;
 }
 
+export interface DeviceSnapshot {
+  version: number;
+  devices: Device[];
+}
+
 // Event interfaces
 export interface DevicesChangedEvent {
   devices: Device[];
 }
 
+export interface DevicesPatchEvent {
+  version: number;
+  base_version: number;
+  upserts: Record<string, Partial<Device>>;
+  removed: string[];
+}
+
 export interface FrameEvent {
   deviceId: string;
   frame: string; // base64 JPEG
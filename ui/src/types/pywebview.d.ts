@@ -6,6 +6,18 @@
  * Updated: Force TS refresh
  */
 
+export interface BridgeJob {
+  job_id: string;
+  name: string;
+  status: 'pending' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+  progress: number | null;
+  message: string | null;
+  result: any;
+  error: string | null;
+  created_at: number;
+  finished_at: number | null;
+}
+
 declare global {
   interface Window {
     pywebview: {
@@ -80,6 +92,7 @@ declare global {
         monitoring_get_devices: () => Promise<any[]>;
         monitoring_get_device: (device_id: string) => Promise<any | null>;
         monitoring_refresh_devices: () => Promise<any[]>;
+        monitoring_get_snapshot: () => Promise<{ version: number; devices: any[] }>;
         monitoring_connect_device: (device_id: string) => Promise<{
           success: boolean;
           message?: string;
@@ -164,6 +177,19 @@ declare global {
           preview_quality?: number
         ) => Promise<any>;
         monitoring_is_available: () => Promise<boolean>;
+
+        // Background jobs - long-running methods return { success, job_id }
+        // and report through 'bridge-job-update' events
+        job_get: (job_id: string) => Promise<{
+          success: boolean;
+          job?: BridgeJob;
+          error?: string;
+        }>;
+        job_cancel: (job_id: string) => Promise<{
+          success: boolean;
+          error?: string;
+        }>;
+        job_list: () => Promise<BridgeJob[]>;
       };
     };
   }